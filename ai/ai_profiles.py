@@ -3,15 +3,15 @@
 STRATEGY_DEFAULT = {
     "opening": {
         "mobility": 1.25, "corner": 1.5, "risk": 0.75,
-        "frontier": 0.75,"pst": 1.0, "discs": 0.1,
+        "frontier": 0.75,"pst": 1.0, "discs": 0.1, "stability": 0,
     },
     "midgame": {
         "mobility": 1.25, "corner": 1.5,"risk": 0.5,
-        "frontier": 1.0,"pst": 1.0,"discs": 0.5,
+        "frontier": 1.0,"pst": 1.0,"discs": 0.5, "stability": 12,
     },
     "endgame": {
         "mobility": 0.5, "corner": 1.25, "risk": 0.5,
-        "frontier": 0.5,"pst": 0.5,"discs": 1.5,
+        "frontier": 0.5,"pst": 0.5,"discs": 1.5, "stability": 8,
     },
 }
 
@@ -20,15 +20,15 @@ STRATEGY_DEFAULT = {
 STRATEGY_DEFENSE = {
     "opening": {
         "mobility": 1.25, "corner": 1.5, "risk": 5.0,
-        "frontier": 0.75, "pst": 1.0, "discs": 0.1,
+        "frontier": 0.75, "pst": 1.0, "discs": 0.1, "stability": 0,
     },
     "midgame": {
         "mobility": 1.25, "corner": 1.5, "risk": 5.0,
-        "frontier": 1.0, "pst": 1.0, "discs": 0.5,
+        "frontier": 1.0, "pst": 1.0, "discs": 0.5, "stability": 12,
     },
     "endgame": {
         "mobility": 0.5, "corner": 1.25, "risk": 0.5,
-        "frontier": 0.5, "pst": 0.5, "discs": 1.5,
+        "frontier": 0.5, "pst": 0.5, "discs": 1.5, "stability": 8,
     }
 }
 
@@ -36,15 +36,15 @@ STRATEGY_DEFENSE = {
 STRATEGY_CORNERS = {
     "opening": {
         "mobility": 1.25, "corner": 5.0, "risk": 2.5,
-        "frontier": 0.75, "pst": 1.0, "discs": 0.1,
+        "frontier": 0.75, "pst": 1.0, "discs": 0.1, "stability": 0,
     },
     "midgame": {
         "mobility": 1.25, "corner": 5.0, "risk": 2.5,
-        "frontier": 1.0, "pst": 1.0, "discs": 0.5,
+        "frontier": 1.0, "pst": 1.0, "discs": 0.5, "stability": 12,
     },
     "endgame": {
         "mobility": 0.5, "corner": 5.0, "risk": 2.5,
-        "frontier": 0.5, "pst": 0.5, "discs": 1.5,
+        "frontier": 0.5, "pst": 0.5, "discs": 1.5, "stability": 8,
     }
 }
 
@@ -52,15 +52,15 @@ STRATEGY_CORNERS = {
 STRATEGY_MOBILITY = {
     "opening": {
         "mobility": 5.0, "corner": 1.5, "risk": 0.75,
-        "frontier": 0.75, "pst": 2.5, "discs": 0.1,
+        "frontier": 0.75, "pst": 2.5, "discs": 0.1, "stability": 0,
     },
     "midgame": {
         "mobility": 5.0, "corner": 1.5, "risk": 0.5,
-        "frontier": 1.0, "pst": 2.5, "discs": 0.5,
+        "frontier": 1.0, "pst": 2.5, "discs": 0.5, "stability": 12,
     },
     "endgame": {
         "mobility": 0.5, "corner": 1.25, "risk": 0.5,
-        "frontier": 0.5, "pst": 0.5, "discs": 1.5,
+        "frontier": 0.5, "pst": 0.5, "discs": 1.5, "stability": 8,
     }
 }
 
@@ -68,15 +68,15 @@ STRATEGY_MOBILITY = {
 STRATEGY_ENDGAME = {
     "opening": {
         "mobility": 1.25, "corner": 1.5, "risk": 0.75,
-        "frontier": 0.75, "pst": 1.0, "discs": 0.1,
+        "frontier": 0.75, "pst": 1.0, "discs": 0.1, "stability": 0,
     },
     "midgame": {
         "mobility": 1.25, "corner": 1.5, "risk": 0.5,
-        "frontier": 1.0, "pst": 1.0, "discs": 0.5,
+        "frontier": 1.0, "pst": 1.0, "discs": 0.5, "stability": 12,
     },
     "endgame": {
         "mobility": 0.5, "corner": 2.0, "risk": 0.5,
-        "frontier": 0.5, "pst": 1.0, "discs": 5.0,
+        "frontier": 0.5, "pst": 1.0, "discs": 5.0, "stability": 8,
     }
 }
 
@@ -0,0 +1,92 @@
+import numpy as np
+
+from ai import patterns
+from ai.heuristics import DEFAULT_WEIGHTS, CORNERS_MASK, CORNER_GROUP_MASKS
+from ai.heuristics_consts import PST
+from game.batch_board import moves_mask, neighbours_mask, popcount, transpose, unpack_squares
+
+# Évaluation vectorisée de N positions : mêmes features et même pondération
+# par phase que ai.heuristics.evaluate.
+
+FEATURES = ("mobility", "corner", "risk", "frontier", "pst", "discs", "stability")
+PHASES = ("opening", "midgame", "endgame")
+
+_CORNERS_MASK = np.uint64(CORNERS_MASK)
+_CORNER_GROUP_MASKS = [(np.uint64(corner), np.uint64(x_square)) for corner, x_square in CORNER_GROUP_MASKS]
+_PST_VECTOR = np.array([PST[sq // 8][sq % 8] for sq in range(64)], dtype=np.int64)
+_ZERO = np.uint64(0)
+
+# Tables de motifs (ai.patterns) et extractions des blocs 2x5 :
+# (décalage de la rangée du bord, décalage de la deuxième rangée, conversion)
+_B3_8 = np.array(patterns.B3_8, dtype=np.int64)
+_EDGE_STABILITY = np.array(patterns.EDGE_STABILITY, dtype=np.int64)
+_BLOCK_STABILITY = np.array(patterns.BLOCK_STABILITY, dtype=np.int64)
+_LEFT = np.array(patterns.B3_10, dtype=np.int64)
+_RIGHT = np.array(patterns.B3_10_RIGHT, dtype=np.int64)
+_BLOCKS = [(np.uint64(edge), np.uint64(second), table)
+           for edge, second, table in ((0, 3, _LEFT), (3, 6, _RIGHT), (56, 43, _LEFT), (59, 46, _RIGHT))]
+_X_SQUARES = [(np.uint64(group), np.uint64(next_squares)) for group, next_squares in patterns.X_SQUARES]
+_BYTE, _ROW5, _ROW5_SECOND = np.uint64(0xFF), np.uint64(0x1F), np.uint64(0x3E0)
+
+
+def phase_index(empties):
+    """Index dans PHASES, mêmes seuils que ai.heuristics.game_phase."""
+    return np.where(empties > 44, 0, np.where(empties > 20, 1, 2))
+
+
+def batch_stability(own, opp):
+    """ai.patterns.stability_score pour chaque plateau, (N,) int64."""
+    score = np.zeros(len(own), dtype=np.int64)
+    # Plateau, puis plateau transposé : bords gauche / droit et blocs verticaux
+    for o, p in ((own, opp), (transpose(own), transpose(opp))):
+        for shift in (np.uint64(0), np.uint64(56)):
+            score += _EDGE_STABILITY[_B3_8[(o >> shift) & _BYTE] + 2 * _B3_8[(p >> shift) & _BYTE]]
+        for edge, second, table in _BLOCKS:
+            o_bits = ((o >> edge) & _ROW5) | ((o >> second) & _ROW5_SECOND)
+            p_bits = ((p >> edge) & _ROW5) | ((p >> second) & _ROW5_SECOND)
+            score += _BLOCK_STABILITY[table[o_bits] + 2 * table[p_bits]]
+    for group, next_squares in _X_SQUARES:
+        score += ((own & group) == group) & ((own & next_squares) != _ZERO)
+        score -= ((opp & group) == group) & ((opp & next_squares) != _ZERO)
+    return score
+
+
+def batch_features(batch, players):
+    """
+    Tableau (N, 7) d'entiers : les features de FEATURES pour chaque plateau,
+    du point de vue de players[i].
+    """
+    own, opp = batch.sides(players)
+    empty = ~(own | opp)
+    features = np.empty((len(batch), len(FEATURES)), dtype=np.int64)
+
+    features[:, 0] = popcount(moves_mask(own, opp)) - popcount(moves_mask(opp, own))
+    features[:, 1] = 25 * (popcount(own & _CORNERS_MASK) - popcount(opp & _CORNERS_MASK))
+    risk = np.zeros(len(batch), dtype=np.int64)
+    for corner, x_square in _CORNER_GROUP_MASKS:
+        corner_empty = (empty & corner) != _ZERO
+        risk += np.where(corner_empty & ((own & x_square) != _ZERO), 15, 0)
+        risk -= np.where(corner_empty & ((opp & x_square) != _ZERO), 15, 0)
+    features[:, 2] = risk
+    frontier = neighbours_mask(empty)
+    features[:, 3] = popcount(opp & frontier) - popcount(own & frontier)
+    features[:, 4] = unpack_squares(own) @ _PST_VECTOR - unpack_squares(opp) @ _PST_VECTOR
+    features[:, 5] = popcount(own) - popcount(opp)
+    features[:, 6] = batch_stability(own, opp)
+    return features
+
+
+def weight_matrix(weights=None):
+    """Poids {phase: {feature: poids}} -> matrice (3, 7) alignée sur PHASES / FEATURES."""
+    weights = weights or DEFAULT_WEIGHTS
+    return np.array([
+        [weights.get(phase, DEFAULT_WEIGHTS[phase]).get(feature, 0) for feature in FEATURES]
+        for phase in PHASES
+    ], dtype=np.float64)
+
+
+def evaluate_batch(batch, players, weights=None):
+    """Équivalent vectorisé de ai.heuristics.evaluate, (N,) float64."""
+    features = batch_features(batch, players)
+    w = weight_matrix(weights)[phase_index(batch.empties())]
+    return (features * w).sum(axis=1)
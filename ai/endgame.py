@@ -0,0 +1,163 @@
+from game.board import moves_mask, flips_mask, square_to_move
+from ai.heuristics_consts import CORNERS, CORNER_GROUPS
+
+# Résolution exacte de fin de partie : recherche alpha-beta jusqu'à la fin,
+# directement sur les bitboards (pas d'heuristique, pas de game_phase).
+
+EXACT = 'exact'  # différence de pions exacte
+WLD = 'wld'      # gain / nulle / perte seulement (+1 / 0 / -1)
+
+# Seuil (cases vides) à partir duquel choose_move / AIPlayer passent au
+# solveur. Désactivé par défaut (0) : le solveur joue parfaitement la fin de
+# partie quelle que soit la profondeur, une IA de profondeur 1 comprise.
+DEFAULT_ENDGAME_EMPTIES = 0
+# Seuil des parties jouées (GameManager, main.py --endgame-empties) : une IA
+# de profondeur d résout les EMPTIES_PER_PLY * d dernières cases vides, au
+# plus SOLVER_EMPTIES (résolution en moins d'une seconde). Une IA faible ne
+# joue ainsi parfaitement que les toutes dernières cases.
+SOLVER_EMPTIES = 10
+EMPTIES_PER_PLY = 2
+
+
+def solver_empties(depth, limit=SOLVER_EMPTIES):
+    """
+    Seuil du solveur pour une IA de profondeur `depth` (None : recherche
+    limitée par le temps), au plus `limit` (0 = solveur désactivé).
+    """
+    if depth is None:
+        return limit
+    return min(limit, EMPTIES_PER_PLY * depth)
+
+
+# Au-delà de ce nombre de cases vides, tri « fastest first » (mobilité adverse
+# minimale) ; en dessous, seulement tri par parité, moins coûteux.
+FASTEST_FIRST_EMPTIES = 7
+
+# Ordre statique des cases : coins, bords, centre, cases C, cases X en dernier
+_X_SQUARES = {g[1][0] * 8 + g[1][1] for g in CORNER_GROUPS}
+_C_SQUARES = {s[0] * 8 + s[1] for g in CORNER_GROUPS for s in g[2:]}
+_CORNER_SQUARES = {r * 8 + c for (r, c) in CORNERS}
+
+
+def _square_rank(sq):
+    r, c = divmod(sq, 8)
+    if sq in _CORNER_SQUARES:
+        return 0
+    if sq in _X_SQUARES:
+        return 4
+    if sq in _C_SQUARES:
+        return 3
+    if r in (0, 7) or c in (0, 7):
+        return 1
+    return 2
+
+
+SQUARE_ORDER = sorted(range(64), key=_square_rank)
+
+# Un bit par quadrant 4x4 : parité des cases vides de chaque quadrant
+QUADRANT = [1 << ((sq // 8 // 4) * 2 + (sq % 8) // 4) for sq in range(64)]
+
+
+# Statistiques de la résolution en cours (ai.minimax.SearchStats), None sinon
+_stats = None
+# Fonction appelée à chaque nœud de la résolution en cours, None sinon
+_check = None
+
+
+def solve(board, player, mode=EXACT, stats=None, check=None):
+    """
+    Résout la position : retourne (meilleur coup, score) pour `player`.
+    score = différence de pions finale (EXACT) ou +1/0/-1 (WLD).
+    Le coup vaut None si le joueur doit passer.
+    stats (ai.minimax.SearchStats) compte les nœuds visités.
+    check est appelée à chaque nœud et interrompt la résolution en levant une
+    exception (ai.minimax : délai dépassé ou stop_search).
+    """
+    global _stats, _check
+    _stats = stats
+    _check = check
+    try:
+        return _solve_root(board, player, mode)
+    finally:
+        _stats = None
+        _check = None
+
+
+def _solve_root(board, player, mode):
+    own, opp = board.bitboards(player)
+    empty = ~(own | opp) & 0xFFFFFFFFFFFFFFFF
+    empties = [sq for sq in SQUARE_ORDER if empty >> sq & 1]
+    parity = 0
+    for sq in empties:
+        parity ^= QUADRANT[sq]
+    wld = mode == WLD
+    alpha, beta = (-1, 1) if wld else (-64, 64)
+
+    moves = moves_mask(own, opp)
+    if not moves:
+        return None, _solve(own, opp, alpha, beta, empties, parity, len(empties), wld)
+    best_move, best_score = None, alpha - 1
+    for sq, flipped in _ordered_moves(own, opp, moves, empties, parity, len(empties)):
+        placed = flipped | (1 << sq)
+        score = -_solve(opp ^ flipped, own | placed, -beta, -alpha, empties, parity ^ QUADRANT[sq],
+                        len(empties) - 1, wld)
+        if score > best_score:
+            best_move, best_score = sq, score
+        if score > alpha:
+            alpha = score
+            if alpha >= beta:
+                break
+    return square_to_move(best_move), best_score
+
+
+def final_score(own, opp, wld=False):
+    diff = own.bit_count() - opp.bit_count()
+    if wld:
+        return (diff > 0) - (diff < 0)
+    return diff
+
+
+def _solve(own, opp, alpha, beta, empties, parity, n_empty, wld):
+    if _stats is not None:
+        _stats.nodes += 1
+    if _check is not None:
+        _check()
+    moves = moves_mask(own, opp)
+    if not moves:
+        if not moves_mask(opp, own):
+            return final_score(own, opp, wld)
+        return -_solve(opp, own, -beta, -alpha, empties, parity, n_empty, wld)
+    best = -65
+    for sq, flipped in _ordered_moves(own, opp, moves, empties, parity, n_empty):
+        placed = flipped | (1 << sq)
+        score = -_solve(opp ^ flipped, own | placed, -beta, -alpha, empties, parity ^ QUADRANT[sq],
+                        n_empty - 1, wld)
+        if score > best:
+            best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+    return best
+
+
+def _ordered_moves(own, opp, moves, empties, parity, n_empty):
+    """
+    Coups (case, pions retournés) dans l'ordre de recherche.
+    Les cases occupées de `empties` ne sont jamais légales : la liste est
+    calculée une fois à la racine et filtrée par le masque des coups.
+    """
+    if n_empty > FASTEST_FIRST_EMPTIES:
+        # Fastest first : le moins de réponses adverses d'abord
+        scored = []
+        for sq in empties:
+            if moves >> sq & 1:
+                flipped = flips_mask(own, opp, sq)
+                mobility = moves_mask(opp ^ flipped, own | flipped | (1 << sq)).bit_count()
+                scored.append((mobility, not parity & QUADRANT[sq], sq, flipped))
+        scored.sort()
+        return [(sq, flipped) for _, _, sq, flipped in scored]
+    # Parité : d'abord les quadrants avec un nombre impair de cases vides
+    odd = [(sq, flips_mask(own, opp, sq)) for sq in empties if moves >> sq & 1 and parity & QUADRANT[sq]]
+    even = [(sq, flips_mask(own, opp, sq)) for sq in empties if moves >> sq & 1 and not parity & QUADRANT[sq]]
+    return odd + even
@@ -1,9 +1,14 @@
-from game.board import BLUE, DIRECTIONS, EMPTY
+from game.board import BLUE, FULL, neighbours_mask
 from ai.heuristics_consts import *
+from ai.patterns import corner_risk, stability_score as pattern_stability
+
+# Masques bitboard dérivés des constantes (case (r, c) -> bit r * 8 + c)
+CORNERS_MASK = sum(1 << (r * 8 + c) for (r, c) in CORNERS)
+CORNER_GROUP_MASKS = [(1 << (g[0][0] * 8 + g[0][1]), 1 << (g[1][0] * 8 + g[1][1])) for g in CORNER_GROUPS]
 
 # score weighting based on game phase
 def game_phase(board):
-    count_empty = sum(cell == EMPTY for row in board.grid for cell in row)
+    count_empty = board.empties
     if count_empty > 44:
         return "opening"
     elif count_empty > 20:
@@ -19,6 +24,7 @@ DEFAULT_WEIGHTS = {
         "frontier": 0.75,
         "pst": 1.0,
         "discs": 0.1,
+        "stability": 0,
     },
     "midgame": {
         "mobility": 1.25,
@@ -27,6 +33,7 @@ DEFAULT_WEIGHTS = {
         "frontier": 1.0,
         "pst": 1.0,
         "discs": 0.5,
+        "stability": 12,
     },
     "endgame": {
         "mobility": 0.5,
@@ -35,77 +42,63 @@ DEFAULT_WEIGHTS = {
         "frontier": 0.5,
         "pst": 0.5,
         "discs": 1.5,
+        "stability": 8,
     },
 }
 
-def evaluate(board, player, weights=None):
+def evaluate(board, player, weights=None, moves=None):
+    # pst et discs : sommes tenues à jour par le plateau ;
+    # moves = Board.move_masks déjà calculés ;
+    # corner, risk et stability : tables de motifs (ai.patterns)
     phase = game_phase(board)
     w = (weights or DEFAULT_WEIGHTS).get(phase, DEFAULT_WEIGHTS[phase])
+    own, opp = board.bitboards(player)
+    corner, risk = corner_risk(own, opp)
     score = 0
-    score += mobility_score(board, player) * w.get("mobility", 0)
-    score += corner_score(board, player) * w.get("corner", 0)
-    score += risk_score(board, player) * w.get("risk", 0)
+    score += mobility_score(board, player, moves) * w.get("mobility", 0)
+    score += corner * w.get("corner", 0)
+    score += risk * w.get("risk", 0)
+    stability_weight = w.get("stability", 0)
+    if stability_weight:
+        score += pattern_stability(own, opp) * stability_weight
     score += frontier_score(board, player) * w.get("frontier", 0)
     score += pst_score(board, player) * w.get("pst", 0)
     score += discs_score(board, player) * w.get("discs", 0)
     return score
 
-def mobility_score(board, player):
-    player_valid_moves = board.get_valid_moves(player)
-    opponent_valid_moves = board.get_valid_moves(-player)
-    player_moves = len(player_valid_moves)
-    opponent_moves = len(opponent_valid_moves)
-    return player_moves - opponent_moves
+def mobility_score(board, player, moves=None):
+    player_moves, opponent_moves = moves if moves is not None else board.move_masks(player)
+    return player_moves.bit_count() - opponent_moves.bit_count()
 
 def corner_score(board, player):
-    score = 0
-    for (r, c) in CORNERS:
-        if board.grid[r][c] == player:
-            score += 25
-        elif board.grid[r][c] == -player:
-            score -= 25
-    return score
+    own, opp = board.bitboards(player)
+    return 25 * ((own & CORNERS_MASK).bit_count() - (opp & CORNERS_MASK).bit_count())
 
 def risk_score(board, player):
-    score = 0  
-    for group in CORNER_GROUPS:
-        if board.grid[group[0][0]][group[0][1]] == EMPTY:
-            if board.grid[group[1][0]][group[1][1]] == player:
+    own, opp = board.bitboards(player)
+    empty = ~(own | opp)
+    score = 0
+    for corner, x_square in CORNER_GROUP_MASKS:
+        if empty & corner:
+            if own & x_square:
                 score += 15
-            elif board.grid[group[1][0]][group[1][1]] == -player:
+            elif opp & x_square:
                 score -= 15
     return score
 
+def stability_score(board, player):
+    # Pions stables des bords et des blocs de coin, coins exceptés
+    return pattern_stability(*board.bitboards(player))
+
 def frontier_score(board, player):
-    score = 0
-    player_tiles = [(r, c) for r in range(8) for c in range(8) if board.grid[r][c] == player]
-    opponent_tiles = [(r, c) for r in range(8) for c in range(8) if board.grid[r][c] == -player]
-    for (r, c) in player_tiles:
-        for (dr, dc) in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            if board.inside(nr, nc) and board.grid[nr][nc] == EMPTY:
-                score -= 1
-                break
-    for (r, c) in opponent_tiles:
-        for (dr, dc) in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            if board.inside(nr, nc) and board.grid[nr][nc] == EMPTY:
-                score += 1
-                break
-    return score
+    # Pions adjacents à au moins une case vide
+    own, opp = board.bitboards(player)
+    frontier = neighbours_mask(~(own | opp) & FULL)
+    return (opp & frontier).bit_count() - (own & frontier).bit_count()
 
 def pst_score(board, player):
-    score = 0
-    for r in range(8):
-        for c in range(8):
-            if board.grid[r][c] == player:
-                score += PST[r][c]
-            elif board.grid[r][c] == -player:
-                score -= PST[r][c]
-    return score
+    own_pst, opp_pst = board.pst_sums(player)
+    return own_pst - opp_pst
 
 def discs_score(board, player):
-    discs = board.count_discs()
-    return discs[0] - discs[1] if player == BLUE else discs[1] - discs[0]
-
-
+    return board.blue_count - board.pink_count if player == BLUE else board.pink_count - board.blue_count
@@ -1,25 +1,301 @@
-from ai.heuristics import evaluate, game_phase
+from ai.heuristics import evaluate
 from ai.heuristics_consts import *
+from ai.endgame import solve, DEFAULT_ENDGAME_EMPTIES, EXACT as ENDGAME_EXACT
+from ai.transposition import (TranspositionTable, SharedTranspositionTable, DEFAULT_TT_MB, EXACT, LOWER, UPPER,
+                              NO_MOVE)
+from game.board import flips_mask, move_to_square, square_to_move, SYMMETRY_SQUARES, INVERSE_SYMMETRY
+from concurrent.futures import ProcessPoolExecutor
+import atexit
+import hashlib
+import multiprocessing
 import random
-from collections import OrderedDict
+import threading
+import time
 
-# Transposition table with size limit to avoid unbounded memory growth
-MAX_TT_ENTRIES = 50000
+# Transposition table: fixed memory budget, shared by every search of the process
+TT = TranspositionTable(DEFAULT_TT_MB)
 
-def choose_move(board, player, depth, weights=None):
+# Profile part of the TT keys (also the search cache fingerprint), cached by
+# weights object (profiles are never mutated). Derived from the content, not
+# the identity, so that processes agree on it (Lazy SMP shared table, pickled
+# weights in pool workers). The cache keeps its dicts alive, so it is bounded:
+# workers receive a new copy of the weights with every task.
+_weights_keys = {}
+WEIGHTS_KEYS_MAX = 64
+
+def weights_key(weights):
+  if weights is None:
+    return 0
+  cached = _weights_keys.get(id(weights))
+  if cached is None or cached[0] is not weights:
+    if len(_weights_keys) >= WEIGHTS_KEYS_MAX:
+      _weights_keys.clear()
+    frozen = repr(sorted((phase, sorted(w.items())) for phase, w in weights.items()))
+    key = int.from_bytes(hashlib.blake2b(frozen.encode(), digest_size=8).digest(), 'little')
+    cached = _weights_keys[id(weights)] = (weights, key)
+  return cached[1]
+
+# Search drivers selectable in choose_move / AIPlayer
+ALPHABETA = 'alphabeta'
+PVS = 'pvs'
+
+class SearchTimeout(Exception):
+  """Raised inside search when the iterative deepening deadline is reached."""
+
+# Deadline (time.perf_counter()) of the running timed search, None otherwise
+_deadline = None
+# Set by stop_search(): iterative deepening stops and no new iteration starts
+_stop_requested = False
+
+def stop_search():
+  """
+  Interrupts the search running in another thread (e.g. pondering): it raises
+  SearchTimeout at its next node. reset_stop() must be called once that thread
+  is done, before the next search.
+  """
+  global _deadline, _stop_requested
+  _stop_requested = True
+  _deadline = 0.0
+
+def reset_stop():
+  global _deadline, _stop_requested
+  _stop_requested = False
+  _deadline = None
+
+def _check_deadline():
+  if _deadline is not None and time.perf_counter() > _deadline:
+    raise SearchTimeout
+
+class SearchStats:
+  """
+  Counters of one choose_move call, collected when an instance is passed as
+  choose_move(stats=...). Without one every update is skipped (a single
+  `is not None` test per node).
+  """
+
+  def __init__(self):
+    self.nodes = 0        # nodes visited (search, PVS and endgame solver)
+    self.leaves = 0       # heuristic evaluations
+    self.tt_probes = 0
+    self.tt_hits = 0
+    self.tt_stores = 0
+    self.cutoffs = []     # cutoffs[i]: beta cutoffs produced by the i-th move searched
+    self.iterations = []  # (depth, nodes) of each completed root iteration
+    self.source = None    # 'search', 'endgame', 'cache' or 'book'
+    self.time = 0.0       # seconds
+
+  def cutoff(self, index):
+    if index >= len(self.cutoffs):
+      self.cutoffs.extend([0] * (index + 1 - len(self.cutoffs)))
+    self.cutoffs[index] += 1
+
+  def iteration(self, depth):
+    # Nodes of the iteration that just completed
+    self.iterations.append((depth, self.nodes - sum(nodes for _, nodes in self.iterations)))
+
+  def merge(self, counters):
+    """Adds the counters of a worker process (as_dict output)."""
+    self.nodes += counters['nodes']
+    self.leaves += counters['leaves']
+    self.tt_probes += counters['tt_probes']
+    self.tt_hits += counters['tt_hits']
+    self.tt_stores += counters['tt_stores']
+    cutoffs = counters['cutoffs']
+    if len(cutoffs) > len(self.cutoffs):
+      self.cutoffs.extend([0] * (len(cutoffs) - len(self.cutoffs)))
+    for index, count in enumerate(cutoffs):
+      self.cutoffs[index] += count
+
+  @property
+  def depth(self):
+    return self.iterations[-1][0] if self.iterations else None
+
+  def ebf(self):
+    """
+    Effective branching factor per completed depth: node ratio between two
+    successive iterations, nodes ** (1 / depth) for the first one.
+    """
+    result = {}
+    previous = None
+    for depth, nodes in self.iterations:
+      if previous:
+        result[depth] = nodes / previous
+      elif nodes:
+        result[depth] = nodes ** (1.0 / depth)
+      previous = nodes
+    return result
+
+  def nodes_per_second(self):
+    return self.nodes / self.time if self.time > 0 else 0.0
+
+  def tt_hit_rate(self):
+    return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+  def first_move_cutoff_rate(self):
+    """Share of the cutoffs produced by the first move (move ordering quality)."""
+    total = sum(self.cutoffs)
+    return self.cutoffs[0] / total if total else 0.0
+
+  def as_dict(self):
+    return {
+      'source': self.source,
+      'depth': self.depth,
+      'time': self.time,
+      'nodes': self.nodes,
+      'leaves': self.leaves,
+      'nodes_per_second': self.nodes_per_second(),
+      'tt_probes': self.tt_probes,
+      'tt_hits': self.tt_hits,
+      'tt_stores': self.tt_stores,
+      'tt_hit_rate': self.tt_hit_rate(),
+      'cutoffs': list(self.cutoffs),
+      'first_move_cutoff_rate': self.first_move_cutoff_rate(),
+      'iterations': list(self.iterations),
+      'ebf': self.ebf(),
+    }
+
+# Statistics of the running choose_move call, None when not collected
+_stats = None
+
+def choose_move(board, player, depth, weights=None, tt_mb=None, time_limit=None, workers=None,
+                algorithm=ALPHABETA, endgame_empties=DEFAULT_ENDGAME_EMPTIES, endgame_mode=ENDGAME_EXACT,
+                cache=None, stats=None, smp_workers=None, tt=None):
+  """
+  Fixed depth search, or iterative deepening when time_limit (seconds) is set:
+  depth 1, 2, 3... until the deadline, depth being then the maximum depth
+  (None = until the end of the game).
+  With workers > 1 the root moves are searched in a pool of processes.
+  algorithm=PVS uses the principal variation search driver (always iterative,
+  with aspiration windows; no root parallelism, no random tie-break).
+  smp_workers=N runs a Lazy SMP search on N processes (this one included)
+  sharing a transposition table; workers is then ignored.
+  With endgame_empties empty squares or fewer the position is solved exactly
+  (ai.endgame, endgame_mode EXACT or WLD); 0 disables the solver.
+  cache (ai.search_cache.SearchCache) keeps the results of fixed depth
+  searches on disk; a cached move is played without searching.
+  stats (SearchStats) receives the counters of this call.
+  tt (TranspositionTable) is used instead of the process table TT, so that
+  players with their own table (and size) do not share or resize it. It is
+  passed down the search, never installed as the global: a concurrent search
+  in another thread (pondering) keeps its own table.
+  """
+  global _stats
+  if depth is None and time_limit is None:
+    raise ValueError("choose_move needs a depth or a time_limit")
+  if tt is None:
+    tt = TT
+  if stats is None:
+    return _choose_move(board, player, depth, weights, tt_mb, time_limit, workers, algorithm, endgame_empties,
+                        endgame_mode, cache, smp_workers, tt)
+  _stats = stats
+  probes, hits, stores = tt.probes, tt.hits, tt.stores
+  start = time.perf_counter()
+  try:
+    return _choose_move(board, player, depth, weights, tt_mb, time_limit, workers, algorithm, endgame_empties,
+                        endgame_mode, cache, smp_workers, tt)
+  finally:
+    _stats = None
+    stats.time += time.perf_counter() - start
+    # tt.resize resets the counters
+    if tt.probes >= probes:
+      stats.tt_probes += tt.probes - probes
+      stats.tt_hits += tt.hits - hits
+      stats.tt_stores += tt.stores - stores
+    else:
+      stats.tt_probes += tt.probes
+      stats.tt_hits += tt.hits
+      stats.tt_stores += tt.stores
+
+def _choose_move(board, player, depth, weights, tt_mb, time_limit, workers, algorithm, endgame_empties,
+                 endgame_mode, cache, smp_workers, tt):
   valid_moves = board.get_valid_moves(player)
   if not valid_moves:
     return None
-
-  def evaluate_move(move):
-    flipped = board.make_move(move, player)
-    score = -search(board, -player, depth - 1, weights=weights)
-    board.undo_move(move, flipped, player)
-    return score
+  if tt_mb is not None and tt_mb != tt.size_mb:
+    tt.resize(tt_mb)
+  if board.empties <= endgame_empties:
+    start = time.perf_counter()
+    move = _solve_endgame(board, player, endgame_mode, time_limit)
+    if move is not None or _stop_requested:
+      return move
+    # Not solved in time: iterative deepening for the rest of the budget
+    time_limit = max(0.0, time_limit - (time.perf_counter() - start))
+  # Timed searches reach an unknown depth: not cached
+  if time_limit is not None:
+    cache = None
+  if cache is not None:
+    move = cache.get_move(board, player, depth, weights)
+    if move is not None:
+      if _stats is not None:
+        _stats.source = 'cache'
+      return move
+  if _stats is not None:
+    _stats.source = 'search'
+  age_move_ordering()
+  if smp_workers is not None:
+    move = lazy_smp_search(board, player, depth, time_limit, weights, algorithm, smp_workers, tt.size_mb)
+    if cache is not None:
+      cache.put(board, player, depth, move, weights=weights)
+    return move
+  if time_limit is not None or algorithm == PVS:
+    move = iterative_deepening(board, player, time_limit, max_depth=depth, weights=weights, workers=workers,
+                               algorithm=algorithm, tt=tt)
+    if cache is not None:
+      cache.put(board, player, depth, move, weights=weights)
+    return move
 
   # Évaluer tous les coups
-  move_scores = [(move, evaluate_move(move)) for move in valid_moves]
+  move_scores = score_root_moves(board, player, depth, valid_moves, weights=weights, workers=workers, tt=tt)
+  if _stats is not None:
+    _stats.iteration(depth)
+  move = pick_best_move(move_scores)
+  if cache is not None:
+    cache.put(board, player, depth, move, dict(move_scores)[move], weights=weights)
+  return move
+
+# Share of time_limit given to the endgame solver before falling back to search
+ENDGAME_TIME_SHARE = 0.5
+
+def _solve_endgame(board, player, mode, time_limit):
+  """
+  Exact solver, interrupted like search by stop_search and, with a time
+  limit, after ENDGAME_TIME_SHARE of it. Returns None when interrupted.
+  """
+  global _deadline
+  if _stats is not None:
+    _stats.source = 'endgame'
+  if time_limit is not None and not _stop_requested:
+    _deadline = time.perf_counter() + time_limit * ENDGAME_TIME_SHARE
+  try:
+    return solve(board, player, mode, stats=_stats, check=_check_deadline)[0]
+  except SearchTimeout:
+    return None
+  finally:
+    if not _stop_requested:
+      _deadline = None
 
+def score_root_moves(board, player, depth, moves, weights=None, workers=None, tt=None):
+  # Moves equivalent by a symmetry of the position are searched once
+  equivalent = board.equivalent_moves(moves)
+  searched = [move for move in moves if move not in equivalent]
+  if tt is None:
+    tt = TT
+  if workers is not None and workers > 1 and len(searched) > 1:
+    move_scores = parallel_score_root_moves(board, player, depth, searched, workers, weights=weights,
+                                            tt_mb=tt.size_mb)
+  else:
+    move_scores = []
+    for move in searched:
+      flipped = board.make_move(move, player)
+      score = -search(board, -player, depth - 1, weights=weights, tt=tt)
+      board.undo_move(move, flipped, player)
+      move_scores.append((move, score))
+  if equivalent:
+    scores = dict(move_scores)
+    move_scores = [(move, scores[equivalent.get(move, move)]) for move in moves]
+  return move_scores
+
+def pick_best_move(move_scores):
   # Trouver le meilleur score
   best_score = max(score for _, score in move_scores)
 
@@ -29,112 +305,518 @@ def choose_move(board, player, depth, weights=None):
   # Si plusieurs coups ont le même score, en choisir un aléatoirement
   return random.choice(best_moves)
 
-TT = OrderedDict()
+def iterative_deepening(board, player, time_limit, max_depth=None, weights=None, workers=None,
+                        algorithm=ALPHABETA, root_moves=None, start_depth=1, tt=None):
+  """
+  Searches depth start_depth, start_depth + 1... up to max_depth or the
+  deadline. root_moves gives the initial root order (default: move generator).
+  tt defaults to the process table TT.
+  """
+  global _deadline
+  empties = board.empties
+  max_depth = empties if max_depth is None else min(max_depth, empties)
+  start_depth = min(start_depth, max_depth)
+  # Search on a copy: an interrupted iteration leaves its moves on the board
+  board = board.clone()
+  moves = list(root_moves) if root_moves is not None else board.get_valid_moves(player)
+  if algorithm == PVS:
+    # score_root_moves merges symmetric root moves itself
+    equivalent = board.equivalent_moves(moves)
+    moves = [move for move in moves if move not in equivalent]
+  best_move = None
+  score = None
+  deadline = time.perf_counter() + time_limit if time_limit is not None else None
+  try:
+    for depth in range(start_depth, max_depth + 1):
+      # The first depth always completes so that a move is available
+      _deadline = deadline if best_move is not None else None
+      if _stop_requested:
+        break
+      try:
+        if algorithm == PVS:
+          best_move, score = aspiration_search(board, player, depth, moves, score, weights=weights, tt=tt)
+          moves.remove(best_move)
+          moves.insert(0, best_move)
+        else:
+          move_scores = score_root_moves(board, player, depth, moves, weights=weights, workers=workers, tt=tt)
+          # Previous iteration orders the root, the TT best moves order the tree
+          move_scores.sort(key=lambda item: item[1], reverse=True)
+          moves = [move for move, _ in move_scores]
+          best_move = pick_best_move(move_scores)
+      except SearchTimeout:
+        break
+      if _stats is not None:
+        _stats.iteration(depth)
+      if deadline is not None and time.perf_counter() >= deadline:
+        break
+  finally:
+    _deadline = None
+  return best_move
 
-def search(board, player, depth, alpha=float('-inf'), beta=float('inf'), weights=None):
-  # Only build a TT key for depths >= 3 to reduce allocation overhead
-  key = None
-  if depth >= 3:
-    key = (tuple(map(tuple, board.grid)), player, depth, id(weights) if weights is not None else None)
-    if key in TT:
-      return TT[key]
-  best_score = float('-inf')
-  if board.is_terminal():
+# --- Root parallelism -------------------------------------------------------
+# Root moves are spread over a process pool. Workers share the best root
+# score found so far: each subtree is searched with alpha = that score
+# (minus TIE_MARGIN, so equal scores stay exact for the random tie-break)
+# and later subtrees still get cutoffs.
+
+TIE_MARGIN = 1e-9
+
+_pool = None
+_pool_workers = 0
+_shared_best = None
+
+def _init_worker(shared_best):
+  global _shared_best
+  _shared_best = shared_best
+
+def get_pool(workers):
+  global _pool, _pool_workers, _shared_best
+  if _pool is None or _pool_workers != workers:
+    shutdown_pool()
+    _shared_best = multiprocessing.Value('d', float('-inf'))
+    _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(_shared_best,))
+    _pool_workers = workers
+  return _pool
+
+def shutdown_pool():
+  global _pool, _pool_workers
+  if _pool is not None:
+    _pool.shutdown(cancel_futures=True)
+  _pool = None
+  _pool_workers = 0
+
+def _search_root_move(board, move, player, depth, weights, tt_mb, time_left, collect_stats):
+  global _deadline, _stats
+  if tt_mb is not None and tt_mb != TT.size_mb:
+    TT.resize(tt_mb)
+  alpha = _shared_best.value - TIE_MARGIN
+  _deadline = time.perf_counter() + time_left if time_left is not None else None
+  stats = _stats = SearchStats() if collect_stats else None
+  probes, hits, stores = TT.probes, TT.hits, TT.stores
+  try:
+    board.make_move(move, player)
+    score = -search(board, -player, depth - 1, float('-inf'), -alpha, weights=weights, tt=TT)
+  finally:
+    _deadline = None
+    _stats = None
+  with _shared_best.get_lock():
+    if score > _shared_best.value:
+      _shared_best.value = score
+  if stats is None:
+    return move, score, None
+  stats.tt_probes, stats.tt_hits, stats.tt_stores = TT.probes - probes, TT.hits - hits, TT.stores - stores
+  return move, score, stats.as_dict()
+
+def parallel_score_root_moves(board, player, depth, moves, workers, weights=None, tt_mb=None):
+  """
+  Scores the root moves in a process pool. Scores of moves that cannot beat
+  the best one are upper bounds only, which is enough for pick_best_move.
+  Each worker searches with its own process table, sized tt_mb (default:
+  the size of this process table).
+  """
+  if tt_mb is None:
+    tt_mb = TT.size_mb
+  pool = get_pool(workers)
+  _shared_best.value = float('-inf')
+  time_left = _deadline - time.perf_counter() if _deadline is not None else None
+  # Young brothers wait: the most promising move first, to get a bound
+  moves = sorted(moves, key=lambda move: quick_eval(move, board, player), reverse=True)
+  collect_stats = _stats is not None
+  first = pool.submit(_search_root_move, board, moves[0], player, depth, weights, tt_mb, time_left,
+                      collect_stats)
+  try:
+    results = [first.result()]
+    if _deadline is not None:
+      time_left = _deadline - time.perf_counter()
+    futures = [pool.submit(_search_root_move, board, move, player, depth, weights, tt_mb, time_left,
+                           collect_stats)
+               for move in moves[1:]]
+    try:
+      results.extend(future.result() for future in futures)
+    finally:
+      for future in futures:
+        future.cancel()
+  finally:
+    first.cancel()
+  if collect_stats:
+    for _, _, counters in results:
+      _stats.merge(counters)
+  return [(move, score) for move, score, _ in results]
+
+# --- Lazy SMP -----------------------------------------------------------------
+# Every process searches the whole tree from the root, all of them sharing one
+# lock-free transposition table in shared memory (SharedTranspositionTable):
+# the helpers store bounds and best moves that the main search then finds
+# already computed. They are desynchronised so that they do not visit the
+# same nodes in the same order: odd helpers start one ply deeper and stop one
+# ply further, and each helper shuffles its root moves. The main search runs
+# in this process and gives the move; helpers are stopped as soon as it ends.
+
+_smp_pool = None
+_smp_workers = 0
+_smp_tt = None
+_smp_stop = None
+# Helper job in progress (a stop only concerns the job it was meant for)
+_smp_job = None
+
+def _init_smp_worker(name, stop):
+  global _smp_tt, _smp_stop
+  # Forked workers inherit the mapping, others open the block by name
+  if _smp_tt is None or _smp_tt.name != name:
+    _smp_tt = SharedTranspositionTable(name=name)
+  _smp_stop = stop
+
+def get_smp_pool(helpers, tt_mb):
+  """Pool of `helpers` processes attached to the shared table (None without helpers)."""
+  global _smp_pool, _smp_workers, _smp_tt, _smp_stop
+  if _smp_tt is None or _smp_tt.size_mb != tt_mb:
+    shutdown_smp()
+    _smp_tt = SharedTranspositionTable(tt_mb)
+  if _smp_stop is None:
+    _smp_stop = multiprocessing.Event()
+  if helpers and (_smp_pool is None or _smp_workers != helpers):
+    if _smp_pool is not None:
+      _smp_pool.shutdown(cancel_futures=True)
+    _smp_pool = ProcessPoolExecutor(max_workers=helpers, initializer=_init_smp_worker,
+                                    initargs=(_smp_tt.name, _smp_stop))
+    _smp_workers = helpers
+  return _smp_pool if helpers else None
+
+def shutdown_smp():
+  global _smp_pool, _smp_workers, _smp_tt
+  if _smp_pool is not None:
+    _smp_pool.shutdown(cancel_futures=True)
+  _smp_pool = None
+  _smp_workers = 0
+  if _smp_tt is not None:
+    _smp_tt.unlink()
+  _smp_tt = None
+
+atexit.register(shutdown_smp)
+
+def _smp_helper(board, player, depth, time_limit, weights, algorithm, index, collect_stats):
+  global _stats, _smp_job
+  job = _smp_job = object()
+  reset_stop()
+
+  def watch():
+    _smp_stop.wait()
+    if _smp_job is job:
+      stop_search()
+
+  threading.Thread(target=watch, daemon=True).start()
+  tt = _smp_tt
+  stats = _stats = SearchStats() if collect_stats else None
+  probes, hits, stores = tt.probes, tt.hits, tt.stores
+  moves = board.get_valid_moves(player)
+  random.Random(index).shuffle(moves)
+  skew = index % 2
+  try:
+    iterative_deepening(board, player, time_limit, max_depth=depth + skew if depth is not None else None,
+                        weights=weights, algorithm=algorithm, root_moves=moves, start_depth=1 + skew, tt=tt)
+    if stats is not None:
+      stats.tt_probes, stats.tt_hits, stats.tt_stores = tt.probes - probes, tt.hits - hits, tt.stores - stores
+  finally:
+    _smp_job = None
+    _stats = None
+    reset_stop()
+  return stats.as_dict() if stats is not None else None
+
+def lazy_smp_search(board, player, depth, time_limit, weights, algorithm, smp_workers, tt_mb=DEFAULT_TT_MB):
+  """
+  Iterative deepening of this process (fixed depth, or until time_limit)
+  helped by smp_workers - 1 processes, all searching in one shared
+  transposition table of tt_mb MB.
+  """
+  pool = get_smp_pool(smp_workers - 1, tt_mb)
+  tt = _smp_tt
+  collect_stats = _stats is not None
+  _smp_stop.clear()
+  futures = [pool.submit(_smp_helper, board, player, depth, time_limit, weights, algorithm, index, collect_stats)
+             for index in range(1, smp_workers)]
+  probes, hits, stores = tt.probes, tt.hits, tt.stores
+  try:
+    move = iterative_deepening(board, player, time_limit, max_depth=depth, weights=weights, algorithm=algorithm,
+                               tt=tt)
+  finally:
+    if collect_stats:
+      _stats.tt_probes += tt.probes - probes
+      _stats.tt_hits += tt.hits - hits
+      _stats.tt_stores += tt.stores - stores
+    _smp_stop.set()
+    results = [future.result() for future in futures]
+  if collect_stats:
+    for counters in results:
+      _stats.merge(counters)
+  return move
+
+def search(board, player, depth, alpha=float('-inf'), beta=float('inf'), weights=None, moves=None, tt=None):
+  # Both sides' legal moves, generated once per node (terminal test, move
+  # loop, mobility); a pass hands them over to the child swapped.
+  # tt: transposition table of this search (default: the process table TT)
+  own_moves, opp_moves = moves if moves is not None else board.move_masks(player)
+  if _stats is not None:
+    _stats.nodes += 1
+  if not own_moves and not opp_moves:
     return board.score(player)
   if depth == 0:
-    return evaluate(board, player, weights=weights)
-  valid_moves = board.get_valid_moves(player)
-  if not valid_moves:
-    return -search(board, -player, depth, -beta, -alpha, weights=weights)
-  
-  # Tri des coups: seulement en midgame et profondeur >= 4
-  phase = game_phase(board)
-  if depth >= 4 and phase == 'midgame':
-    scored_moves = [(move, quick_eval(move, board, player)) for move in valid_moves]
-    scored_moves.sort(key=lambda item: item[1], reverse=True)
-    valid_moves = [move for move, _ in scored_moves]
-  for move in valid_moves:
-    flipped = board.make_move(move, player)
-    child_score = -search(board, -player, depth-1, -beta, -alpha, weights=weights)
-    board.undo_move(move, flipped, player)
-
-    best_score = max(best_score, child_score)
+    if _stats is not None:
+      _stats.leaves += 1
+    return evaluate(board, player, weights=weights, moves=(own_moves, opp_moves))
+  if _deadline is not None and time.perf_counter() > _deadline:
+    raise SearchTimeout
+  if tt is None:
+    tt = TT
+  key, sym, tt_score, alpha, beta, tt_sq = tt_lookup(board, player, depth, alpha, beta, weights, tt)
+  if tt_score is not None:
+    return tt_score
+  alpha_orig = alpha
+  best_score = float('-inf')
+  best_sq = None
+  if not own_moves:
+    return -search(board, -player, depth, -beta, -alpha, weights=weights, moves=(opp_moves, own_moves), tt=tt)
+
+  for index, sq in enumerate(order_moves(board, player, own_moves, tt_sq)):
+    flipped = board.play(sq, player)
+    child_score = -search(board, -player, depth-1, -beta, -alpha, weights=weights, tt=tt)
+    board.unplay(sq, flipped, player)
+
+    if child_score > best_score:
+      best_score = child_score
+      best_sq = sq
     alpha = max(alpha, child_score)
     if alpha >= beta:
-        break
-  # store in TT if we constructed a key
-  if key is not None:
-    TT[key] = best_score
-    # maintain size limit
-    if len(TT) > MAX_TT_ENTRIES:
-      TT.popitem(last=False)
+      record_cutoff(board.empties, player, sq, depth)
+      if _stats is not None:
+        _stats.cutoff(index)
+      break
+  tt_save(key, sym, depth, best_score, best_sq, alpha_orig, beta, tt)
   return best_score
 
-def quick_eval(move, board=None, player=None):
-    """
-    Évalue un coup pour le tri des mouvements (move ordering).
-    Basé sur:
-    1. Nombre de disques retournés (principal)
-    2. Control des coins (très importants en Othello)
-    3. Pénalité pour les carrés dangereux
-    
-    Cette heuristique est bien plus pertinente que PST pour Othello.
-    """
-    row, col = move
-    
-    # Normaliser la colonne
-    if isinstance(col, str):
-        col_str = col.strip().upper()
-        if len(col_str) == 1 and col_str.isalpha():
-            col = ord(col_str) - ord('A')
-        elif col_str.isdigit():
-            col = int(col_str)
-    if not isinstance(col, int):
-        col = 0
-
-    # Normaliser la ligne
-    if isinstance(row, str):
-        row_str = row.strip()
-        if row_str.isdigit():
-            row = int(row_str)
-
-    if isinstance(row, int) and 1 <= row <= 8:
-        row_idx = row - 1
-    elif isinstance(row, int):
-        row_idx = row
+# --- Principal variation search ----------------------------------------------
+# NegaScout: the first (best ordered) move gets the full window, the others a
+# null window just above alpha, and are re-searched only if they beat it.
+
+# Width of the "null" window (scores are floats)
+NULL_WINDOW = 1e-6
+# Half-width of the aspiration window around the previous iteration score
+ASPIRATION_WINDOW = 10.0
+
+def pvs_search(board, player, depth, alpha=float('-inf'), beta=float('inf'), weights=None, moves=None, tt=None):
+  own_moves, opp_moves = moves if moves is not None else board.move_masks(player)
+  if _stats is not None:
+    _stats.nodes += 1
+  if not own_moves and not opp_moves:
+    return board.score(player)
+  if depth == 0:
+    if _stats is not None:
+      _stats.leaves += 1
+    return evaluate(board, player, weights=weights, moves=(own_moves, opp_moves))
+  if _deadline is not None and time.perf_counter() > _deadline:
+    raise SearchTimeout
+  if tt is None:
+    tt = TT
+  key, sym, tt_score, alpha, beta, tt_sq = tt_lookup(board, player, depth, alpha, beta, weights, tt)
+  if tt_score is not None:
+    return tt_score
+  alpha_orig = alpha
+  if not own_moves:
+    return -pvs_search(board, -player, depth, -beta, -alpha, weights=weights, moves=(opp_moves, own_moves), tt=tt)
+
+  best_sq, best_score = pvs_moves(board, player, depth, order_moves(board, player, own_moves, tt_sq),
+                                  alpha, beta, weights, tt)
+  tt_save(key, sym, depth, best_score, best_sq, alpha_orig, beta, tt)
+  return best_score
+
+def pvs_moves(board, player, depth, squares, alpha, beta, weights, tt):
+  best_score = float('-inf')
+  best_sq = None
+  for i, sq in enumerate(squares):
+    flipped = board.play(sq, player)
+    if i == 0:
+      child_score = -pvs_search(board, -player, depth-1, -beta, -alpha, weights=weights, tt=tt)
     else:
-        row_idx = 0
-
-    row_idx = max(0, min(7, row_idx))
-    col = max(0, min(7, col))
-
-    score = 0
-
-    # 1. Bonus pour les coins (très importants en Othello)
-    corners = [(0, 0), (0, 7), (7, 0), (7, 7)]
-    if (row_idx, col) in corners:
-        score += 1000
-
-    # 2. Pénalité pour les carrés dangereux (adjacents aux coins vides)
-    # Ces carrés donnent à l'adversaire accès aux coins
-    dangerous = [
-        (0, 1), (1, 0), (1, 1),  # autour du coin (0,0)
-        (0, 6), (1, 6), (1, 7),  # autour du coin (0,7)
-        (6, 0), (6, 1), (7, 1),  # autour du coin (7,0)
-        (6, 6), (6, 7), (7, 6),  # autour du coin (7,7)
-    ]
-    if (row_idx, col) in dangerous:
-        score -= 500
-
-    # 3. Bonus pour les bords (X-squares) - bonne stabilité
-    edges = [(i, j) for i in range(8) for j in range(8) if i in (0, 7) or j in (0, 7)]
-    if (row_idx, col) in edges and (row_idx, col) not in corners and (row_idx, col) not in dangerous:
-        score += 50
-
-    # 4. Nombre de disques retournés (si board et player fournis)
-    if board is not None and player is not None:
-        flipped = board.make_move((row, col), player)
-        score += len(flipped) * 10  # Bonus proportionnel au nombre de disques retournés
-        board.undo_move((row, col), flipped, player)
-
-    return score
\ No newline at end of file
+      child_score = -pvs_search(board, -player, depth-1, -alpha - NULL_WINDOW, -alpha, weights=weights, tt=tt)
+      if alpha < child_score < beta:
+        child_score = -pvs_search(board, -player, depth-1, -beta, -alpha, weights=weights, tt=tt)
+    board.unplay(sq, flipped, player)
+
+    if child_score > best_score:
+      best_score = child_score
+      best_sq = sq
+    alpha = max(alpha, child_score)
+    if alpha >= beta:
+      record_cutoff(board.empties, player, sq, depth)
+      if _stats is not None:
+        _stats.cutoff(i)
+      break
+  return best_sq, best_score
+
+def aspiration_search(board, player, depth, moves, previous_score, weights=None, tt=None):
+  """
+  Root PVS in a window centred on the previous iteration score, widened to a
+  full window when the result falls outside. Returns (best move, score).
+  """
+  squares = [move_to_square(move) for move in moves]
+  if tt is None:
+    tt = TT
+  if previous_score is not None:
+    alpha = previous_score - ASPIRATION_WINDOW
+    beta = previous_score + ASPIRATION_WINDOW
+    best_sq, score = pvs_moves(board, player, depth, squares, alpha, beta, weights, tt)
+    if alpha < score < beta:
+      return square_to_move(best_sq), score
+  best_sq, score = pvs_moves(board, player, depth, squares, float('-inf'), float('inf'), weights, tt)
+  return square_to_move(best_sq), score
+
+# In the opening (at least this many empty squares) the 8 symmetric images of
+# a position share one TT entry: the key is the hash of the canonical form and
+# the stored move is mapped to and from the canonical orientation.
+SYMMETRY_TT_EMPTIES = 52
+
+def tt_key(board, player, weights):
+  """Returns (key, sym), sym mapping the board onto the position stored under key."""
+  if board.empties >= SYMMETRY_TT_EMPTIES:
+    key, sym = board.canonical_key(player)
+  else:
+    key, sym = board.hash_key(player), 0
+  return key ^ weights_key(weights), sym
+
+def tt_lookup(board, player, depth, alpha, beta, weights, tt):
+  """
+  Probes tt. Returns (key, sym, score, alpha, beta, tt_sq): score is not None when the
+  stored entry settles the node, otherwise alpha/beta are narrowed by it.
+  tt_sq is the stored best move (square of this board) or None.
+  """
+  # Entry: (depth, bound flag, score, best move); any depth >= ours is reusable
+  key, sym = tt_key(board, player, weights)
+  entry = tt.probe(key)
+  tt_sq = None
+  if entry is not None:
+    tt_depth, flag, tt_score, stored_sq = entry
+    if stored_sq != NO_MOVE:
+      tt_sq = SYMMETRY_SQUARES[INVERSE_SYMMETRY[sym]][stored_sq] if sym else stored_sq
+    if tt_depth >= depth:
+      if flag == EXACT:
+        return key, sym, tt_score, alpha, beta, tt_sq
+      if flag == LOWER:
+        alpha = max(alpha, tt_score)
+      else:
+        beta = min(beta, tt_score)
+      if alpha >= beta:
+        return key, sym, tt_score, alpha, beta, tt_sq
+  return key, sym, None, alpha, beta, tt_sq
+
+def tt_save(key, sym, depth, best_score, best_sq, alpha_orig, beta, tt):
+  if best_score <= alpha_orig:
+    flag = UPPER
+  elif best_score >= beta:
+    flag = LOWER
+  else:
+    flag = EXACT
+  tt.store(key, depth, flag, best_score, SYMMETRY_SQUARES[sym][best_sq] if sym else best_sq)
+
+# --- Move ordering ------------------------------------------------------------
+# Runs at every interior node, so it is table driven: a static value per
+# square, the number of flipped discs (flips_mask, no make/undo), two killer
+# moves per ply and a history table of the moves that caused cutoffs. The TT
+# move, when there is one, is always tried first.
+
+def _square_order_values():
+  corners = {0, 7, 56, 63}
+  values, safe_values, corner_masks = [], [], []
+  for sq in range(64):
+    row, col = divmod(sq, 8)
+    # Nearest corner; X and C squares are only dangerous while it is empty
+    corner = (0 if row < 4 else 56) + (0 if col < 4 else 7)
+    near_corner = sq not in corners and abs(row - corner // 8) <= 1 and abs(col - corner % 8) <= 1
+    edge = row in (0, 7) or col in (0, 7)
+    if sq in corners:
+      value = 1000
+    elif near_corner:
+      value = -500
+    elif edge:
+      value = 50
+    else:
+      value = 0
+    values.append(value)
+    safe_values.append((50 if edge else 0) if near_corner else value)
+    corner_masks.append(1 << corner if near_corner else 0)
+  return values, safe_values, corner_masks
+
+SQUARE_ORDER, SQUARE_ORDER_SAFE, SQUARE_CORNER = _square_order_values()
+FLIP_WEIGHT = 10
+KILLER_BONUS = (800, 600)
+# History scores are capped (the whole table is halved) to stay below the
+# static and killer terms
+HISTORY_LIMIT = 400
+
+# Killer moves by number of empty squares (= ply within a search)
+KILLERS = [[None, None] for _ in range(65)]
+# History table by side to move (index player > 0) and square
+HISTORY = [[0] * 64, [0] * 64]
+
+def record_cutoff(empties, player, sq, depth):
+  """Updates the killer and history tables after a cutoff by sq."""
+  killers = KILLERS[empties]
+  if killers[0] != sq:
+    killers[1] = killers[0]
+    killers[0] = sq
+  history = HISTORY[player > 0]
+  history[sq] += depth * depth
+  if history[sq] > HISTORY_LIMIT:
+    for i in range(64):
+      history[i] >>= 1
+
+def age_move_ordering():
+  """Called before each new search: history is halved, killers are kept."""
+  for history in HISTORY:
+    for i in range(64):
+      history[i] >>= 1
+
+def clear_move_ordering():
+  for killers in KILLERS:
+    killers[0] = killers[1] = None
+  for history in HISTORY:
+    history[:] = [0] * 64
+
+def order_moves(board, player, own_moves, tt_sq=None):
+  """Squares of the legal moves (mask own_moves), most promising first."""
+  if not own_moves & (own_moves - 1):
+    return [own_moves.bit_length() - 1]
+  own, opp = board.bitboards(player)
+  occupied = own | opp
+  killer1, killer2 = KILLERS[board.empties]
+  history = HISTORY[player > 0]
+  scored = []
+  mask = own_moves
+  while mask:
+    bit = mask & -mask
+    mask ^= bit
+    sq = bit.bit_length() - 1
+    if sq == tt_sq:
+      continue
+    score = SQUARE_ORDER_SAFE[sq] if SQUARE_CORNER[sq] & occupied else SQUARE_ORDER[sq]
+    score += flips_mask(own, opp, sq).bit_count() * FLIP_WEIGHT + history[sq]
+    if sq == killer1:
+      score += KILLER_BONUS[0]
+    elif sq == killer2:
+      score += KILLER_BONUS[1]
+    scored.append((score, sq))
+  scored.sort(reverse=True)
+  squares = [sq for _, sq in scored]
+  if tt_sq is not None and own_moves >> tt_sq & 1:
+    squares.insert(0, tt_sq)
+  return squares
+
+def quick_eval(move, board=None, player=None):
+  """
+  Ordering score of a move (col, row): static square value, plus the flipped
+  discs when board and player are given. Used to order root moves.
+  """
+  sq = move_to_square(move)
+  if board is None or player is None:
+    return SQUARE_ORDER[sq]
+  own, opp = board.bitboards(player)
+  score = SQUARE_ORDER_SAFE[sq] if SQUARE_CORNER[sq] & (own | opp) else SQUARE_ORDER[sq]
+  return score + flips_mask(own, opp, sq).bit_count() * FLIP_WEIGHT
@@ -0,0 +1,223 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+
+from ai.minimax import choose_move, score_root_moves
+from game.board import (Board, BLUE, move_to_square, square_to_move,
+                        SYMMETRY_SQUARES, INVERSE_SYMMETRY)
+
+# Bibliothèque d'ouvertures : fichier binaire trié, lu par mmap.
+#
+# Format (little-endian) :
+#   en-tête  : magic b"RVBK", version (H), profondeur de recherche (H), nombre d'entrées (I)
+#   entrées  : own (Q), opp (Q), case du coup (B), profondeur (B), score (f)
+# Une entrée par position, normalisée par symétrie (Board.canonical)
+# et vue du joueur au trait (own = ses pions). Les entrées sont triées par
+# (own, opp) : la recherche est une dichotomie directement dans le fichier.
+
+MAGIC = b"RVBK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<QQBBf")
+KEY = struct.Struct("<QQ")
+
+DEFAULT_BOOK_PLIES = 6
+DEFAULT_BOOK_DEPTH = 6
+
+
+class OpeningBook:
+    """Lecture d'un fichier de bibliothèque (mmap, lecture seule)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: fichier vide")
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: en-tête incomplet")
+        magic, version, self.depth, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: format de bibliothèque inconnu")
+        if len(self._mm) != HEADER.size + self.count * RECORD.size:
+            self.close()
+            raise ValueError(f"{path}: taille incohérente")
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def _find(self, own, opp):
+        key = (own, opp)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if KEY.unpack_from(self._mm, HEADER.size + mid * RECORD.size) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count:
+            record = RECORD.unpack_from(self._mm, HEADER.size + lo * RECORD.size)
+            if record[:2] == key:
+                return record
+        return None
+
+    def lookup(self, board, player):
+        """
+        Entrée de la position : (case du coup, profondeur, score) dans le repère
+        du plateau, ou None si la position n'est pas dans la bibliothèque.
+        """
+        own, opp, sym = board.canonical(player)
+        record = self._find(own, opp)
+        if record is None:
+            return None
+        _, _, sq, depth, score = record
+        return SYMMETRY_SQUARES[INVERSE_SYMMETRY[sym]][sq], depth, score
+
+    def get_move(self, board, player):
+        """Coup (col, row) de la bibliothèque, None si absent (ou illégal)."""
+        entry = self.lookup(board, player)
+        if entry is None or not board.valid_moves_mask(player) >> entry[0] & 1:
+            return None
+        return square_to_move(entry[0])
+
+
+# Bibliothèques ouvertes, partagées par les joueurs d'un même processus
+_BOOKS = {}
+
+
+def open_book(book):
+    """Chemin -> OpeningBook (ouvert une seule fois) ; un OpeningBook est retourné tel quel."""
+    if book is None or isinstance(book, OpeningBook):
+        return book
+    path = os.path.abspath(book)
+    if path not in _BOOKS:
+        _BOOKS[path] = OpeningBook(path)
+    return _BOOKS[path]
+
+
+# --- Construction ---------------------------------------------------------
+
+
+def write_book(path, entries, depth):
+    """
+    Écrit la bibliothèque. entries : {(own, opp): (case, profondeur, score)}
+    en forme canonique. Écriture dans un fichier temporaire puis remplacement,
+    pour ne jamais exposer un fichier partiel aux lecteurs.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, depth, len(entries)))
+        for (own, opp), (sq, entry_depth, score) in sorted(entries.items()):
+            f.write(RECORD.pack(own, opp, sq, entry_depth, score))
+    os.replace(tmp, path)
+
+
+def tree_positions(plies):
+    """
+    Toutes les positions (canoniques, vues du joueur au trait) atteintes en
+    moins de `plies` demi-coups depuis la position de départ.
+    """
+    board = Board()
+    level = {board.canonical(BLUE)[:2]}
+    positions = set(level)
+    for _ in range(plies - 1):
+        following = set()
+        for own, opp in level:
+            board.set_position(own, opp)
+            for move in board.get_valid_moves(BLUE):
+                flipped = board.make_move(move, BLUE)
+                following.add(board.canonical(-BLUE)[:2])
+                board.undo_move(move, flipped, BLUE)
+        level = following - positions
+        positions |= level
+    return positions
+
+
+def selfplay_positions(games, plies, depth, weights=None, randomness=0.1, seed=None):
+    """
+    Positions des `plies` premiers demi-coups de parties jouées par l'IA
+    contre elle-même ; randomness = probabilité de jouer un coup au hasard.
+    """
+    rng = random.Random(seed)
+    positions = set()
+    for _ in range(games):
+        board = Board()
+        player = BLUE
+        for _ in range(plies):
+            moves = board.get_valid_moves(player)
+            if not moves:
+                if not board.get_valid_moves(-player):
+                    break
+                player = -player
+                continue
+            positions.add(board.canonical(player)[:2])
+            if rng.random() < randomness:
+                move = rng.choice(moves)
+            else:
+                move = choose_move(board, player, depth, weights=weights, endgame_empties=0)
+            board.apply_move(move[0], move[1], player)
+            player = -player
+    return positions
+
+
+def build_book(path, positions, depth=DEFAULT_BOOK_DEPTH, weights=None, workers=None, progress=None):
+    """
+    Recherche chaque position à la profondeur `depth` et écrit la bibliothèque.
+    À score égal, le coup retenu est le premier dans l'ordre des cases
+    (bibliothèque déterministe). progress(i, total) est appelé après chaque position.
+    """
+    board = Board()
+    entries = {}
+    positions = sorted(positions)
+    for i, (own, opp) in enumerate(positions):
+        board.set_position(own, opp)
+        moves = board.get_valid_moves(BLUE)
+        if moves:
+            move_scores = score_root_moves(board, BLUE, depth, moves, weights=weights, workers=workers)
+            move, score = max(move_scores, key=lambda item: item[1])
+            entries[(own, opp)] = (move_to_square(move), depth, score)
+        if progress is not None:
+            progress(i + 1, len(positions))
+    write_book(path, entries, depth)
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construction de la bibliothèque d'ouvertures")
+    parser.add_argument("output", help="fichier de sortie")
+    parser.add_argument("--plies", type=int, default=DEFAULT_BOOK_PLIES, help="demi-coups couverts")
+    parser.add_argument("--depth", type=int, default=DEFAULT_BOOK_DEPTH, help="profondeur de recherche")
+    parser.add_argument("--selfplay", type=int, default=0, metavar="GAMES",
+                        help="positions issues de GAMES parties en auto-jeu au lieu de l'arbre complet")
+    parser.add_argument("--workers", type=int, default=None, help="processus pour les coups racine")
+    args = parser.parse_args()
+
+    if args.selfplay:
+        positions = selfplay_positions(args.selfplay, args.plies, args.depth)
+    else:
+        positions = tree_positions(args.plies)
+    count = build_book(args.output, positions, args.depth, workers=args.workers,
+                       progress=lambda i, n: print(f"\r{i}/{n}", end="", flush=True))
+    print(f"\n{count} positions -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+from itertools import product
+
+from game.board import transpose
+
+# Évaluation par motifs : lignes et régions de coin lues dans des tables.
+#
+# Un motif est une suite de cases ; sa configuration est un index en base 3
+# (chiffre 0 = vide, 1 = pion du joueur, 2 = pion adverse), calculé à partir
+# des bits extraits des deux bitboards : index = B3[bits du joueur] + 2 * B3[bits adverses].
+# Les tables donnent, pour chaque configuration, la valeur entière d'une
+# feature vue du joueur ; elles ne dépendent pas des poids (pondération dans
+# ai.heuristics.evaluate) et sont construites une fois, à l'import.
+#
+# Motifs :
+#   diagonales A1-H8 et A8-H1 (8 cases) : les 4 coins et les 4 cases X y sont,
+#       d'où les features corner et risk exactes (DIAG_CORNER, DIAG_RISK) ;
+#   bords (8 cases) : pions stables du bord (EDGE_STABILITY) ;
+#   blocs 2x5 de coin, 8 au total (BLOCK_STABILITY) : pions de la deuxième
+#       rangée dont la stabilité se prouve dans le bloc, case X exceptée.
+# Bords gauche / droit et blocs verticaux sont lus sur le plateau transposé :
+# mêmes extractions et mêmes tables que les bords haut / bas et les blocs
+# horizontaux. Les blocs de droite, lus coin en dernier, ont leur propre
+# conversion en base 3 (B3_10_RIGHT) au lieu de tables en double.
+#
+# Stabilité (feature "stability") : pions qui ne pourront plus être retournés,
+# les coins exceptés (feature corner). Sur un bord, un pion ne peut être
+# retourné que le long du bord : il est stable si le bord est plein ou s'il
+# est relié à un coin par des pions de sa couleur. Dans un bloc, un pion de la
+# deuxième rangée est stable si, sur chacune de ses 4 lignes, l'un de ses deux
+# voisins est un pion stable de sa couleur (propagation jusqu'au point fixe,
+# les cases hors du bloc étant inconnues : estimation par défaut). La case X
+# a ses voisins d'anti-diagonale (C1 et A3 pour A1) dans deux blocs
+# différents : elle est testée à part, directement sur les bitboards, pour que
+# le score ne dépende pas de l'orientation du plateau.
+
+EMPTY, OWN, OPP = 0, 1, 2
+
+
+def _base3(bits, order=None):
+    """B3[m] : le masque m lu en base 3, le bit i donnant le chiffre order[i]."""
+    order = order or list(range(bits))
+    return [sum(3 ** order[i] for i in range(bits) if m >> i & 1) for m in range(1 << bits)]
+
+
+B3_8 = _base3(8)
+B3_10 = _base3(10)
+# Blocs de droite : chaque rangée de 5 est lue du côté opposé au coin
+B3_10_RIGHT = _base3(10, [4, 3, 2, 1, 0, 9, 8, 7, 6, 5])
+
+
+def _configurations(size):
+    """Toutes les configurations (chiffres 0 / 1 / 2), dans l'ordre de leur index."""
+    for digits in product((EMPTY, OWN, OPP), repeat=size):
+        yield digits[::-1]
+
+
+def _sign(digit):
+    return 1 if digit == OWN else (-1 if digit == OPP else 0)
+
+
+# --- Diagonales ----------------------------------------------------------------
+# Chiffre i = case de la colonne i : coins aux chiffres 0 et 7, cases X aux
+# chiffres 1 et 6.
+
+
+def _diagonal_tables():
+    corner, risk = [], []
+    for digits in _configurations(8):
+        corner.append(25 * (_sign(digits[0]) + _sign(digits[7])))
+        risk.append(15 * ((_sign(digits[1]) if digits[0] == EMPTY else 0)
+                          + (_sign(digits[6]) if digits[7] == EMPTY else 0)))
+    return corner, risk
+
+
+DIAG_CORNER, DIAG_RISK = _diagonal_tables()
+
+
+# --- Bords ---------------------------------------------------------------------
+
+
+def _edge_stable(digits):
+    """Cases stables (ensemble d'index) d'un bord de 8 cases."""
+    if EMPTY not in digits:
+        return set(range(8))
+    stable = set()
+    for run in (range(8), range(7, -1, -1)):
+        colour = digits[run[0]]
+        for i in run:
+            if colour == EMPTY or digits[i] != colour:
+                break
+            stable.add(i)
+    return stable
+
+
+def _edge_table():
+    table = []
+    for digits in _configurations(8):
+        # Coins exclus (feature corner)
+        table.append(sum(_sign(digits[i]) for i in _edge_stable(digits) if 0 < i < 7))
+    return table
+
+
+EDGE_STABILITY = _edge_table()
+
+
+# --- Blocs 2x5 -----------------------------------------------------------------
+# Chiffres 0-4 : rangée du bord, depuis le coin ; 5-9 : deuxième rangée, depuis
+# la colonne du coin. Rangée r, colonne c du bloc -> chiffre 5 * r + c.
+
+
+def _block_stable(digits):
+    """Cases stables (ensemble de chiffres) d'un bloc, prouvées dans le bloc seul."""
+    stable = set()
+    # Bords : pions reliés au coin
+    for run in ((0, 1, 2, 3, 4), (0, 5)):
+        colour = digits[0]
+        for i in run:
+            if colour == EMPTY or digits[i] != colour:
+                break
+            stable.add(i)
+
+    def supported(i, colour):
+        return i in stable and digits[i] == colour
+
+    changed = True
+    while changed:
+        changed = False
+        for c in range(1, 5):
+            i = 5 + c
+            colour = digits[i]
+            if colour == EMPTY or i in stable:
+                continue
+            # Verticale, horizontale, diagonale vers le coin, anti-diagonale
+            if (supported(c, colour)
+                    and (supported(i - 1, colour) or (c < 4 and supported(i + 1, colour)))
+                    and supported(c - 1, colour)
+                    and c < 4 and supported(c + 1, colour)):
+                stable.add(i)
+                changed = True
+    return stable
+
+
+def _block_table():
+    # Case X (chiffre 6) exclue : testée à part, voir X_SQUARES
+    return [sum(_sign(digits[i]) for i in _block_stable(digits) if i >= 7) for digits in _configurations(10)]
+
+
+BLOCK_STABILITY = _block_table()
+
+
+# --- Évaluation ----------------------------------------------------------------
+# Extractions déroulées à la main : appelées à chaque feuille de la recherche.
+# Diagonales : rassemblement des 8 bits dans l'octet haut par multiplication
+# (aucune retenue, chaque produit partiel tombe sur un bit distinct).
+
+MAIN_DIAGONAL = 0x8040201008040201
+ANTI_DIAGONAL = 0x0102040810204080
+GATHER = 0x0101010101010101
+
+
+def corner_risk(own, opp):
+    """(corner, risk) : mêmes valeurs que corner_score et risk_score."""
+    d1 = B3_8[(own & MAIN_DIAGONAL) * GATHER >> 56 & 0xFF] + 2 * B3_8[(opp & MAIN_DIAGONAL) * GATHER >> 56 & 0xFF]
+    d2 = B3_8[(own & ANTI_DIAGONAL) * GATHER >> 56 & 0xFF] + 2 * B3_8[(opp & ANTI_DIAGONAL) * GATHER >> 56 & 0xFF]
+    return DIAG_CORNER[d1] + DIAG_CORNER[d2], DIAG_RISK[d1] + DIAG_RISK[d2]
+
+
+CORNERS = 0x8100000000000081
+A1, H1, A8, H8 = 1, 1 << 7, 1 << 56, 1 << 63
+
+
+def _squares(*squares):
+    return sum(1 << sq for sq in squares)
+
+
+# Par coin : (coin, voisins de bord et case X, cases suivantes des bords). La
+# case X est stable si les quatre premières cases sont de sa couleur et l'une
+# des deux suivantes aussi (voisin stable sur l'anti-diagonale).
+X_SQUARES = (
+    (_squares(0, 1, 8, 9), _squares(2, 16)),
+    (_squares(7, 6, 15, 14), _squares(5, 23)),
+    (_squares(56, 57, 48, 49), _squares(58, 40)),
+    (_squares(63, 62, 55, 54), _squares(61, 47)),
+)
+
+
+def _edges(own, opp):
+    """Bords haut (rangée 1) et bas (rangée 8) ; bords gauche et droit sur le plateau transposé."""
+    return (EDGE_STABILITY[B3_8[own & 0xFF] + 2 * B3_8[opp & 0xFF]]
+            + EDGE_STABILITY[B3_8[own >> 56] + 2 * B3_8[opp >> 56]])
+
+
+def stability_score(own, opp):
+    """Pions stables du joueur moins pions stables adverses (coins exceptés)."""
+    occupied = own | opp
+    if not occupied & CORNERS:
+        # Ni pion relié à un coin, ni bord plein
+        return 0
+    own_t, opp_t = transpose(own), transpose(opp)
+    score = _edges(own, opp) + _edges(own_t, opp_t)
+    # Un bloc dont le coin est vide n'a aucun pion stable
+    left, right, blocks = B3_10, B3_10_RIGHT, BLOCK_STABILITY
+    if occupied & A1:
+        score += (blocks[left[own & 0x1F | own >> 3 & 0x3E0] + 2 * left[opp & 0x1F | opp >> 3 & 0x3E0]]
+                  + blocks[left[own_t & 0x1F | own_t >> 3 & 0x3E0] + 2 * left[opp_t & 0x1F | opp_t >> 3 & 0x3E0]])
+    if occupied & H1:
+        # H1 est le coin bas gauche du plateau transposé
+        score += (blocks[right[own >> 3 & 0x1F | own >> 6 & 0x3E0] + 2 * right[opp >> 3 & 0x1F | opp >> 6 & 0x3E0]]
+                  + blocks[left[own_t >> 56 & 0x1F | own_t >> 43 & 0x3E0]
+                           + 2 * left[opp_t >> 56 & 0x1F | opp_t >> 43 & 0x3E0]])
+    if occupied & A8:
+        score += (blocks[left[own >> 56 & 0x1F | own >> 43 & 0x3E0] + 2 * left[opp >> 56 & 0x1F | opp >> 43 & 0x3E0]]
+                  + blocks[right[own_t >> 3 & 0x1F | own_t >> 6 & 0x3E0]
+                           + 2 * right[opp_t >> 3 & 0x1F | opp_t >> 6 & 0x3E0]])
+    if occupied & H8:
+        score += (blocks[right[own >> 59 & 0x1F | own >> 46 & 0x3E0] + 2 * right[opp >> 59 & 0x1F | opp >> 46 & 0x3E0]]
+                  + blocks[right[own_t >> 59 & 0x1F | own_t >> 46 & 0x3E0]
+                           + 2 * right[opp_t >> 59 & 0x1F | opp_t >> 46 & 0x3E0]])
+    for group, next_squares in X_SQUARES:
+        if own & group == group and own & next_squares:
+            score += 1
+        elif opp & group == group and opp & next_squares:
+            score -= 1
+    return score
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import ai.minimax as mm
+from ai.minimax import choose_move, quick_eval, tt_key, SearchTimeout
+from ai.transposition import NO_MOVE
+from game.board import square_to_move, SYMMETRY_SQUARES, INVERSE_SYMMETRY
+
+# Réflexion sur le temps de l'adversaire (« pondering ») : pendant que
+# l'humain réfléchit, un thread cherche la réponse de l'IA à chacune de ses
+# répliques possibles, la plus probable d'abord (meilleur coup de la TT, à
+# défaut quick_eval). Les coups trouvés sont gardés par position ; la TT, les
+# coups killers et l'historique profitent aussi à la recherche suivante.
+#
+# Le thread tourne pendant que le thread principal attend dans input() (le
+# GIL est alors libre). Une seule recherche à la fois : stop() interrompt la
+# recherche en cours (minimax.stop_search) et attend la fin du thread avant
+# que l'IA ne joue.
+
+# Durée maximale d'une session de réflexion (s)
+MAX_PONDER_TIME = 120.0
+
+
+class Ponderer:
+    """Réflexion en arrière-plan pour un AIPlayer."""
+
+    def __init__(self, player, max_time=MAX_PONDER_TIME):
+        self.player = player
+        self.max_time = max_time
+        self._thread = None
+        self._stopping = False
+        # (blue, pink) après la réplique -> coup de l'IA
+        self.results = {}
+        self.predicted = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def active(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, board, opponent):
+        """Commence à réfléchir sur `board`, où `opponent` a le trait."""
+        self.stop()
+        self.results = {}
+        self.predicted = None
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, args=(board.clone(), opponent), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping = True
+        mm.stop_search()
+        self._thread.join()
+        mm.reset_stop()
+        self._thread = None
+
+    def take(self, board):
+        """
+        Arrête la réflexion ; coup déjà trouvé pour `board` (l'IA au trait), ou
+        None si la réplique jouée n'a pas été traitée à temps.
+        """
+        if self._thread is None and not self.results:
+            return None
+        self.stop()
+        move = self.results.get((board.blue, board.pink))
+        if move is not None and board.is_valid_move(move, self.player.color):
+            self.hits += 1
+            return move
+        self.misses += 1
+        return None
+
+    def replies(self, board, opponent):
+        """Répliques de l'adversaire, la plus probable d'abord (None = passe)."""
+        moves = board.get_valid_moves(opponent)
+        if not moves:
+            return [None]
+        # Meilleur coup enregistré dans la table du joueur (celle de ses recherches)
+        key, sym = tt_key(board, opponent, self.player.weights)
+        entry = self.player.tt.probe(key)
+        predicted = None
+        if entry is not None and entry[3] != NO_MOVE:
+            sq = SYMMETRY_SQUARES[INVERSE_SYMMETRY[sym]][entry[3]] if sym else entry[3]
+            predicted = square_to_move(sq)
+        moves.sort(key=lambda move: (move == predicted, quick_eval(move, board, opponent)), reverse=True)
+        return moves
+
+    def _run(self, board, opponent):
+        player = self.player
+        deadline = time.perf_counter() + self.max_time
+        replies = self.replies(board, opponent)
+        self.predicted = replies[0]
+        for reply in replies:
+            if self._stopping or time.perf_counter() > deadline:
+                return
+            child = board.clone()
+            if reply is not None:
+                child.apply_move(reply[0], reply[1], opponent)
+            if not child.get_valid_moves(player.color):
+                continue
+            # Mêmes paramètres que AIPlayer.get_move, dans ce processus et sans le
+            # cache SQLite (connexion réservée au thread qui l'a ouverte)
+            try:
+                move = choose_move(child, player.color, depth=player.depth, weights=player.weights,
+                                   tt_mb=player.tt_mb, time_limit=player.time_limit,
+                                   algorithm=player.algorithm, endgame_empties=player.endgame_empties,
+                                   endgame_mode=player.endgame_mode, tt=player.tt)
+            except SearchTimeout:
+                return
+            # Une recherche interrompue (approfondissement itératif) est incomplète
+            if self._stopping:
+                return
+            if move is not None:
+                self.results[(child.blue, child.pink)] = move
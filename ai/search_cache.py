@@ -0,0 +1,130 @@
+import os
+import sqlite3
+
+from ai.minimax import weights_key
+from game.board import canonical_bitboards, move_to_square, square_to_move, SYMMETRY_SQUARES, INVERSE_SYMMETRY
+
+# Cache persistant des résultats de choose_move (coup choisi et score racine),
+# partagé entre parties et processus : base SQLite en mode WAL (lectures
+# concurrentes, écritures sérialisées par SQLite).
+#
+# Clé : position (bitboards BLUE / PINK en forme canonique : une entrée par
+# classe de symétrie), joueur au trait, profondeur et empreinte des poids
+# (ai.minimax.weights_key, calculée sur leur contenu : valable d'un processus
+# à l'autre).
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search (
+    blue INTEGER NOT NULL,
+    pink INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    weights TEXT NOT NULL,
+    move INTEGER NOT NULL,
+    score REAL,
+    PRIMARY KEY (blue, pink, player, depth, weights)
+) WITHOUT ROWID
+"""
+
+# Attente maximale (s) quand un autre processus écrit
+BUSY_TIMEOUT = 10.0
+
+
+def weights_fingerprint(weights):
+    """Empreinte stable d'un jeu de poids ('default' pour les poids par défaut)."""
+    return "default" if weights is None else f"{weights_key(weights):016x}"
+
+
+def _signed(x):
+    # Les entiers SQLite sont signés sur 64 bits
+    return x - (1 << 64) if x >= 1 << 63 else x
+
+
+class SearchCache:
+    """
+    Cache sur disque. Une connexion par processus, ouverte à la première
+    utilisation : l'objet peut être créé avant un fork.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _key(self, board, player, depth, weights):
+        """(clé SQL, sym) ; sym envoie le plateau sur sa forme canonique."""
+        blue, pink, sym = canonical_bitboards(board.blue, board.pink)
+        return (_signed(blue), _signed(pink), player, depth, weights_fingerprint(weights)), sym
+
+    def get(self, board, player, depth, weights=None):
+        """(coup, score) en cache, ou None. Le score peut être None."""
+        key, sym = self._key(board, player, depth, weights)
+        row = self._connection().execute(
+            "SELECT move, score FROM search WHERE blue=? AND pink=? AND player=? AND depth=? AND weights=?", key,
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return square_to_move(SYMMETRY_SQUARES[INVERSE_SYMMETRY[sym]][row[0]]), row[1]
+
+    def get_move(self, board, player, depth, weights=None):
+        """Coup en cache s'il est légal dans la position, sinon None."""
+        entry = self.get(board, player, depth, weights)
+        if entry is None or not board.valid_moves_mask(player) >> move_to_square(entry[0]) & 1:
+            return None
+        return entry[0]
+
+    def put(self, board, player, depth, move, score=None, weights=None):
+        key, sym = self._key(board, player, depth, weights)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO search VALUES (?, ?, ?, ?, ?, ?, ?)",
+            key + (SYMMETRY_SQUARES[sym][move_to_square(move)], score),
+        )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM search").fetchone()[0]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM search")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Caches ouverts, partagés par les joueurs d'un même processus
+_CACHES = {}
+
+
+def open_cache(cache):
+    """Chemin -> SearchCache (un seul par fichier) ; un SearchCache est retourné tel quel."""
+    if cache is None or isinstance(cache, SearchCache):
+        return cache
+    path = os.path.abspath(cache)
+    if path not in _CACHES:
+        _CACHES[path] = SearchCache(path)
+    return _CACHES[path]
@@ -0,0 +1,234 @@
+from array import array
+
+# Type de score stocké dans la TT
+EXACT = 0
+LOWER = 1  # fail-high : le vrai score est >= score
+UPPER = 2  # fail-low : le vrai score est <= score
+
+NO_MOVE = 255
+DEFAULT_TT_MB = 16
+
+# Deux entrées par bucket : la première garde la recherche la plus profonde,
+# la seconde est remplacée à chaque écriture.
+BUCKET_SIZE = 2
+# clé (Q) + score (d) + profondeur (b) + flag (B) + coup (B)
+ENTRY_BYTES = 8 + 8 + 1 + 1 + 1
+
+
+class TranspositionTable:
+    """
+    Table de transposition de taille fixe, stockée dans des buffers `array`.
+    La taille est fixée par un budget mémoire en Mo (borne haute : le nombre
+    de buckets est arrondi à la puissance de 2 inférieure).
+    Une entrée = (profondeur, flag, score, case du meilleur coup ou NO_MOVE).
+    """
+
+    def __init__(self, size_mb=DEFAULT_TT_MB):
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        self.size_mb = size_mb
+        entries = max(BUCKET_SIZE, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        # Nombre de buckets arrondi à la puissance de 2 inférieure (index par masque)
+        buckets = 1 << ((entries // BUCKET_SIZE).bit_length() - 1)
+        self.mask = buckets - 1
+        self.entries = buckets * BUCKET_SIZE
+        self.keys = array('Q', [0]) * self.entries
+        self.scores = array('d', [0.0]) * self.entries
+        self.depths = array('b', [-1]) * self.entries  # -1 = entrée vide
+        self.flags = array('B', [0]) * self.entries
+        self.moves = array('B', [NO_MOVE]) * self.entries
+        self.reset_stats()
+
+    def clear(self):
+        self.resize(self.size_mb)
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key):
+        self.probes += 1
+        i = (key & self.mask) * BUCKET_SIZE
+        for slot in (i, i + 1):
+            if self.keys[slot] == key and self.depths[slot] >= 0:
+                self.hits += 1
+                return self.depths[slot], self.flags[slot], self.scores[slot], self.moves[slot]
+        return None
+
+    def store(self, key, depth, flag, score, move=NO_MOVE):
+        self.stores += 1
+        i = (key & self.mask) * BUCKET_SIZE
+        if self.keys[i] == key or depth >= self.depths[i]:
+            slot = i
+            if self.keys[i + 1] == key:
+                self.depths[i + 1] = -1  # évite un doublon périmé
+        else:
+            slot = i + 1
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.flags[slot] = flag
+        self.scores[slot] = score
+        self.moves[slot] = move
+
+    @property
+    def nbytes(self):
+        return sum(buf.itemsize * len(buf) for buf in (self.keys, self.scores, self.depths, self.flags, self.moves))
+
+    def occupancy(self):
+        """Fraction des entrées utilisées."""
+        return sum(1 for d in self.depths if d >= 0) / self.entries
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self):
+        return {
+            'size_mb': self.size_mb,
+            'entries': self.entries,
+            'occupancy': self.occupancy(),
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hit_rate(),
+        }
+
+
+# --- Table partagée entre processus (recherche Lazy SMP) -------------------------
+# Mêmes buckets de 2 entrées, dans un bloc multiprocessing.shared_memory lu et
+# écrit sans verrou par tous les processus. Une entrée = 3 mots de 64 bits :
+#   contrôle = clé ^ score ^ info, score (bits du double), info ;
+#   info = (profondeur + 1) | flag << 8 | coup << 16 (0 = entrée vide).
+# Deux écritures simultanées peuvent mélanger les mots d'une entrée : le mot de
+# contrôle ne correspond alors plus et l'entrée est vue comme absente (table
+# « avec pertes », sans verrou ni mauvaise donnée).
+
+SHARED_ENTRY_WORDS = 3
+
+
+class SharedTranspositionTable:
+    """
+    TT en mémoire partagée, même interface que TranspositionTable.
+    Créée par le processus principal (name=None), ouverte par les autres avec
+    le nom du bloc. Les compteurs (probes, hits, stores) sont propres à chaque
+    processus.
+    """
+
+    def __init__(self, size_mb=DEFAULT_TT_MB, name=None):
+        self._shm = None
+        self.owner = name is None
+        # Conversion double <-> bits sur 64 bits
+        self._conv = array('Q', [0])
+        self._conv_d = memoryview(self._conv).cast('B').cast('d')
+        if name is None:
+            self.resize(size_mb)
+        else:
+            self._attach(name)
+
+    def _attach(self, name):
+        from multiprocessing import shared_memory
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._map()
+
+    def _map(self):
+        self.name = self._shm.name
+        self.entries = len(self._shm.buf) // (8 * SHARED_ENTRY_WORDS)
+        self.mask = self.entries // BUCKET_SIZE - 1
+        self.size_mb = self.entries * 8 * SHARED_ENTRY_WORDS / (1024 * 1024)
+        self.words = self._shm.buf.cast('Q')
+        self.reset_stats()
+
+    def resize(self, size_mb):
+        from multiprocessing import shared_memory
+        if not self.owner:
+            raise ValueError("only the process that created the table can resize it")
+        self.close()
+        if self._shm is not None:
+            self._shm.unlink()
+        entries = max(BUCKET_SIZE, int(size_mb * 1024 * 1024) // (8 * SHARED_ENTRY_WORDS))
+        buckets = 1 << ((entries // BUCKET_SIZE).bit_length() - 1)
+        self._shm = shared_memory.SharedMemory(create=True, size=buckets * BUCKET_SIZE * 8 * SHARED_ENTRY_WORDS)
+        self._map()
+        # La taille demandée sert de clé de comparaison (tt_mb != TT.size_mb)
+        self.size_mb = size_mb
+
+    def clear(self):
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key):
+        self.probes += 1
+        words = self.words
+        base = (key & self.mask) * BUCKET_SIZE * SHARED_ENTRY_WORDS
+        for b in (base, base + SHARED_ENTRY_WORDS):
+            info = words[b + 2]
+            if info:
+                bits = words[b + 1]
+                if words[b] ^ bits ^ info == key:
+                    self.hits += 1
+                    self._conv[0] = bits
+                    return (info & 0xFF) - 1, (info >> 8) & 0xFF, self._conv_d[0], info >> 16
+        return None
+
+    def store(self, key, depth, flag, score, move=NO_MOVE):
+        self.stores += 1
+        words = self.words
+        first = (key & self.mask) * BUCKET_SIZE * SHARED_ENTRY_WORDS
+        second = first + SHARED_ENTRY_WORDS
+        info = words[first + 2]
+        first_key = words[first] ^ words[first + 1] ^ info
+        if first_key == key or depth >= (info & 0xFF) - 1:
+            b = first
+            if words[second] ^ words[second + 1] ^ words[second + 2] == key:
+                words[second + 2] = 0  # évite un doublon périmé
+        else:
+            b = second
+        self._conv_d[0] = score
+        bits = self._conv[0]
+        info = (depth + 1) | flag << 8 | move << 16
+        words[b] = key ^ bits ^ info
+        words[b + 1] = bits
+        words[b + 2] = info
+
+    @property
+    def nbytes(self):
+        return len(self._shm.buf)
+
+    def occupancy(self):
+        words = self.words
+        return sum(1 for i in range(2, len(words), SHARED_ENTRY_WORDS) if words[i]) / self.entries
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self):
+        return {
+            'size_mb': self.size_mb,
+            'entries': self.entries,
+            'occupancy': self.occupancy(),
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hit_rate(),
+        }
+
+    def close(self):
+        """Libère la projection locale (le bloc reste tant qu'il n'est pas détruit)."""
+        if self._shm is not None and getattr(self, 'words', None) is not None:
+            self.words.release()
+            self.words = None
+            self._shm.close()
+
+    def unlink(self):
+        """Détruit le bloc (processus créateur)."""
+        if self._shm is not None:
+            self.close()
+            if self.owner:
+                self._shm.unlink()
+            self._shm = None
@@ -0,0 +1,291 @@
+"""
+Réglage des poids de l'évaluation par auto-jeu (méthode « Texel ») :
+  1. generate : parties de l'IA contre elle-même (en parallèle), chaque
+     position étant étiquetée par le résultat final de la partie ;
+  2. features : les features d'evaluate, calculées par lots (ai.batch_eval) ;
+  3. fit : régression logistique par phase, P(gain) = sigmoid(K * score),
+     où K est une échelle unique ajustée pour les poids de départ (toutes
+     phases confondues) : les nouveaux poids restent dans les unités de
+     l'évaluation actuelle. La régularisation tire les poids vers ceux de
+     départ (features réduites) ; sa force est choisie par phase sur des
+     parties de validation, ce qui évite de suivre le bruit des phases peu
+     informatives (l'ouverture, jouée en partie au hasard).
+Le résultat est un profil au format de ai.ai_profiles.AI_PROFILES.
+
+Utilisation, depuis la racine du dépôt (le module importe game et ai) :
+  python -m ai.tuning generate positions.npz --games 400 --depth 2 --profile DEFAULT
+  python -m ai.tuning fit positions.npz --profile DEFAULT -o tuned.json
+--profile choisit les poids joués pendant l'auto-jeu (generate) et les poids
+de départ de l'ajustement (fit) ; par défaut, ceux de l'évaluation.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ai.ai_profiles import AI_PROFILES
+from ai.batch_eval import FEATURES, PHASES, batch_features, phase_index, weight_matrix
+from ai.minimax import choose_move
+from game.batch_board import BoardBatch
+from game.board import Board, BLUE
+
+DEFAULT_GAMES = 400
+DEFAULT_DEPTH = 2
+# Premiers demi-coups joués au hasard (diversité des parties)
+RANDOM_PLIES = 6
+# Probabilité d'un coup au hasard ensuite
+EPSILON = 0.1
+# Résolution exacte en fin de partie pendant la génération (étiquettes justes)
+GENERATION_ENDGAME_EMPTIES = 8
+# Forces de régularisation essayées (L2 vers les poids de départ, features réduites)
+L2_GRID = (1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+# Une partie sur VALIDATION_EVERY sert à la validation
+VALIDATION_EVERY = 5
+
+
+# --- 1. Génération ------------------------------------------------------------
+
+# Tableaux d'un jeu de positions (fichier .npz)
+DATASET_KEYS = ('blue', 'pink', 'player', 'result', 'game')
+
+
+def _selfplay_game(seed, depth, weights):
+    """
+    Une partie ; retourne la liste des (blue, pink, joueur au trait) et le
+    résultat pour BLUE (1, 0.5 ou 0).
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    board = Board()
+    player = BLUE
+    positions = []
+    ply = 0
+    while not board.is_terminal():
+        moves = board.get_valid_moves(player)
+        if moves:
+            positions.append((board.blue, board.pink, player))
+            if ply < RANDOM_PLIES or rng.random() < EPSILON:
+                move = rng.choice(moves)
+            else:
+                move = choose_move(board, player, depth, weights=weights,
+                                   endgame_empties=GENERATION_ENDGAME_EMPTIES)
+            board.apply_move(move[0], move[1], player)
+            ply += 1
+        player = -player
+    diff = board.score(BLUE)
+    return positions, 1.0 if diff > 0 else (0.0 if diff < 0 else 0.5)
+
+
+def _selfplay_chunk(first_game, seeds, depth, weights):
+    blue, pink, players, results, games = [], [], [], [], []
+    for game, seed in enumerate(seeds, start=first_game):
+        positions, result = _selfplay_game(seed, depth, weights)
+        for b, p, player in positions:
+            blue.append(b)
+            pink.append(p)
+            players.append(player)
+            results.append(result if player == BLUE else 1.0 - result)
+            games.append(game)
+    return blue, pink, players, results, games
+
+
+def generate(games=DEFAULT_GAMES, depth=DEFAULT_DEPTH, weights=None, workers=None, seed=0, progress=None):
+    """
+    Positions étiquetées issues de `games` parties d'auto-jeu, réparties sur
+    `workers` processus. Retourne un dict de tableaux :
+    blue, pink (uint64), player (+1 / -1), result (score du joueur au trait),
+    game (numéro de la partie).
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = [seed * 1_000_003 + i for i in range(games)]
+    # Petits lots : répartition équilibrée et progression régulière
+    chunk = max(1, min(10, games // (workers * 4) or 1))
+    chunks = [seeds[i:i + chunk] for i in range(0, games, chunk)]
+    data = {key: [] for key in DATASET_KEYS}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_selfplay_chunk, i * chunk, c, depth, weights) for i, c in enumerate(chunks)]
+        for done, future in enumerate(futures, start=1):
+            for key, values in zip(DATASET_KEYS, future.result()):
+                data[key].extend(values)
+            if progress is not None:
+                progress(min(done * chunk, games), games)
+    return {
+        'blue': np.array(data['blue'], dtype=np.uint64),
+        'pink': np.array(data['pink'], dtype=np.uint64),
+        'player': np.array(data['player'], dtype=np.int8),
+        'result': np.array(data['result'], dtype=np.float64),
+        'game': np.array(data['game'], dtype=np.int32),
+    }
+
+
+def save_dataset(path, data):
+    np.savez_compressed(path, **data)
+
+
+def load_dataset(path):
+    with np.load(path) as f:
+        return {key: f[key] for key in DATASET_KEYS}
+
+
+# --- 2. Features --------------------------------------------------------------
+
+
+def dataset_features(data):
+    """(features (N, 7) float64, phase (N,) index dans PHASES)."""
+    batch = BoardBatch(np.stack([data['blue'], data['pink']], axis=1))
+    players = data['player'].astype(np.int64)
+    return batch_features(batch, players).astype(np.float64), phase_index(batch.empties())
+
+
+# --- 3. Ajustement -------------------------------------------------------------
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -500, 500)))
+
+
+def log_loss(X, y, beta):
+    p = np.clip(_sigmoid(X @ beta), 1e-12, 1 - 1e-12)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+def fit_scale(X, y, w):
+    """Échelle K minimisant la perte de sigmoid(K * X @ w) (section dorée sur log K)."""
+    lo, hi = np.log(1e-5), np.log(10.0)
+    ratio = (np.sqrt(5) - 1) / 2
+    for _ in range(60):
+        a = hi - ratio * (hi - lo)
+        b = lo + ratio * (hi - lo)
+        if log_loss(X, y, np.exp(a) * w) < log_loss(X, y, np.exp(b) * w):
+            hi = b
+        else:
+            lo = a
+    return float(np.exp((lo + hi) / 2))
+
+
+def fit_logistic(X, y, beta0, l2, iterations=30):
+    """
+    Régression logistique (étiquettes dans [0, 1]) par méthode de Newton,
+    pénalité l2 * |beta - beta0|² sur les features réduites.
+    """
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Xs = X / std
+    prior = beta0 * std
+    beta = prior.copy()
+    n = len(y)
+    for _ in range(iterations):
+        p = _sigmoid(Xs @ beta)
+        grad = Xs.T @ (p - y) / n + l2 * (beta - prior)
+        hessian = (Xs * (p * (1 - p))[:, None]).T @ Xs / n + l2 * np.eye(len(beta))
+        step = np.linalg.solve(hessian, grad)
+        beta -= step
+        if np.max(np.abs(step)) < 1e-9:
+            break
+    return beta / std
+
+
+def fit_weights(data, start=None, l2_grid=L2_GRID, min_positions=100):
+    """
+    Nouveaux poids {phase: {feature: poids}} et rapport par phase
+    (positions, régularisation retenue, perte de validation avant / après).
+    Une phase avec trop peu de positions garde ses poids de départ.
+    """
+    X, phase = dataset_features(data)
+    y = data['result']
+    validation = data['game'] % VALIDATION_EVERY == 0
+    start_matrix = weight_matrix(start)
+    # Échelle commune : score de chaque position avec les poids de sa phase
+    scores = np.einsum('ij,ij->i', X, start_matrix[phase])
+    scale = fit_scale(scores[~validation, None], y[~validation], np.ones(1))
+    weights = {}
+    report = {}
+    for i, name in enumerate(PHASES):
+        train = (phase == i) & ~validation
+        valid = (phase == i) & validation
+        w0 = start_matrix[i]
+        if train.sum() < min_positions or valid.sum() < min_positions // VALIDATION_EVERY:
+            weights[name] = dict(zip(FEATURES, w0.tolist()))
+            report[name] = {'positions': int((phase == i).sum()), 'skipped': True}
+            continue
+        # Régularisation choisie sur la validation, puis ajustement sur toutes les positions
+        losses = {l2: log_loss(X[valid], y[valid], fit_logistic(X[train], y[train], scale * w0, l2))
+                  for l2 in l2_grid}
+        l2 = min(losses, key=losses.get)
+        everything = phase == i
+        beta = fit_logistic(X[everything], y[everything], scale * w0, l2)
+        weights[name] = {feature: round(float(value), 4) for feature, value in zip(FEATURES, beta / scale)}
+        report[name] = {
+            'positions': int(everything.sum()),
+            'scale': scale,
+            'l2': l2,
+            'validation_loss_before': log_loss(X[valid], y[valid], scale * w0),
+            'validation_loss_after': losses[l2],
+        }
+    return weights, report
+
+
+def make_profile(weights, profile_id="TUNED", name="Réglé par auto-jeu", description=None):
+    """Profil au format de AI_PROFILES."""
+    return {
+        "id": profile_id,
+        "name": name,
+        "description": description or "Poids ajustés par régression sur des parties d'auto-jeu",
+        "weights": weights,
+    }
+
+
+# --- Ligne de commande ---------------------------------------------------------
+
+PROFILES = {profile["id"]: profile for profile in AI_PROFILES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Réglage des poids de l'évaluation par auto-jeu")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="génère les positions étiquetées")
+    gen.add_argument("data", help="fichier .npz de sortie")
+    gen.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    gen.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    gen.add_argument("--workers", type=int, default=None)
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--profile", choices=sorted(PROFILES), help="poids joués en auto-jeu (défaut : evaluate)")
+
+    fit = sub.add_parser("fit", help="ajuste les poids sur un fichier de positions")
+    fit.add_argument("data", help="fichier .npz produit par generate")
+    fit.add_argument("--id", default="TUNED", help="identifiant du profil")
+    fit.add_argument("--name", default="Réglé par auto-jeu", help="nom du profil")
+    fit.add_argument("--output", "-o", help="écrit le profil en JSON")
+    fit.add_argument("--profile", choices=sorted(PROFILES), help="poids de départ (défaut : evaluate)")
+
+    args = parser.parse_args()
+    weights = PROFILES[args.profile]["weights"] if args.profile else None
+    if args.command == "generate":
+        t = time.perf_counter()
+        data = generate(args.games, args.depth, weights=weights, workers=args.workers, seed=args.seed,
+                        progress=lambda i, n: print(f"\r{i}/{n} parties", end="", flush=True))
+        save_dataset(args.data, data)
+        print(f"\n{len(data['result'])} positions -> {args.data} ({time.perf_counter() - t:.0f} s)")
+    else:
+        weights, report = fit_weights(load_dataset(args.data), start=weights)
+        for phase, r in report.items():
+            if r.get('skipped'):
+                print(f"{phase}: {r['positions']} positions, poids inchangés")
+            else:
+                print(f"{phase}: {r['positions']} positions, K = {r['scale']:.4g}, l2 = {r['l2']:g}, "
+                      f"perte (validation) {r['validation_loss_before']:.4f} -> {r['validation_loss_after']:.4f}")
+        profile = make_profile(weights, args.id, args.name)
+        text = json.dumps(profile, indent=4, ensure_ascii=False)
+        print(text)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
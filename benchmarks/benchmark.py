@@ -1,4 +1,8 @@
 from typing import Tuple, List, Dict
+import argparse
+import csv
+import json
+import random
 import time
 import tracemalloc
 import psutil
@@ -14,23 +18,21 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from game.board import Board, BLUE, PINK
+from game.board import Board, BLUE, PINK, iter_squares
 from game.player import AIPlayer, RandomAIPlayer
+from game.record import GameWriter, make_record
 from ai.ai_profiles import AI_PROFILES
 import ai.minimax as mm
 
 console = Console()
 process = psutil.Process()
 
-# Monkey-patchable node counter
-_original_search = mm.search
-
 # Helper to disable move ordering (baseline)
-_original_quick_eval = mm.quick_eval
+_original_order_moves = mm.order_moves
 
-def disable_ordering_quick_eval(*args, **kwargs):
-    # Return constant score to avoid reordering
-    return 0
+def disable_ordering_order_moves(board, player, own_moves, tt_sq=None):
+    # Plain square order: no TT move, killers, history or static values
+    return list(iter_squares(own_moves))
 
 
 def get_phase(board: Board) -> str:
@@ -69,11 +71,7 @@ def prompt_int(msg: str, valid: Tuple[int, int], default: int | None = None) ->
         console.print(f"[red]Please enter a number between {lo} and {hi}[/red]")
 
 
-def setup_benchmark():
-    console.print("\n[bold cyan]═══════════════════════════════════[/bold cyan]")
-    console.print("[bold cyan]     Reversi AI Benchmark Setup[/bold cyan]")
-    console.print("[bold cyan]═══════════════════════════════════[/bold cyan]\n")
-
+def player_catalog() -> List[Dict]:
     # Build AI catalog: Random + all profiles
     catalog = [{
         'id': 'RANDOM', 'name': 'Random', 'type': 'random', 'weights': None
@@ -82,6 +80,27 @@ def setup_benchmark():
         catalog.append({
             'id': prof['id'], 'name': prof['name'], 'type': 'ai', 'weights': prof['weights']
         })
+    return catalog
+
+
+def player_config(profile_id: str, depth: int) -> Dict:
+    """Player config from a profile id (see player_catalog), as built by setup_benchmark."""
+    for item in player_catalog():
+        if item['id'] == profile_id.upper():
+            cfg = {'type': item['type'], 'name': item['name'], 'weights': item['weights'], 'id': item['id']}
+            if item['type'] == 'ai':
+                cfg['depth'] = depth
+                cfg['name'] = f"{cfg['name']} (D{depth})"
+            return cfg
+    raise ValueError(f"unknown profile {profile_id!r}")
+
+
+def setup_benchmark():
+    console.print("\n[bold cyan]═══════════════════════════════════[/bold cyan]")
+    console.print("[bold cyan]     Reversi AI Benchmark Setup[/bold cyan]")
+    console.print("[bold cyan]═══════════════════════════════════[/bold cyan]\n")
+
+    catalog = player_catalog()
 
     def prompt_ai(side_label: str):
         console.print(f"\n[yellow]{side_label} selection:[/yellow]")
@@ -112,8 +131,11 @@ def setup_benchmark():
     console.print("  2) Full (with memory metrics)")
     perf_mode = prompt_int("  Choose (1-2): ", (1, 2), default=1)
 
-    console.print("\n[dim]Running with current optimization variant...[/dim]\n")
-    variant = 1  # Always use current version
+    console.print("\n[yellow]Move ordering:[/yellow]")
+    console.print("  1) Current")
+    console.print("  2) Baseline (plain square order)")
+    variant = 1 if prompt_int("  Choose (1-2): ", (1, 2), default=1) == 1 else 0
+    console.print()
     return p1_cfg, p2_cfg, starter, games, variant, (perf_mode == 1)
 
 
@@ -121,11 +143,13 @@ def make_players(p1_cfg: Dict, p2_cfg: Dict) -> Tuple:
     if p1_cfg['type'] == 'random':
         p1 = RandomAIPlayer(BLUE, name='Random')
     else:
-        p1 = AIPlayer(BLUE, depth=p1_cfg['depth'], name=p1_cfg['name'], weights=p1_cfg['weights'])
+        p1 = AIPlayer(BLUE, depth=p1_cfg['depth'], name=p1_cfg['name'], weights=p1_cfg['weights'],
+                      collect_stats=True, profile=p1_cfg.get('id'))
     if p2_cfg['type'] == 'random':
         p2 = RandomAIPlayer(PINK, name='Random')
     else:
-        p2 = AIPlayer(PINK, depth=p2_cfg['depth'], name=p2_cfg['name'], weights=p2_cfg['weights'])
+        p2 = AIPlayer(PINK, depth=p2_cfg['depth'], name=p2_cfg['name'], weights=p2_cfg['weights'],
+                      collect_stats=True, profile=p2_cfg.get('id'))
     return p1, p2
 
 
@@ -145,29 +169,35 @@ def get_player_label(player) -> str:
 def play_one_game(p1, p2, starter: int, variant: int, progress_callback=None, fast_mode: bool = True) -> Dict:
     # variant: 0 baseline (no MO), 1 current
     # Install monkey patches
-    mm.search = _original_search  # keep original for speed
     if variant == 0:
-        mm.quick_eval = disable_ordering_quick_eval
+        mm.order_moves = disable_ordering_order_moves
     else:
-        mm.quick_eval = _original_quick_eval
+        mm.order_moves = _original_order_moves
 
     board = Board()
     current = p1 if starter == 1 else p2
     other = p2 if current is p1 else p1
+    first_player = current.color
+    # full move sequence (None = pass) and per-move think times, for game records
+    moves = []
+    times_ms = []
 
     # stats per phase, per player
     phase_stats = {
         'opening': {
             'moves': 0, 'time_ms': 0.0, 'rss': [], 'trace_cur': [], 'trace_peak': [], 'nodes': 0,
-            'p1_moves': 0, 'p1_time_ms': 0.0, 'p2_moves': 0, 'p2_time_ms': 0.0
+            'p1_moves': 0, 'p1_time_ms': 0.0, 'p2_moves': 0, 'p2_time_ms': 0.0,
+            'p1_times_ms': [], 'p2_times_ms': [], 'p1_nodes': 0, 'p2_nodes': 0
         },
         'midgame': {
             'moves': 0, 'time_ms': 0.0, 'rss': [], 'trace_cur': [], 'trace_peak': [], 'nodes': 0,
-            'p1_moves': 0, 'p1_time_ms': 0.0, 'p2_moves': 0, 'p2_time_ms': 0.0
+            'p1_moves': 0, 'p1_time_ms': 0.0, 'p2_moves': 0, 'p2_time_ms': 0.0,
+            'p1_times_ms': [], 'p2_times_ms': [], 'p1_nodes': 0, 'p2_nodes': 0
         },
         'endgame': {
             'moves': 0, 'time_ms': 0.0, 'rss': [], 'trace_cur': [], 'trace_peak': [], 'nodes': 0,
-            'p1_moves': 0, 'p1_time_ms': 0.0, 'p2_moves': 0, 'p2_time_ms': 0.0
+            'p1_moves': 0, 'p1_time_ms': 0.0, 'p2_moves': 0, 'p2_time_ms': 0.0,
+            'p1_times_ms': [], 'p2_times_ms': [], 'p1_nodes': 0, 'p2_nodes': 0
         },
     }
 
@@ -180,6 +210,8 @@ def play_one_game(p1, p2, starter: int, variant: int, progress_callback=None, fa
         if not valid_current and not valid_other:
             break
         if not valid_current:
+            moves.append(None)
+            times_ms.append(0.0)
             current, other = other, current
             continue
         phase = get_phase(board)
@@ -188,9 +220,13 @@ def play_one_game(p1, p2, starter: int, variant: int, progress_callback=None, fa
             progress_callback()
         last_phase = phase
         
-        t0 = time.time()
+        t0 = time.perf_counter()
         move = current.get_move(board)
-        elapsed_ms = (time.time() - t0) * 1000.0
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        stats = getattr(current, 'last_stats', None)
+        nodes = stats.nodes if stats is not None else 0
+        moves.append(move)
+        times_ms.append(elapsed_ms)
         if move is None:
             current, other = other, current
             continue
@@ -203,6 +239,7 @@ def play_one_game(p1, p2, starter: int, variant: int, progress_callback=None, fa
         ps = phase_stats[phase]
         ps['moves'] += 1
         ps['time_ms'] += elapsed_ms
+        ps['nodes'] += nodes
         if not fast_mode:
             ps['rss'].append(rss)
             ps['trace_cur'].append(cur)
@@ -211,9 +248,13 @@ def play_one_game(p1, p2, starter: int, variant: int, progress_callback=None, fa
         if current == p1:
             ps['p2_moves'] += 1
             ps['p2_time_ms'] += elapsed_ms
+            ps['p2_times_ms'].append(elapsed_ms)
+            ps['p2_nodes'] += nodes
         else:
             ps['p1_moves'] += 1
             ps['p1_time_ms'] += elapsed_ms
+            ps['p1_times_ms'].append(elapsed_ms)
+            ps['p1_nodes'] += nodes
     # callback for final phase completion
     if progress_callback:
         progress_callback()
@@ -226,18 +267,42 @@ def play_one_game(p1, p2, starter: int, variant: int, progress_callback=None, fa
     return {
         'phase_stats': phase_stats,
         'winner': winner,
+        'blue_discs': b,
+        'pink_discs': w,
+        'starter': starter,
         'p1': p1,
         'p2': p2,
+        'first_player': first_player,
+        'moves': moves,
+        'times_ms': times_ms,
+        'board': board,
     }
 
 
-def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int, fast_mode: bool):
-    # Get player labels from first result
-    p1_label = get_player_label(results[0]['p1']) if results else "P1"
-    p2_label = get_player_label(results[0]['p2']) if results else "P2"
-    who = f"{p1_label} vs {p2_label}"
-    starter_label = {1: p1_label, 2: p2_label, 3: 'Switch'}[starter_mode]
-    
+def percentile(values: List[float], q: float) -> float:
+    """q-th percentile (0-100) with linear interpolation; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def time_summary(times_ms: List[float]) -> Dict:
+    return {
+        'moves': len(times_ms),
+        'mean_ms': (sum(times_ms) / len(times_ms)) if times_ms else 0.0,
+        'p50_ms': percentile(times_ms, 50),
+        'p95_ms': percentile(times_ms, 95),
+        'p99_ms': percentile(times_ms, 99),
+        'max_ms': max(times_ms) if times_ms else 0.0,
+    }
+
+
+def summarize(results: List[Dict], games: int, fast_mode: bool) -> Tuple[Dict, Dict]:
+    """Per-phase aggregates and win counts over all games."""
     # Count wins
     wins = {'BLUE': 0, 'PINK': 0, 'TIE': 0}
     for r in results:
@@ -255,8 +320,10 @@ def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int,
         rss_all = [x for r in results for x in r['phase_stats'][phase]['rss']] if not fast_mode else []
         cur_all = [x for r in results for x in r['phase_stats'][phase]['trace_cur']] if not fast_mode else []
         peak_all = [x for r in results for x in r['phase_stats'][phase]['trace_peak']] if not fast_mode else []
-        nodes = 0
-        
+        nodes = sum(r['phase_stats'][phase]['nodes'] for r in results)
+        p1_nodes = sum(r['phase_stats'][phase]['p1_nodes'] for r in results)
+        p2_nodes = sum(r['phase_stats'][phase]['p2_nodes'] for r in results)
+
         # Per-player stats
         p1_moves = sum(r['phase_stats'][phase]['p1_moves'] for r in results)
         p1_time_ms = sum(r['phase_stats'][phase]['p1_time_ms'] for r in results)
@@ -270,16 +337,42 @@ def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int,
         mean_rss = (sum(rss_all) / len(rss_all)) if rss_all else None
         mean_trace_cur = (sum(cur_all) / len(cur_all)) if cur_all else None
         mean_trace_peak = (sum(peak_all) / len(peak_all)) if peak_all else None
+        p1_times = [x for r in results for x in r['phase_stats'][phase]['p1_times_ms']]
+        p2_times = [x for r in results for x in r['phase_stats'][phase]['p2_times_ms']]
         agg[phase] = {
             'moves': moves,
             'avg_time_ms': avg_time_per_move,
             'p1_avg_time_ms': p1_avg_time,
             'p2_avg_time_ms': p2_avg_time,
+            'p1_times': time_summary(p1_times),
+            'p2_times': time_summary(p2_times),
+            'all_times': time_summary(p1_times + p2_times),
             'mean_rss': mean_rss,
             'mean_trace_cur': mean_trace_cur,
             'mean_trace_peak': mean_trace_peak,
             'nodes': nodes,
+            'p1_nodes': p1_nodes,
+            'p2_nodes': p2_nodes,
+            'nodes_per_second': nodes / (time_ms / 1000.0) if time_ms else 0.0,
+            'p1_nodes_per_second': p1_nodes / (p1_time_ms / 1000.0) if p1_time_ms else 0.0,
+            'p2_nodes_per_second': p2_nodes / (p2_time_ms / 1000.0) if p2_time_ms else 0.0,
         }
+    wins['p1_win_rate'] = win_rate_p1
+    wins['p2_win_rate'] = win_rate_p2
+    wins['draw_rate'] = win_rate_draw
+    return agg, wins
+
+
+def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int, fast_mode: bool):
+    # Get player labels from first result
+    p1_label = get_player_label(results[0]['p1']) if results else "P1"
+    p2_label = get_player_label(results[0]['p2']) if results else "P2"
+    who = f"{p1_label} vs {p2_label}"
+    starter_label = {1: p1_label, 2: p2_label, 3: 'Switch'}[starter_mode]
+    agg, wins = summarize(results, games, fast_mode)
+    win_rate_p1 = wins['p1_win_rate']
+    win_rate_p2 = wins['p2_win_rate']
+    win_rate_draw = wins['draw_rate']
 
     # tables
     tables = {}
@@ -289,6 +382,8 @@ def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int,
         t.add_column("Starter", justify="center")
         t.add_column(f"{p1_label} ms/move", justify="right")
         t.add_column(f"{p2_label} ms/move", justify="right")
+        t.add_column("p50/p95/p99 ms", justify="right")
+        t.add_column("Nodes/s", justify="right")
         t.add_column(f"{p1_label} % Win", justify="right")
         t.add_column(f"{p2_label} % Win", justify="right")
         t.add_column("Draw %", justify="right")
@@ -310,6 +405,8 @@ def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int,
             starter_label,
             f"{data['p1_avg_time_ms']:.2f}",
             f"{data['p2_avg_time_ms']:.2f}",
+            "{p50_ms:.1f}/{p95_ms:.1f}/{p99_ms:.1f}".format(**data['all_times']),
+            f"{data['nodes_per_second']:,.0f}",
             win_p1,
             win_p2,
             win_draw,
@@ -325,10 +422,18 @@ def aggregate(results: List[Dict], starter_mode: int, variant: int, games: int,
     return tables
 
 
-def main():
-    p1_cfg, p2_cfg, starter_mode, games, variant, fast_mode = setup_benchmark()
+def game_record(res: Dict, p1_cfg: Dict, p2_cfg: Dict, seed: int | None = None):
+    """Binary game record (game.record) of a play_one_game result."""
+    return make_record({BLUE: res['p1'], PINK: res['p2']}, res['moves'], res['board'],
+                       first_player=res['first_player'], seed=seed, times_ms=res['times_ms'],
+                       profiles={BLUE: p1_cfg.get('id', ''), PINK: p2_cfg.get('id', '')})
+
+
+def run_games(p1_cfg: Dict, p2_cfg: Dict, starter_mode: int, games: int, variant: int, fast_mode: bool,
+              show_progress: bool = True, record_path: str | None = None, seed: int | None = None) -> List[Dict]:
     # switching logic with phase-level progress
     results = []
+    writer = GameWriter(record_path) if record_path else None
     # Total phases: 3 per game (opening, midgame, endgame)
     total_phases = games * 3
     with Progress(
@@ -338,6 +443,7 @@ def main():
         TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
         TimeElapsedColumn(),
         console=console,
+        disable=not show_progress,
     ) as progress:
         task = progress.add_task("bench", total=total_phases)
         for i in range(games):
@@ -351,9 +457,155 @@ def main():
                 progress.advance(task, 1)
             res = play_one_game(p1, p2, starter, variant, progress_callback=phase_done, fast_mode=fast_mode)
             results.append(res)
-    tables = aggregate(results, starter_mode, variant, games, fast_mode)
+            if writer is not None:
+                writer.write(game_record(res, p1_cfg, p2_cfg, seed))
+                writer.flush()
+    if writer is not None:
+        writer.close()
+    return results
+
+
+def game_rows(results: List[Dict]) -> List[Dict]:
+    """One flat record per game (per-phase move counts and timings)."""
+    rows = []
+    for i, r in enumerate(results, start=1):
+        row = {
+            'game': i,
+            'starter': 'p1' if r['starter'] == 1 else 'p2',
+            'winner': r['winner'],
+            'blue_discs': r['blue_discs'],
+            'pink_discs': r['pink_discs'],
+        }
+        for phase in ('opening', 'midgame', 'endgame'):
+            ps = r['phase_stats'][phase]
+            for side in ('p1', 'p2'):
+                summary = time_summary(ps[f'{side}_times_ms'])
+                row[f'{phase}_{side}_moves'] = summary['moves']
+                row[f'{phase}_{side}_mean_ms'] = round(summary['mean_ms'], 3)
+                row[f'{phase}_{side}_p95_ms'] = round(summary['p95_ms'], 3)
+                row[f'{phase}_{side}_nodes'] = ps[f'{side}_nodes']
+        rows.append(row)
+    return rows
+
+
+def phase_rows(agg: Dict) -> List[Dict]:
+    """One flat record per phase and player ('all' = both players)."""
+    rows = []
     for phase in ('opening', 'midgame', 'endgame'):
-        console.print(tables[phase])
+        for side in ('p1', 'p2', 'all'):
+            row = {'phase': phase, 'player': side}
+            row.update({k: round(v, 3) for k, v in agg[phase][f'{side}_times'].items()})
+            prefix = '' if side == 'all' else f'{side}_'
+            row['nodes'] = agg[phase][f'{prefix}nodes']
+            row['nodes_per_second'] = round(agg[phase][f'{prefix}nodes_per_second'], 1)
+            if agg[phase]['mean_rss'] is not None:
+                row['mean_rss'] = agg[phase]['mean_rss']
+                row['mean_trace_peak'] = agg[phase]['mean_trace_peak']
+            rows.append(row)
+    return rows
+
+
+def write_csv(path: str, rows: List[Dict]):
+    fields = []
+    for row in rows:
+        fields.extend(k for k in row if k not in fields)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_results(path: str, fmt: str, config: Dict, results: List[Dict], games: int, fast_mode: bool):
+    """
+    JSON: a single document (config, summary, phases, games).
+    CSV: per-game rows in `path`, per-phase rows in `<path stem>_phases.csv`.
+    """
+    agg, wins = summarize(results, games, fast_mode)
+    if fmt == 'json':
+        with open(path, 'w') as f:
+            json.dump({
+                'config': config,
+                'summary': wins,
+                'phases': phase_rows(agg),
+                'games': game_rows(results),
+            }, f, indent=2)
+        return [path]
+    stem, _ = os.path.splitext(path)
+    phases_path = f"{stem}_phases.csv"
+    write_csv(path, game_rows(results))
+    write_csv(phases_path, phase_rows(agg))
+    return [path, phases_path]
+
+
+STARTERS = {'p1': 1, 'p2': 2, 'switch': 3}
+# Move ordering variant (play_one_game): baseline = plain square order
+VARIANTS = {'baseline': 0, 'current': 1}
+
+
+def parse_args(argv=None):
+    ids = [item['id'] for item in player_catalog()]
+    parser = argparse.ArgumentParser(
+        description="Reversi AI benchmark. Without --p1/--p2 the interactive setup is used.")
+    parser.add_argument('--p1', metavar='PROFILE', help=f"player 1 (BLUE): one of {', '.join(ids)}")
+    parser.add_argument('--p2', metavar='PROFILE', help="player 2 (PINK), same choices")
+    parser.add_argument('--depth', type=int, default=4, help="search depth of both AIs (default 4)")
+    parser.add_argument('--depth1', type=int, help="player 1 depth (overrides --depth)")
+    parser.add_argument('--depth2', type=int, help="player 2 depth (overrides --depth)")
+    parser.add_argument('--starter', choices=sorted(STARTERS), default='switch',
+                        help="who moves first (switch = alternate each game)")
+    parser.add_argument('--games', type=int, default=5, help="number of games")
+    parser.add_argument('--variant', choices=sorted(VARIANTS), default='current',
+                        help="move ordering: current, or baseline (plain square order)")
+    parser.add_argument('--seed', type=int, help="seed for random tie-breaks and the Random player")
+    parser.add_argument('--perf', choices=('fast', 'full'), default='fast',
+                        help="full = also record memory metrics (slower)")
+    parser.add_argument('--output', '-o', metavar='PATH', help="write results to PATH (.json or .csv)")
+    parser.add_argument('--format', choices=('json', 'csv'), help="output format (default: from extension)")
+    parser.add_argument('--quiet', '-q', action='store_true', help="no progress bar and no tables")
+    parser.add_argument('--record', metavar='PATH', help="append every game to the binary game file PATH")
+    args = parser.parse_args(argv)
+    if (args.p1 is None) != (args.p2 is None):
+        parser.error("--p1 and --p2 go together")
+    if args.p1 is not None:
+        for spec in (args.p1, args.p2):
+            if spec.upper() not in ids:
+                parser.error(f"unknown profile {spec!r} (choose from {', '.join(ids)})")
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.output and args.format is None:
+        args.format = 'csv' if args.output.lower().endswith('.csv') else 'json'
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.p1 is None:
+        p1_cfg, p2_cfg, starter_mode, games, variant, fast_mode = setup_benchmark()
+    else:
+        p1_cfg = player_config(args.p1, args.depth1 or args.depth)
+        p2_cfg = player_config(args.p2, args.depth2 or args.depth)
+        starter_mode, games, variant = STARTERS[args.starter], args.games, VARIANTS[args.variant]
+        fast_mode = args.perf == 'fast'
+    results = run_games(p1_cfg, p2_cfg, starter_mode, games, variant, fast_mode, show_progress=not args.quiet,
+                        record_path=args.record, seed=args.seed)
+    if not args.quiet:
+        tables = aggregate(results, starter_mode, variant, games, fast_mode)
+        for phase in ('opening', 'midgame', 'endgame'):
+            console.print(tables[phase])
+    if args.output:
+        config = {
+            'p1': {k: v for k, v in p1_cfg.items() if k != 'weights'},
+            'p2': {k: v for k, v in p2_cfg.items() if k != 'weights'},
+            'starter': {v: k for k, v in STARTERS.items()}[starter_mode],
+            'games': games,
+            'variant': {v: k for k, v in VARIANTS.items()}[variant],
+            'seed': args.seed,
+            'perf': 'fast' if fast_mode else 'full',
+        }
+        for path in write_results(args.output, args.format, config, results, games, fast_mode):
+            console.print(f"[dim]Results written to {path}[/dim]")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,180 @@
+"""
+Scaling of the Lazy SMP search (choose_move(smp_workers=N)) with the number of
+processes.
+
+Two measures, over the same set of random-play positions:
+  depth  time to complete a fixed depth. Speedup = T(1) / T(N) on the summed
+         times, efficiency = speedup / N. Node overhead = nodes(N) / nodes(1):
+         the extra work the helpers do that the main search does not reuse.
+  time   fixed time per position: average completed depth and total nodes
+         per second over all processes.
+
+Each run starts from empty transposition tables and move ordering tables in
+the main process (helpers keep their own ordering tables). N = 1 runs the same
+code without helpers, on the shared table, so that the comparison only
+measures the helpers. Speedups above 1 need at least N free cores: on a
+machine with fewer cores the helpers only compete with the main search.
+"""
+from typing import Dict, List, Tuple
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+# Ensure project root is on sys.path when running from benchmarks/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from game.board import Board, BLUE
+from ai.minimax import choose_move, SearchStats, ALPHABETA, PVS
+import ai.minimax as mm
+
+console = Console()
+
+# Random plies played before each test position (midgame positions)
+OPENING_PLIES = (14, 24)
+
+
+def make_positions(count: int, seed: int) -> List[Tuple[Board, int]]:
+    """`count` positions reached by random play, side to move with a legal move."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board, player = Board(), BLUE
+        for _ in range(rng.randint(*OPENING_PLIES)):
+            moves = board.get_valid_moves(player)
+            if moves:
+                move = rng.choice(moves)
+                board.apply_move(move[0], move[1], player)
+            player = -player
+        if board.get_valid_moves(player) and not board.is_terminal():
+            positions.append((board, player))
+    return positions
+
+
+def reset_tables() -> None:
+    mm.TT.clear()
+    mm.clear_move_ordering()
+    if mm._smp_tt is not None:
+        mm._smp_tt.clear()
+
+
+def run_search(board: Board, player: int, workers: int, depth: int | None, time_limit: float | None,
+               algorithm: str, tt_mb: float) -> Dict:
+    reset_tables()
+    stats = SearchStats()
+    start = time.perf_counter()
+    move = choose_move(board, player, depth, tt_mb=tt_mb, time_limit=time_limit, algorithm=algorithm,
+                       endgame_empties=0, stats=stats, smp_workers=workers)
+    return {
+        'move': move,
+        'time': time.perf_counter() - start,
+        'nodes': stats.nodes,
+        'depth': stats.depth,
+        'tt_hit_rate': stats.tt_hit_rate(),
+    }
+
+
+def run_scaling(positions: List[Tuple[Board, int]], worker_counts: List[int], depth: int | None,
+                time_limit: float | None, algorithm: str, tt_mb: float) -> List[Dict]:
+    results = []
+    for workers in worker_counts:
+        # Start the helper processes outside of the timings
+        choose_move(positions[0][0], positions[0][1], 1, tt_mb=tt_mb, endgame_empties=0, smp_workers=workers)
+        runs = [run_search(board, player, workers, depth, time_limit, algorithm, tt_mb)
+                for board, player in positions]
+        total_time = sum(r['time'] for r in runs)
+        total_nodes = sum(r['nodes'] for r in runs)
+        results.append({
+            'workers': workers,
+            'time': total_time,
+            'nodes': total_nodes,
+            'nodes_per_second': total_nodes / total_time if total_time > 0 else 0.0,
+            'depth': sum(r['depth'] or 0 for r in runs) / len(runs),
+            'tt_hit_rate': sum(r['tt_hit_rate'] for r in runs) / len(runs),
+            'runs': runs,
+        })
+    base = results[0]
+    for r in results:
+        r['speedup'] = base['time'] / r['time'] if r['time'] > 0 else 0.0
+        r['efficiency'] = r['speedup'] / r['workers'] * base['workers']
+        r['node_overhead'] = r['nodes'] / base['nodes'] if base['nodes'] else 0.0
+    return results
+
+
+def results_table(results: List[Dict], timed: bool) -> Table:
+    t = Table(title="Lazy SMP scaling (" + ("fixed time" if timed else "time to depth") + ")")
+    t.add_column("Processes", justify="right")
+    t.add_column("Time (s)", justify="right")
+    t.add_column("Nodes", justify="right")
+    t.add_column("Nodes/s", justify="right")
+    t.add_column("Avg depth", justify="right")
+    t.add_column("TT hit rate", justify="right")
+    if not timed:
+        t.add_column("Speedup", justify="right")
+        t.add_column("Efficiency", justify="right")
+        t.add_column("Node overhead", justify="right")
+    for r in results:
+        row = [str(r['workers']), f"{r['time']:.2f}", f"{r['nodes']:,}", f"{r['nodes_per_second']:,.0f}",
+               f"{r['depth']:.2f}", f"{r['tt_hit_rate']:.1%}"]
+        if not timed:
+            row += [f"{r['speedup']:.2f}x", f"{r['efficiency']:.0%}", f"{r['node_overhead']:.2f}x"]
+        t.add_row(*row)
+    return t
+
+
+def default_worker_counts() -> List[int]:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max(cores, 2):
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores and cores > 2:
+        counts.append(cores)
+    return counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lazy SMP scaling per number of processes")
+    parser.add_argument('--workers', '-w', type=int, action='append',
+                        help="process count to measure, repeatable (default: 1, 2, 4... up to the core count)")
+    parser.add_argument('--depth', '-d', type=int, default=7, help="search depth (default 7)")
+    parser.add_argument('--time', '-t', type=float, metavar='SECONDS',
+                        help="fixed time per position instead of a fixed depth")
+    parser.add_argument('--positions', '-n', type=int, default=8, help="number of test positions (default 8)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the test positions")
+    parser.add_argument('--algorithm', choices=(ALPHABETA, PVS), default=PVS)
+    parser.add_argument('--tt-mb', type=float, default=64, help="shared transposition table size (MB)")
+    parser.add_argument('--output', '-o', metavar='PATH', help="write the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    worker_counts = sorted(set(args.workers or default_worker_counts()))
+    depth = None if args.time is not None else args.depth
+    positions = make_positions(args.positions, args.seed)
+    console.print(f"{len(positions)} positions, {os.cpu_count()} cores, "
+                  + (f"{args.time:g} s per position" if args.time is not None else f"depth {depth}")
+                  + f", {args.algorithm}")
+    try:
+        results = run_scaling(positions, worker_counts, depth, args.time, args.algorithm, args.tt_mb)
+    finally:
+        mm.shutdown_smp()
+    console.print(results_table(results, args.time is not None))
+    if worker_counts[-1] > (os.cpu_count() or 1):
+        console.print("[yellow]More processes than cores: the speedups are not meaningful[/yellow]")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        console.print(f"[dim]Results written to {args.output}[/dim]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Perft for the move generator: counts the leaf nodes of the full game tree to a
+fixed depth and checks them against reference values.
+
+Conventions (the usual Othello perft ones):
+  - a pass is a ply: a side without a legal move passes and the opponent moves;
+  - a finished game (neither side can move) is a leaf, whatever the depth left.
+
+Several backends count the same tree so that each one validates the others:
+  board    Board.get_valid_moves + make_move / undo_move (the public Board API)
+  bitboard moves_mask / flips_mask with bulk counting at the last ply
+  batch    BoardBatch (NumPy), breadth-first over the whole frontier
+  naive    independent 8x8 grid generator (reference, slow)
+
+A new board backend only needs a `perft(board, player, depth) -> int` function
+registered in BACKENDS to be validated and timed the same way.
+"""
+from typing import Callable, Dict, List, Tuple
+import argparse
+import json
+import os
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+# Ensure project root is on sys.path when running from benchmarks/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from game.board import Board, BLUE, PINK, moves_mask, flips_mask
+
+console = Console()
+
+
+# --- Test positions -----------------------------------------------------------
+
+# 64 characters, A1 first and row by row (X = BLUE, O = PINK, - = empty),
+# followed by the side to move. Besides the start position: a random-play
+# midgame, a position where the side to move must pass, and a 9-empty endgame
+# whose tree holds passes and games that end before the depth limit.
+POSITIONS: Dict[str, Tuple[str, int]] = {
+    'start': (
+        '---------------------------OX------XO---------------------------', BLUE),
+    'midgame': (
+        'O--------OO------XOO----XXOXOX----OOXO----OOOOO---XOOX---X---OX-', BLUE),
+    'pass': (
+        '------O---XXXXOO--X-X-O---XXXOOO--XXX-O--XXXXXOO-XXX--O------OOO', BLUE),
+    'endgame': (
+        'OOX---O-XXOX-O--XXXOOOOOXXXOOXXOXXXXXOOOXXXXOOOOX-XOOOOOX-OOOOOO', PINK),
+}
+
+# Leaf counts by depth (index 0 = depth 1). 'start' are the published values;
+# the others were computed with the naive backend and agreed on by all backends.
+REFERENCE: Dict[str, List[int]] = {
+    'start': [4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288, 24571284, 212258800],
+    'midgame': [12, 164, 2143, 27268, 361350, 4440029],
+    'pass': [1, 8, 28, 284, 1919, 21211, 189122, 2053209],
+    'endgame': [4, 19, 75, 294, 1022, 2811, 6545, 10447, 11252, 11320, 11351, 11351],
+}
+
+
+def parse_position(text: str) -> Tuple[int, int]:
+    """(blue, pink) bitboards of a 64-character position string."""
+    text = text.replace(' ', '').replace('\n', '')
+    if len(text) != 64 or set(text) - set('XO-'):
+        raise ValueError(f"bad position string {text!r}")
+    blue = sum(1 << sq for sq, c in enumerate(text) if c == 'X')
+    pink = sum(1 << sq for sq, c in enumerate(text) if c == 'O')
+    return blue, pink
+
+
+def format_position(blue: int, pink: int) -> str:
+    return ''.join('X' if blue >> sq & 1 else ('O' if pink >> sq & 1 else '-') for sq in range(64))
+
+
+def load_position(name: str) -> Tuple[Board, int]:
+    text, player = POSITIONS[name]
+    board = Board()
+    board.set_position(*parse_position(text))
+    return board, player
+
+
+# --- Backends -----------------------------------------------------------------
+
+def perft_board(board: Board, player: int, depth: int) -> int:
+    """Through the public Board API only (no bulk counting)."""
+    if depth == 0:
+        return 1
+    moves = board.get_valid_moves(player)
+    if not moves:
+        if not board.get_valid_moves(-player):
+            return 1
+        return perft_board(board, -player, depth - 1)
+    nodes = 0
+    for move in moves:
+        flipped = board.make_move(move, player)
+        nodes += perft_board(board, -player, depth - 1)
+        board.undo_move(move, flipped, player)
+    return nodes
+
+
+def _perft_bits(own: int, opp: int, depth: int) -> int:
+    moves = moves_mask(own, opp)
+    if not moves:
+        if not moves_mask(opp, own):
+            return 1
+        return 1 if depth == 1 else _perft_bits(opp, own, depth - 1)
+    if depth == 1:
+        return moves.bit_count()
+    nodes = 0
+    while moves:
+        bit = moves & -moves
+        moves ^= bit
+        flipped = flips_mask(own, opp, bit.bit_length() - 1)
+        nodes += _perft_bits(opp ^ flipped, own | flipped | bit, depth - 1)
+    return nodes
+
+
+def perft_bitboard(board: Board, player: int, depth: int) -> int:
+    if depth == 0:
+        return 1
+    own, opp = board.bitboards(player)
+    return _perft_bits(own, opp, depth)
+
+
+# Positions expanded at once by the batch backend (bounds the memory use)
+BATCH_CHUNK = 1 << 18
+
+
+def _perft_batch(own: "np.ndarray", opp: "np.ndarray", depth: int) -> int:
+    # NumPy is optional: imported only by the batch backend
+    import numpy as np
+    from game.batch_board import popcount, unpack_squares, flips_mask as batch_flips_mask, \
+        moves_mask as batch_moves_mask
+    if len(own) > BATCH_CHUNK:
+        return sum(_perft_batch(own[i:i + BATCH_CHUNK], opp[i:i + BATCH_CHUNK], depth)
+                   for i in range(0, len(own), BATCH_CHUNK))
+    moves = batch_moves_mask(own, opp)
+    stuck = moves == 0
+    opp_moves = batch_moves_mask(opp[stuck], own[stuck])
+    over = int(np.count_nonzero(opp_moves == 0))
+    passing = np.flatnonzero(stuck)[opp_moves != 0]
+    if depth == 1:
+        return over + len(passing) + int(popcount(moves).sum())
+    playing = ~stuck
+    rows, squares = np.nonzero(unpack_squares(moves[playing]))
+    src_own = own[playing][rows]
+    src_opp = opp[playing][rows]
+    flipped = batch_flips_mask(src_own, src_opp, squares)
+    placed = np.uint64(1) << squares.astype(np.uint64)
+    next_own = np.concatenate([src_opp ^ flipped, opp[passing]])
+    next_opp = np.concatenate([src_own | flipped | placed, own[passing]])
+    return over + _perft_batch(next_own, next_opp, depth - 1)
+
+
+def perft_batch(board: Board, player: int, depth: int) -> int:
+    if depth == 0:
+        return 1
+    import numpy as np
+    own, opp = board.bitboards(player)
+    return _perft_batch(np.array([own], dtype=np.uint64), np.array([opp], dtype=np.uint64), depth)
+
+
+_NAIVE_DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def naive_moves(grid: List[int], player: int) -> List[Tuple[int, List[int]]]:
+    """(square, flipped squares) of every legal move, scanning an 8x8 grid."""
+    moves = []
+    for sq in range(64):
+        if grid[sq]:
+            continue
+        row, col = divmod(sq, 8)
+        flipped = []
+        for dr, dc in _NAIVE_DIRECTIONS:
+            r, c = row + dr, col + dc
+            line = []
+            while 0 <= r < 8 and 0 <= c < 8 and grid[r * 8 + c] == -player:
+                line.append(r * 8 + c)
+                r, c = r + dr, c + dc
+            if line and 0 <= r < 8 and 0 <= c < 8 and grid[r * 8 + c] == player:
+                flipped.extend(line)
+        if flipped:
+            moves.append((sq, flipped))
+    return moves
+
+
+def _perft_naive(grid: List[int], player: int, depth: int) -> int:
+    if depth == 0:
+        return 1
+    moves = naive_moves(grid, player)
+    if not moves:
+        if not naive_moves(grid, -player):
+            return 1
+        return _perft_naive(grid, -player, depth - 1)
+    nodes = 0
+    for sq, flipped in moves:
+        child = grid[:]
+        child[sq] = player
+        for f in flipped:
+            child[f] = player
+        nodes += _perft_naive(child, -player, depth - 1)
+    return nodes
+
+
+def perft_naive(board: Board, player: int, depth: int) -> int:
+    grid = [BLUE if board.blue >> sq & 1 else (PINK if board.pink >> sq & 1 else 0) for sq in range(64)]
+    return _perft_naive(grid, player, depth)
+
+
+BACKENDS: Dict[str, Callable[[Board, int, int], int]] = {
+    'board': perft_board,
+    'bitboard': perft_bitboard,
+    'batch': perft_batch,
+    'naive': perft_naive,
+}
+
+
+def divide(backend: Callable[[Board, int, int], int], board: Board, player: int, depth: int) -> Dict[str, int]:
+    """Leaf count below each root move ('pass' when the side to move must pass)."""
+    counts = {}
+    moves = board.get_valid_moves(player)
+    if not moves:
+        counts['pass'] = backend(board, -player, depth - 1) if board.get_valid_moves(-player) else 1
+        return counts
+    for move in moves:
+        child = board.clone()
+        child.apply_move(move[0], move[1], player)
+        counts[f"{move[0]}{move[1]}"] = backend(child, -player, depth - 1)
+    return counts
+
+
+# --- Runner -------------------------------------------------------------------
+
+def run_perft(backend_name: str, position: str, depth: int) -> Dict:
+    board, player = load_position(position)
+    t0 = time.perf_counter()
+    nodes = BACKENDS[backend_name](board, player, depth)
+    elapsed = time.perf_counter() - t0
+    reference = REFERENCE.get(position, [])
+    expected = reference[depth - 1] if depth <= len(reference) else None
+    return {
+        'backend': backend_name,
+        'position': position,
+        'depth': depth,
+        'nodes': nodes,
+        'expected': expected,
+        'ok': None if expected is None else nodes == expected,
+        'time_s': elapsed,
+        'nodes_per_second': nodes / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def results_table(results: List[Dict]) -> Table:
+    t = Table(title="Perft")
+    for name, justify in (("Backend", "left"), ("Position", "left"), ("Depth", "right"), ("Nodes", "right"),
+                          ("Expected", "right"), ("OK", "center"), ("Time s", "right"), ("Nodes/s", "right")):
+        t.add_column(name, justify=justify)
+    for r in results:
+        ok = "-" if r['ok'] is None else ("[green]yes[/green]" if r['ok'] else "[red]NO[/red]")
+        t.add_row(r['backend'], r['position'], str(r['depth']), f"{r['nodes']:,}",
+                  "-" if r['expected'] is None else f"{r['expected']:,}", ok,
+                  f"{r['time_s']:.3f}", f"{r['nodes_per_second']:,.0f}")
+    return t
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Perft: move generator speed and correctness.")
+    parser.add_argument('--backend', '-b', action='append', choices=sorted(BACKENDS),
+                        help="backend(s) to run (repeatable; default: bitboard)")
+    parser.add_argument('--position', '-p', action='append', choices=sorted(POSITIONS),
+                        help="position(s) to count from (repeatable; default: start)")
+    parser.add_argument('--depth', '-d', type=int, default=6, help="maximum depth (default 6)")
+    parser.add_argument('--all-depths', action='store_true', help="run every depth from 1 to --depth")
+    parser.add_argument('--suite', action='store_true',
+                        help="every position, to --depth or the last reference value if shallower")
+    parser.add_argument('--divide', action='store_true', help="print the leaf count below each root move")
+    parser.add_argument('--output', '-o', metavar='PATH', help="write the results as JSON")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+    args.backend = args.backend or ['bitboard']
+    args.position = sorted(POSITIONS) if args.suite else (args.position or ['start'])
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.divide:
+        for position in args.position:
+            board, player = load_position(position)
+            for backend in args.backend:
+                counts = divide(BACKENDS[backend], board, player, args.depth)
+                console.print(f"[bold]{position}[/bold] depth {args.depth} ({backend})")
+                for move, nodes in counts.items():
+                    console.print(f"  {move}: {nodes:,}")
+                console.print(f"  total: {sum(counts.values()):,}")
+        return 0
+    results = []
+    for position in args.position:
+        depth = args.depth
+        if args.suite and REFERENCE.get(position):
+            depth = min(depth, len(REFERENCE[position]))
+        depths = range(1, depth + 1) if args.all_depths else [depth]
+        for backend in args.backend:
+            for d in depths:
+                results.append(run_perft(backend, position, d))
+    console.print(results_table(results))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        console.print(f"[dim]Results written to {args.output}[/dim]")
+    failed = [r for r in results if r['ok'] is False]
+    # backends run on the same position and depth must agree, even without a reference
+    counts = {}
+    for r in results:
+        counts.setdefault((r['position'], r['depth']), set()).add(r['nodes'])
+    disagree = [key for key, values in counts.items() if len(values) > 1]
+    for position, depth in disagree:
+        console.print(f"[red]Backends disagree on {position} at depth {depth}[/red]")
+    for r in failed:
+        console.print(f"[red]{r['backend']} {r['position']} d{r['depth']}: "
+                      f"{r['nodes']:,} != {r['expected']:,}[/red]")
+    return 1 if failed or disagree else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+from typing import Tuple, List, Dict
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rich.console import Console
+from rich.table import Table
+from rich.progress import Progress, BarColumn, TimeElapsedColumn, SpinnerColumn, TextColumn, MofNCompleteColumn
+
+# Ensure project root is on sys.path when running from benchmarks/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from game.board import Board, BLUE, PINK
+from game.player import AIPlayer
+from ai.ai_profiles import AI_PROFILES
+import ai.minimax as mm
+
+# Round-robin tournament between AI profiles x depths.
+#
+# Every pairing plays every opening of a balanced set twice, colours swapped.
+# Games run in a process pool; each finished game is appended to a JSON-lines
+# checkpoint so an interrupted run resumes where it stopped. Ratings are
+# Bradley-Terry maximum likelihood Elo (draws = half points, with a small
+# BayesElo-like prior of virtual draws) and bootstrap confidence intervals.
+#
+# Entrants must not help each other: each AIPlayer has its own transposition
+# table, and the process-wide killer / history tables are cleared before every
+# move, so a result does not depend on which games a worker played before.
+# The exact endgame solver is off unless --endgame-empties is given (it would
+# make every depth play the end of the game perfectly).
+
+console = Console()
+
+PROFILES = {prof['id']: prof for prof in AI_PROFILES}
+
+# Virtual draws added between every pair of entrants that met: keeps ratings
+# finite when an entrant wins or loses all its games
+PRIOR_DRAWS = 1.0
+
+
+def entrant_name(profile_id: str, depth: int) -> str:
+    return f"{profile_id}-D{depth}"
+
+
+def parse_entrant(name: str) -> Tuple[str, int]:
+    profile_id, depth = name.rsplit('-D', 1)
+    return profile_id, int(depth)
+
+
+# --- Openings -----------------------------------------------------------------
+
+def opening_set(plies: int, count: int, seed: int) -> List[List[Tuple[str, int]]]:
+    """
+    `count` move sequences of `plies` plies from the start position, leading to
+    positions distinct up to symmetry (all of them if count is 0). Sampled
+    deterministically from `seed`.
+    """
+    board = Board()
+    openings = {}
+
+    def walk(player, line):
+        if len(line) == plies:
+            own, opp, _ = board.canonical(player)
+            openings.setdefault((own, opp, player), list(line))
+            return
+        moves = board.get_valid_moves(player)
+        if not moves:
+            return
+        for move in moves:
+            flipped = board.make_move(move, player)
+            line.append(move)
+            walk(-player, line)
+            line.pop()
+            board.undo_move(move, flipped, player)
+
+    walk(BLUE, [])
+    lines = [openings[key] for key in sorted(openings)]
+    if count and count < len(lines):
+        lines = random.Random(seed).sample(lines, count)
+    return lines
+
+
+# --- Games --------------------------------------------------------------------
+
+def game_key(blue: str, pink: str, opening: int) -> str:
+    return f"{blue}|{pink}|{opening}"
+
+
+def schedule(entrants: List[str], n_openings: int) -> List[Dict]:
+    """Every pairing, every opening, both colours."""
+    games = []
+    for i, a in enumerate(entrants):
+        for b in entrants[i + 1:]:
+            for opening in range(n_openings):
+                for blue, pink in ((a, b), (b, a)):
+                    games.append({'key': game_key(blue, pink, opening), 'blue': blue, 'pink': pink,
+                                  'opening': opening})
+    return games
+
+
+def play_game(spec: Dict, opening: List[Tuple[str, int]], seed: int, endgame_empties: int = 0) -> Dict:
+    """Plays one game (in a worker process) and returns its result record."""
+    random.seed(f"{seed}|{spec['key']}")
+    players = {}
+    for color in (BLUE, PINK):
+        profile_id, depth = parse_entrant(spec['blue' if color == BLUE else 'pink'])
+        players[color] = AIPlayer(color, depth=depth, name=entrant_name(profile_id, depth),
+                                  weights=PROFILES[profile_id]['weights'], endgame_empties=endgame_empties)
+    board = Board()
+    player = BLUE
+    for move in opening:
+        board.apply_move(move[0], move[1], player)
+        player = -player
+    think = {BLUE: 0.0, PINK: 0.0}
+    while not board.is_terminal():
+        mm.clear_move_ordering()
+        t0 = time.perf_counter()
+        move = players[player].get_move(board)
+        think[player] += time.perf_counter() - t0
+        if move is not None:
+            board.apply_move(move[0], move[1], player)
+        player = -player
+    blue_discs, pink_discs = board.count_discs()
+    score = 1.0 if blue_discs > pink_discs else (0.0 if blue_discs < pink_discs else 0.5)
+    return dict(spec, blue_discs=blue_discs, pink_discs=pink_discs, score=score,
+                blue_time=think[BLUE], pink_time=think[PINK])
+
+
+# --- Checkpoint ---------------------------------------------------------------
+
+def load_checkpoint(path: str, config: Dict) -> Dict[str, Dict]:
+    """Results already in the checkpoint (key -> record); the first line holds the config."""
+    if not os.path.exists(path):
+        return {}
+    results = {}
+    with open(path) as f:
+        header = f.readline()
+        if header and json.loads(header).get('config') != config:
+            raise SystemExit(f"{path} was written by a tournament with another configuration")
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partial last line of an interrupted run
+                results[record['key']] = record
+    return results
+
+
+def open_checkpoint(path: str, config: Dict):
+    new = not os.path.exists(path) or os.path.getsize(path) == 0
+    if not new:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b'\n'
+    f = open(path, 'a')
+    if new:
+        f.write(json.dumps({'config': config}) + '\n')
+    elif torn:
+        f.write('\n')  # start after the partial line of an interrupted run
+    f.flush()
+    return f
+
+
+# --- Ratings ------------------------------------------------------------------
+
+def pair_scores(results: List[Dict]) -> Dict[Tuple[str, str], List[float]]:
+    """(a, b) -> [points of a, games] with a < b."""
+    pairs = {}
+    for r in results:
+        a, b = sorted((r['blue'], r['pink']))
+        points = r['score'] if r['blue'] == a else 1.0 - r['score']
+        entry = pairs.setdefault((a, b), [0.0, 0])
+        entry[0] += points
+        entry[1] += 1
+    return pairs
+
+
+def bradley_terry(entrants: List[str], pairs: Dict[Tuple[str, str], List[float]], iterations: int = 200) -> Dict[str, float]:
+    """Maximum likelihood Elo (minorization-maximization), mean rating 0."""
+    wins = {e: 0.0 for e in entrants}
+    games = {}
+    for (a, b), (points, n) in pairs.items():
+        wins[a] += points + PRIOR_DRAWS / 2
+        wins[b] += n - points + PRIOR_DRAWS / 2
+        games[(a, b)] = n + PRIOR_DRAWS
+    gamma = {e: 1.0 for e in entrants}
+    for _ in range(iterations):
+        denom = {e: 0.0 for e in entrants}
+        for (a, b), n in games.items():
+            d = n / (gamma[a] + gamma[b])
+            denom[a] += d
+            denom[b] += d
+        gamma = {e: wins[e] / denom[e] if denom[e] else gamma[e] for e in entrants}
+        # Normalisation (geometric mean 1)
+        mean_log = sum(math.log(g) for g in gamma.values()) / len(gamma)
+        gamma = {e: g / math.exp(mean_log) for e, g in gamma.items()}
+    return {e: 400.0 * math.log10(g) for e, g in gamma.items()}
+
+
+def elo_table(entrants: List[str], results: List[Dict], bootstrap: int = 200, seed: int = 0) -> List[Dict]:
+    """Ratings with 95% bootstrap intervals (games resampled with replacement)."""
+    ratings = bradley_terry(entrants, pair_scores(results))
+    rng = random.Random(seed)
+    samples = {e: [] for e in entrants}
+    for _ in range(bootstrap if results else 0):
+        resampled = [rng.choice(results) for _ in results]
+        for e, elo in bradley_terry(entrants, pair_scores(resampled), iterations=100).items():
+            samples[e].append(elo)
+    rows = []
+    for e in entrants:
+        played = [r for r in results if e in (r['blue'], r['pink'])]
+        points = sum(r['score'] if r['blue'] == e else 1.0 - r['score'] for r in played)
+        ordered = sorted(samples[e])
+        low = ordered[int(0.025 * (len(ordered) - 1))] if ordered else ratings[e]
+        high = ordered[int(0.975 * (len(ordered) - 1))] if ordered else ratings[e]
+        rows.append({
+            'entrant': e,
+            'elo': ratings[e],
+            'ci_low': low,
+            'ci_high': high,
+            'games': len(played),
+            'score': points / len(played) if played else 0.0,
+            'think_s': sum(r['blue_time'] if r['blue'] == e else r['pink_time'] for r in played),
+        })
+    rows.sort(key=lambda row: row['elo'], reverse=True)
+    return rows
+
+
+def print_table(rows: List[Dict]):
+    t = Table(title="Tournament Elo")
+    t.add_column("#", justify="right")
+    t.add_column("Entrant", justify="left")
+    t.add_column("Elo", justify="right")
+    t.add_column("95% CI", justify="right")
+    t.add_column("Games", justify="right")
+    t.add_column("Score %", justify="right")
+    t.add_column("s/game", justify="right")
+    for i, row in enumerate(rows, start=1):
+        t.add_row(
+            str(i),
+            row['entrant'],
+            f"{row['elo']:+.0f}",
+            f"{row['ci_low'] - row['elo']:+.0f} / {row['ci_high'] - row['elo']:+.0f}",
+            str(row['games']),
+            f"{100 * row['score']:.1f}",
+            f"{row['think_s'] / row['games']:.2f}" if row['games'] else "-",
+        )
+    console.print(t)
+
+
+# --- Driver -------------------------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin tournament between AI profiles and depths.")
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), metavar='ID',
+                        help=f"profiles to enter (default: all of {', '.join(PROFILES)})")
+    parser.add_argument('--depths', nargs='+', type=int, default=[2, 3], help="depths to enter (default: 2 3)")
+    parser.add_argument('--opening-plies', type=int, default=4, help="length of the openings (default 4)")
+    parser.add_argument('--openings', type=int, default=8,
+                        help="openings per pairing, each played with both colours (0 = all; default 8)")
+    parser.add_argument('--endgame-empties', type=int, default=0,
+                        help="exact endgame solver from this many empties, for every entrant (default 0 = off)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--seed', type=int, default=2025, help="opening sampling and tie-break seed")
+    parser.add_argument('--checkpoint', default='tournament.jsonl', help="results file, resumed if present")
+    parser.add_argument('--output', '-o', metavar='PATH', help="write the Elo table as JSON")
+    parser.add_argument('--bootstrap', type=int, default=200, help="bootstrap resamples for the intervals")
+    args = parser.parse_args(argv)
+    args.profiles = [p.upper() for p in args.profiles]
+    for p in args.profiles:
+        if p not in PROFILES:
+            parser.error(f"unknown profile {p!r}")
+    if len(args.profiles) * len(args.depths) < 2:
+        parser.error("at least two entrants are needed")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    entrants = [entrant_name(p, d) for p in args.profiles for d in sorted(set(args.depths))]
+    openings = opening_set(args.opening_plies, args.openings, args.seed)
+    config = {'entrants': entrants, 'opening_plies': args.opening_plies, 'openings': len(openings),
+              'seed': args.seed, 'endgame_empties': args.endgame_empties}
+    games = schedule(entrants, len(openings))
+    done = load_checkpoint(args.checkpoint, config)
+    todo = [spec for spec in games if spec['key'] not in done]
+    console.print(f"{len(entrants)} entrants, {len(openings)} openings, {len(games)} games "
+                  f"({len(done)} already in {args.checkpoint})")
+
+    if todo:
+        with open_checkpoint(args.checkpoint, config) as checkpoint, \
+                ProcessPoolExecutor(max_workers=args.workers) as pool, \
+                Progress(SpinnerColumn(style="cyan"), TextColumn("[bold]Playing[/bold]"), BarColumn(),
+                         MofNCompleteColumn(), TimeElapsedColumn(), console=console) as progress:
+            task = progress.add_task("games", total=len(todo))
+            futures = [pool.submit(play_game, spec, openings[spec['opening']], args.seed, args.endgame_empties)
+                       for spec in todo]
+            try:
+                for future in as_completed(futures):
+                    record = future.result()
+                    done[record['key']] = record
+                    checkpoint.write(json.dumps(record) + '\n')
+                    checkpoint.flush()
+                    progress.advance(task)
+            except KeyboardInterrupt:
+                for future in futures:
+                    future.cancel()
+                console.print(f"[yellow]Interrupted: {len(done)} games saved in {args.checkpoint}[/yellow]")
+                raise
+
+    results = [done[spec['key']] for spec in games]
+    rows = elo_table(entrants, results, bootstrap=args.bootstrap, seed=args.seed)
+    print_table(rows)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': config, 'ratings': rows}, f, indent=2)
+        console.print(f"[dim]Ratings written to {args.output}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
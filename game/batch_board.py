@@ -0,0 +1,155 @@
+import numpy as np
+
+from game.board import Board, BLUE, FULL, NOT_A_FILE, NOT_H_FILE, INNER_FILES
+
+# Version vectorisée (NumPy) des opérations de game.board : N positions
+# stockées dans un tableau (N, 2) de uint64 (colonne 0 = BLUE, 1 = PINK),
+# même codage des cases (bit row * 8 + col).
+
+_U = np.uint64
+_FULL = _U(FULL)
+_NOT_A = _U(NOT_A_FILE)
+_NOT_H = _U(NOT_H_FILE)
+_INNER = _U(INNER_FILES)
+_ZERO = _U(0)
+
+# (décalage, vers la gauche ?, masque anti-débordement du résultat,
+#  masque appliqué aux pions adverses pour la propagation)
+_DIRECTIONS = [
+    (_U(1), True, _NOT_A, _INNER), (_U(1), False, _NOT_H, _INNER),
+    (_U(8), True, _FULL, _FULL), (_U(8), False, _FULL, _FULL),
+    (_U(9), True, _NOT_A, _INNER), (_U(9), False, _NOT_H, _INNER),
+    (_U(7), True, _NOT_H, _INNER), (_U(7), False, _NOT_A, _INNER),
+]
+
+if hasattr(np, "bitwise_count"):
+    def popcount(x):
+        return np.bitwise_count(x).astype(np.int64)
+else:  # NumPy < 2.0
+    _POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+    def popcount(x):
+        x = np.ascontiguousarray(x, dtype=np.uint64)
+        return _POP8[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1)
+
+
+def _shift(x, shift, left, mask):
+    return ((x << shift) if left else (x >> shift)) & mask
+
+
+def moves_mask(own, opp):
+    """Masques des coups légaux (tableaux uint64 de même forme)."""
+    empty = ~(own | opp)
+    moves = np.zeros_like(own)
+    for shift, left, mask, opp_mask in _DIRECTIONS:
+        o = opp & opp_mask
+        t = o & _shift(own, shift, left, mask)
+        for _ in range(5):
+            t |= o & _shift(t, shift, left, mask)
+        moves |= _shift(t, shift, left, mask)
+    return moves & empty
+
+
+def flips_mask(own, opp, squares):
+    """Pions retournés par un coup en `squares` (tableau d'index 0-63)."""
+    move = _U(1) << squares.astype(np.uint64)
+    flipped = np.zeros_like(own)
+    for shift, left, mask, _ in _DIRECTIONS:
+        # suite de pions adverses depuis la case jouée, puis la case suivante
+        t = opp & _shift(move, shift, left, mask)
+        for _ in range(5):
+            t |= opp & _shift(t, shift, left, mask)
+        closed = (_shift(t, shift, left, mask) & own) != _ZERO
+        flipped |= np.where(closed, t, _ZERO)
+    return flipped
+
+
+def neighbours_mask(mask):
+    out = np.zeros_like(mask)
+    for shift, left, edge, _ in _DIRECTIONS:
+        out |= _shift(mask, shift, left, edge)
+    return out
+
+
+def transpose(x):
+    """(row, col) -> (col, row), comme game.board.transpose."""
+    t = _U(0x0F0F0F0F00000000) & (x ^ (x << _U(28)))
+    x = x ^ t ^ (t >> _U(28))
+    t = _U(0x3333000033330000) & (x ^ (x << _U(14)))
+    x = x ^ t ^ (t >> _U(14))
+    t = _U(0x5500550055005500) & (x ^ (x << _U(7)))
+    return x ^ t ^ (t >> _U(7))
+
+
+def unpack_squares(x):
+    """(N,) uint64 -> (N, 64) de 0/1, colonne = index de case."""
+    x = np.ascontiguousarray(x, dtype=np.uint64)
+    return np.unpackbits(x.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+
+
+class BoardBatch:
+    """
+    N plateaux manipulés ensemble. `players` (tableau de +1 / -1) désigne,
+    pour chaque plateau, le camp concerné par l'opération.
+    """
+
+    def __init__(self, bitboards):
+        self.bitboards = np.asarray(bitboards, dtype=np.uint64).reshape(-1, 2)
+
+    @classmethod
+    def from_boards(cls, boards):
+        return cls([(b.blue, b.pink) for b in boards])
+
+    def to_boards(self):
+        boards = []
+        for blue, pink in self.bitboards.tolist():
+            board = Board()
+            board.set_position(blue, pink)
+            boards.append(board)
+        return boards
+
+    def __len__(self):
+        return len(self.bitboards)
+
+    @property
+    def blue(self):
+        return self.bitboards[:, 0]
+
+    @property
+    def pink(self):
+        return self.bitboards[:, 1]
+
+    def sides(self, players):
+        """(pions du joueur, pions adverses) pour chaque plateau."""
+        is_blue = np.asarray(players) == BLUE
+        return np.where(is_blue, self.blue, self.pink), np.where(is_blue, self.pink, self.blue)
+
+    def empties(self):
+        return 64 - popcount(self.blue | self.pink)
+
+    def legal_moves(self, players):
+        own, opp = self.sides(players)
+        return moves_mask(own, opp)
+
+    def apply_moves(self, squares, players):
+        """
+        Joue squares[i] pour players[i] sur chaque plateau (sans contrôle de
+        légalité). Une case négative signifie « passe ». Retourne les flips.
+        """
+        squares = np.asarray(squares)
+        players = np.asarray(players)
+        own, opp = self.sides(players)
+        play = squares >= 0
+        flipped = np.where(play, flips_mask(own, opp, np.where(play, squares, 0)), _ZERO)
+        placed = np.where(play, _U(1) << np.where(play, squares, 0).astype(np.uint64), _ZERO)
+        own = own | flipped | placed
+        opp = opp ^ flipped
+        is_blue = players == BLUE
+        self.bitboards[:, 0] = np.where(is_blue, own, opp)
+        self.bitboards[:, 1] = np.where(is_blue, opp, own)
+        return flipped
+
+    def scores(self, players):
+        """Différence de pions du point de vue de players (Board.score)."""
+        own, opp = self.sides(players)
+        return popcount(own) - popcount(opp)
@@ -1,6 +1,8 @@
 from rich.table import Table
 from rich.console import Console
 from rich import box
+import random
+from ai.heuristics_consts import PST
 
 console = Console()
 
@@ -12,23 +14,344 @@ DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1),
               (0, -1),           (0, 1),
               (1, -1),  (1, 0),  (1, 1)]
 
+# Bitboards : une case (row, col) correspond au bit row * 8 + col.
+# A1 = bit 0, H1 = bit 7, A8 = bit 56, H8 = bit 63.
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F
+INNER_FILES = NOT_A_FILE & NOT_H_FILE
+
+# (décalage, masque anti-débordement) pour chaque direction
+_LEFT_SHIFTS = ((1, NOT_A_FILE), (8, FULL), (9, NOT_A_FILE), (7, NOT_H_FILE))
+_RIGHT_SHIFTS = ((1, NOT_H_FILE), (8, FULL), (9, NOT_H_FILE), (7, NOT_A_FILE))
+
+# Clés de Zobrist (graine fixe : hash identique d'un processus à l'autre)
+_zobrist_rng = random.Random(2025)
+ZOBRIST = {
+    BLUE: [_zobrist_rng.getrandbits(64) for _ in range(64)],
+    PINK: [_zobrist_rng.getrandbits(64) for _ in range(64)],
+}
+# Retourner un pion = retirer une couleur et poser l'autre
+ZOBRIST_FLIP = [ZOBRIST[BLUE][sq] ^ ZOBRIST[PINK][sq] for sq in range(64)]
+# Trait à PINK
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+# Valeur PST de chaque case (index bitboard)
+SQUARE_PST = [PST[sq // 8][sq % 8] for sq in range(64)]
+
+SQUARE_TO_MOVE = [(chr(sq % 8 + ord("A")), sq // 8 + 1) for sq in range(64)]
+
+
+def move_to_square(move):
+    col, row = move
+    return (row - 1) * 8 + ord(col.upper()) - ord("A")
+
+
+def square_to_move(sq):
+    return SQUARE_TO_MOVE[sq]
+
+
+def moves_mask(own, opp):
+    """
+    Masque des coups légaux pour le camp `own` (génération par décalages).
+    """
+    empty = ~(own | opp) & FULL
+    inner = opp & INNER_FILES
+    moves = 0
+
+    # Horizontal (est / ouest)
+    t = inner & (own << 1)
+    t |= inner & (t << 1)
+    t |= inner & (t << 1)
+    t |= inner & (t << 1)
+    t |= inner & (t << 1)
+    t |= inner & (t << 1)
+    moves |= t << 1
+    t = inner & (own >> 1)
+    t |= inner & (t >> 1)
+    t |= inner & (t >> 1)
+    t |= inner & (t >> 1)
+    t |= inner & (t >> 1)
+    t |= inner & (t >> 1)
+    moves |= t >> 1
+
+    # Vertical (sud / nord)
+    t = opp & (own << 8)
+    t |= opp & (t << 8)
+    t |= opp & (t << 8)
+    t |= opp & (t << 8)
+    t |= opp & (t << 8)
+    t |= opp & (t << 8)
+    moves |= t << 8
+    t = opp & (own >> 8)
+    t |= opp & (t >> 8)
+    t |= opp & (t >> 8)
+    t |= opp & (t >> 8)
+    t |= opp & (t >> 8)
+    t |= opp & (t >> 8)
+    moves |= t >> 8
+
+    # Diagonales
+    t = inner & (own << 9)
+    t |= inner & (t << 9)
+    t |= inner & (t << 9)
+    t |= inner & (t << 9)
+    t |= inner & (t << 9)
+    t |= inner & (t << 9)
+    moves |= t << 9
+    t = inner & (own >> 9)
+    t |= inner & (t >> 9)
+    t |= inner & (t >> 9)
+    t |= inner & (t >> 9)
+    t |= inner & (t >> 9)
+    t |= inner & (t >> 9)
+    moves |= t >> 9
+    t = inner & (own << 7)
+    t |= inner & (t << 7)
+    t |= inner & (t << 7)
+    t |= inner & (t << 7)
+    t |= inner & (t << 7)
+    t |= inner & (t << 7)
+    moves |= t << 7
+    t = inner & (own >> 7)
+    t |= inner & (t >> 7)
+    t |= inner & (t >> 7)
+    t |= inner & (t >> 7)
+    t |= inner & (t >> 7)
+    t |= inner & (t >> 7)
+    moves |= t >> 7
+
+    return moves & empty
+
+
+def flips_mask(own, opp, sq):
+    """
+    Masque des pions adverses retournés si `own` joue sur la case `sq`.
+    """
+    move = 1 << sq
+    flipped = 0
+    for shift, mask in _LEFT_SHIFTS:
+        x = (move << shift) & mask
+        f = 0
+        while x & opp:
+            f |= x
+            x = (x << shift) & mask
+        if x & own:
+            flipped |= f
+    for shift, mask in _RIGHT_SHIFTS:
+        x = (move >> shift) & mask
+        f = 0
+        while x & opp:
+            f |= x
+            x = (x >> shift) & mask
+        if x & own:
+            flipped |= f
+    return flipped
+
+
+def neighbours_mask(mask):
+    """
+    Cases voisines (8 directions) d'au moins une case du masque.
+    """
+    return (
+        ((mask << 1) & NOT_A_FILE) | ((mask >> 1) & NOT_H_FILE)
+        | ((mask << 8) & FULL) | (mask >> 8)
+        | ((mask << 9) & NOT_A_FILE) | ((mask >> 9) & NOT_H_FILE)
+        | ((mask << 7) & NOT_H_FILE) | ((mask >> 7) & NOT_A_FILE)
+    )
+
+
+def mask_to_moves(mask):
+    """Liste des coups (col, row) d'un masque, dans l'ordre des cases."""
+    return [SQUARE_TO_MOVE[sq] for sq in iter_squares(mask)]
+
+
+def iter_squares(mask):
+    """Parcourt les indices des bits à 1 d'un masque, du plus petit au plus grand."""
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+# Symétries du plateau (groupe diédral, 8 éléments). Une symétrie `sym` est
+# codée sur 3 bits, appliqués dans cet ordre : 4 = transposition
+# (row, col) -> (col, row), 1 = miroir gauche / droite, 2 = miroir haut / bas.
+SYMMETRIES = range(8)
+
+
+def mirror_horizontal(x):
+    """Colonne col -> 7 - col (inversion des bits de chaque octet)."""
+    x = ((x >> 1) & 0x5555555555555555) | ((x & 0x5555555555555555) << 1)
+    x = ((x >> 2) & 0x3333333333333333) | ((x & 0x3333333333333333) << 2)
+    return ((x >> 4) & 0x0F0F0F0F0F0F0F0F) | ((x & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def flip_vertical(x):
+    """Ligne row -> 7 - row (inversion des octets)."""
+    return int.from_bytes(x.to_bytes(8, "little"), "big")
+
+
+def transpose(x):
+    """(row, col) -> (col, row) : symétrie par rapport à la diagonale A1-H8."""
+    t = 0x0F0F0F0F00000000 & (x ^ (x << 28))
+    x ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (x ^ (x << 14))
+    x ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (x ^ (x << 7))
+    return x ^ t ^ (t >> 7)
+
+
+def transform(x, sym):
+    """Applique la symétrie `sym` à un bitboard."""
+    if sym & 4:
+        x = transpose(x)
+    if sym & 1:
+        x = mirror_horizontal(x)
+    if sym & 2:
+        x = flip_vertical(x)
+    return x
+
+
+# SYMMETRY_SQUARES[sym][sq] : image de la case sq ; INVERSE_SYMMETRY[sym] : symétrie réciproque
+SYMMETRY_SQUARES = [[transform(1 << sq, sym).bit_length() - 1 for sq in range(64)] for sym in SYMMETRIES]
+INVERSE_SYMMETRY = [
+    next(inv for inv in SYMMETRIES if all(SYMMETRY_SQUARES[inv][SYMMETRY_SQUARES[sym][sq]] == sq for sq in range(64)))
+    for sym in SYMMETRIES
+]
+
+
+def transform_move(move, sym):
+    """Image du coup (col, row) par la symétrie `sym`."""
+    return SQUARE_TO_MOVE[SYMMETRY_SQUARES[sym][move_to_square(move)]]
+
+
+def zobrist_hash(blue, pink):
+    h = 0
+    for sq in iter_squares(blue):
+        h ^= ZOBRIST[BLUE][sq]
+    for sq in iter_squares(pink):
+        h ^= ZOBRIST[PINK][sq]
+    return h
+
+
+def canonical_bitboards(own, opp):
+    """
+    Forme canonique d'une position : la plus petite paire (own, opp) parmi ses
+    8 images. Retourne (own, opp, sym) avec sym la symétrie appliquée.
+    """
+    best = (own, opp, 0)
+    for sym in range(1, 8):
+        candidate = (transform(own, sym), transform(opp, sym), sym)
+        if candidate < best:
+            best = candidate
+    return best
+
 
 class Board:
     def __init__(self):
-        # grid[row][col]  -> row/ligne d'abord, col/colonne ensuite
-        self.grid = [[EMPTY for _ in range(8)] for _ in range(8)]
+        # Un entier 64 bits par couleur
+        self.blue = 0
+        self.pink = 0
+        self._grid = None
+        self._grid_key = None
+        self.hash = 0
+        # État maintenu incrémentalement par play / unplay
+        self.blue_count = 0
+        self.pink_count = 0
+        self.empties = 64
+        self.blue_pst = 0
+        self.pink_pst = 0
         self._init_start_position()
 
     def _init_start_position(self):
-        self.grid[3][3] = PINK
-        self.grid[3][4] = BLUE
-        self.grid[4][3] = BLUE
-        self.grid[4][4] = PINK
+        self.set_position((1 << 28) | (1 << 35),  # E4, D5
+                          (1 << 27) | (1 << 36))  # D4, E5
+
+    def set_position(self, blue, pink):
+        """Place une position quelconque et recalcule l'état incrémental."""
+        self.blue = blue
+        self.pink = pink
+        self.blue_count = blue.bit_count()
+        self.pink_count = pink.bit_count()
+        self.empties = 64 - (blue | pink).bit_count()
+        self.blue_pst = sum(SQUARE_PST[sq] for sq in iter_squares(blue))
+        self.pink_pst = sum(SQUARE_PST[sq] for sq in iter_squares(pink))
+        self.hash = self.compute_hash()
+
+    def compute_hash(self):
+        """Hash de Zobrist de la position, recalculé depuis zéro."""
+        return zobrist_hash(self.blue, self.pink)
+
+    def hash_key(self, player):
+        """Hash de la position avec le joueur au trait."""
+        return self.hash ^ ZOBRIST_SIDE if player == PINK else self.hash
+
+    def canonical(self, player):
+        """(own, opp, sym) : forme canonique de la position vue de `player`."""
+        return canonical_bitboards(*self.bitboards(player))
+
+    def canonical_key(self, player):
+        """
+        (hash, sym) : hash de Zobrist de la forme canonique avec le joueur au
+        trait, identique pour les 8 images de la position ; sym envoie le
+        plateau sur sa forme canonique (transform_move pour les coups).
+        """
+        blue, pink, sym = canonical_bitboards(self.blue, self.pink)
+        h = zobrist_hash(blue, pink)
+        return (h ^ ZOBRIST_SIDE if player == PINK else h), sym
+
+    def symmetries(self):
+        """Symétries (hors identité) qui laissent la position inchangée."""
+        return [sym for sym in range(1, 8)
+                if transform(self.blue, sym) == self.blue and transform(self.pink, sym) == self.pink]
+
+    def equivalent_moves(self, moves):
+        """
+        {coup: représentant} pour les coups équivalents par une symétrie de la
+        position à un coup qui les précède dans `moves` (vide si aucun).
+        """
+        symmetries = self.symmetries()
+        if not symmetries:
+            return {}
+        seen = {}
+        equivalent = {}
+        for move in moves:
+            sq = move_to_square(move)
+            if sq in seen:
+                equivalent[move] = seen[sq]
+                continue
+            for sym in symmetries:
+                seen.setdefault(SYMMETRY_SQUARES[sym][sq], move)
+        return equivalent
+
+    @property
+    def grid(self):
+        """
+        Vue 8x8 du plateau (grid[row][col]) reconstruite depuis les bitboards.
+        Lecture seule : modifier la liste ne change pas la position.
+        """
+        key = (self.blue, self.pink)
+        if self._grid_key != key:
+            blue, pink = key
+            self._grid = [
+                [BLUE if blue >> (r * 8 + c) & 1 else PINK if pink >> (r * 8 + c) & 1 else EMPTY
+                 for c in range(8)]
+                for r in range(8)
+            ]
+            self._grid_key = key
+        return self._grid
+
+    def bitboards(self, player):
+        """Retourne (pions du joueur, pions adverses)."""
+        return (self.blue, self.pink) if player == BLUE else (self.pink, self.blue)
 
     def count_discs(self):
-        blue_count = sum(cell == BLUE for row in self.grid for cell in row)
-        pink_count = sum(cell == PINK for row in self.grid for cell in row)
-        return blue_count, pink_count
+        return self.blue_count, self.pink_count
+
+    def pst_sums(self, player):
+        """Retourne (somme PST du joueur, somme PST adverse)."""
+        return (self.blue_pst, self.pink_pst) if player == BLUE else (self.pink_pst, self.blue_pst)
 
     def display(self):
         table = Table(show_header=True, show_lines=True, box=box.SQUARE)
@@ -54,29 +377,24 @@ class Board:
         console.print(table)
         console.print(f"[bold white]Blue:[/bold white] [bright_cyan]{blue_count}[/bright_cyan] - [bold white]Pink:[/bold white] [bright_magenta]{pink_count}[/bright_magenta]")
 
-    def get_valid_moves(self, player):
-        valid_moves = []
-
-        for row in range(8):
-            for col in range(8):
-                if self.grid[row][col] != EMPTY:
-                    continue
-
-                for (dr, dc) in DIRECTIONS:
-                    r = row + dr
-                    c = col + dc
-                    found_opponent = False
+    def valid_moves_mask(self, player):
+        own, opp = self.bitboards(player)
+        return moves_mask(own, opp)
 
-                    while self.inside(r, c) and self.grid[r][c] == -player:
-                        found_opponent = True
-                        r += dr
-                        c += dc
+    def move_masks(self, player):
+        """
+        Coups légaux des deux camps : (masque du joueur, masque adverse).
+        Calculés une fois, ils servent au test de fin de partie, à la liste
+        des coups et à la mobilité.
+        """
+        own, opp = self.bitboards(player)
+        return moves_mask(own, opp), moves_mask(opp, own)
 
-                    if self.inside(r, c) and self.grid[r][c] == player and found_opponent:
-                        valid_moves.append((chr(col + ord("A")), row + 1))
-                        break
+    def get_valid_moves(self, player):
+        return mask_to_moves(self.valid_moves_mask(player))
 
-        return valid_moves
+    def is_valid_move(self, move, player):
+        return bool(self.valid_moves_mask(player) >> move_to_square(move) & 1)
 
     def inside(self, row, col):
         return 0 <= row < 8 and 0 <= col < 8
@@ -86,105 +404,109 @@ class Board:
         human_move = (col, row)
 
         # Vérifier que le coup est légal au format (col, row)
-        if human_move not in self.get_valid_moves(player):
+        if not self.inside(row - 1, ord(col) - ord("A")) or not self.is_valid_move(human_move, player):
             return  # coup invalide; pas de changement
 
-        # Conversion vers indices 0-based (row, col)
-        r = row - 1
-        c = ord(col) - ord("A")
-
-        # Poser le pion
-        self.grid[r][c] = player
-
-        # Retourner dans toutes les directions (dr, dc)
-        for (dr, dc) in DIRECTIONS:
-            rr = r + dr
-            cc = c + dc
-
-            if not self.inside(rr, cc) or self.grid[rr][cc] != -player:
-                continue
-
-            # Avancer sur les pions adverses
-            while self.inside(rr, cc) and self.grid[rr][cc] == -player:
-                rr += dr
-                cc += dc
-
-            # Si on retombe sur un de nos pions, on retourne en arrière
-            if self.inside(rr, cc) and self.grid[rr][cc] == player:
-                rr -= dr
-                cc -= dc
-                while (rr, cc) != (r, c):
-                    self.grid[rr][cc] = player
-                    rr -= dr
-                    cc -= dc
+        self.play(move_to_square(human_move), player)
 
     def clone(self):
-        clone_board = Board()
-        for row in range(8):
-            for col in range(8):
-                clone_board.grid[row][col] = self.grid[row][col]
+        # Sans passer par __init__ (position de départ et hash recalculés pour rien)
+        clone_board = Board.__new__(Board)
+        clone_board._grid = None
+        clone_board._grid_key = None
+        clone_board.blue = self.blue
+        clone_board.pink = self.pink
+        clone_board.hash = self.hash
+        clone_board.blue_count = self.blue_count
+        clone_board.pink_count = self.pink_count
+        clone_board.empties = self.empties
+        clone_board.blue_pst = self.blue_pst
+        clone_board.pink_pst = self.pink_pst
         return clone_board
 
+    def play(self, sq, player):
+        """
+        Joue sur la case `sq` (0-63) sans vérifier la légalité.
+        Retourne le masque des pions retournés pour unplay.
+        """
+        own, opp = self.bitboards(player)
+        flipped = flips_mask(own, opp, sq)
+        n = flipped.bit_count()
+        pst = self._scan_flips(sq, flipped, player)
+        if player == BLUE:
+            self.blue = own | flipped | (1 << sq)
+            self.pink = opp ^ flipped
+            self.blue_count += n + 1
+            self.pink_count -= n
+            self.blue_pst += SQUARE_PST[sq] + pst
+            self.pink_pst -= pst
+        else:
+            self.pink = own | flipped | (1 << sq)
+            self.blue = opp ^ flipped
+            self.pink_count += n + 1
+            self.blue_count -= n
+            self.pink_pst += SQUARE_PST[sq] + pst
+            self.blue_pst -= pst
+        self.empties -= 1
+        return flipped
+
+    def unplay(self, sq, flipped, player):
+        """
+        Annule un coup joué par play.
+        """
+        placed = flipped | (1 << sq)
+        n = flipped.bit_count()
+        pst = self._scan_flips(sq, flipped, player)
+        if player == BLUE:
+            self.blue ^= placed
+            self.pink |= flipped
+            self.blue_count -= n + 1
+            self.pink_count += n
+            self.blue_pst -= SQUARE_PST[sq] + pst
+            self.pink_pst += pst
+        else:
+            self.pink ^= placed
+            self.blue |= flipped
+            self.pink_count -= n + 1
+            self.blue_count += n
+            self.pink_pst -= SQUARE_PST[sq] + pst
+            self.blue_pst += pst
+        self.empties += 1
+
+    def _scan_flips(self, sq, flipped, player):
+        """
+        Met à jour le hash (XOR : identique pour jouer et annuler) et
+        retourne la somme PST des pions retournés.
+        """
+        h = self.hash ^ ZOBRIST[player][sq]
+        pst = 0
+        while flipped:
+            bit = flipped & -flipped
+            i = bit.bit_length() - 1
+            h ^= ZOBRIST_FLIP[i]
+            pst += SQUARE_PST[i]
+            flipped ^= bit
+        self.hash = h
+        return pst
+
     def make_move(self, move, player):
         """
         Applique un coup (col, row) sans cloner.
-        Retourne la liste des positions retournées pour undo.
+        Retourne le masque (bitboard) des positions retournées pour undo.
         move = (colLetter, rowNumber)
         """
-        col, row = move
-        col = col.upper()
-
-        flipped = []
-
-        # Convert to 0-based indices
-        r = row - 1
-        c = ord(col) - ord("A")
-
-        # Place the stone
-        self.grid[r][c] = player
-
-        # Explore all directions
-        for dr, dc in DIRECTIONS:
-            rr = r + dr
-            cc = c + dc
-
-            temp = []
-
-            # Follow opponent pieces
-            while self.inside(rr, cc) and self.grid[rr][cc] == -player:
-                temp.append((rr, cc))
-                rr += dr
-                cc += dc
-
-            # If we end on player's own piece, flip the chain
-            if self.inside(rr, cc) and self.grid[rr][cc] == player and len(temp) > 0:
-                for pos in temp:
-                    self.grid[pos[0]][pos[1]] = player
-                flipped.extend(temp)
-
-        return flipped
+        return self.play(move_to_square(move), player)
 
     def undo_move(self, move, flipped, player):
         """
         Annule un coup joué par make_move.
         move = (colLetter, rowNumber)
-        flipped = liste des positions retournées
+        flipped = masque des positions retournées
         """
-        col, row = move
-        col = col.upper()
-
-        r = row - 1
-        c = ord(col) - ord("A")
-
-        # Remove the placed stone
-        self.grid[r][c] = EMPTY
-
-        # Undo flips: restore opponent's color
-        for (rr, cc) in flipped:
-            self.grid[rr][cc] = -player
+        self.unplay(move_to_square(move), flipped, player)
 
     def is_terminal(self):
-        return not self.get_valid_moves(BLUE) and not self.get_valid_moves(PINK)
+        return not moves_mask(self.blue, self.pink) and not moves_mask(self.pink, self.blue)
 
     def score(self, player):
         blue_count, pink_count = self.count_discs()
@@ -1,7 +1,9 @@
 import time
 import threading
+from ai.endgame import SOLVER_EMPTIES, solver_empties
 from game.board import Board, BLUE, PINK
 from game.player import HumanPlayer, AIPlayer, RandomAIPlayer
+from game.record import GameWriter, make_record
 from ui.game_settings import get_gamemode, get_depth_choice, get_ai_profile_choice
 from ui.game_sign import game_setup
 from ui.messages import *
@@ -10,17 +12,30 @@ class GameManager:
     # Gestion du jeu avec initialisation du plateau et des joueurs,
     # déroulement des tours, gestion des mouvements, et détermination du vainqueur.
 
-    def __init__(self):
+    def __init__(self, record_path=None, ponder=True, endgame_empties=SOLVER_EMPTIES):
         self.board = Board()
         self.player1 = None
         self.player2 = None
         self.current_player = None
+        # Coups joués ((lettre, ligne) ou None pour une passe) et temps (ms)
+        self.moves = []
+        self.times_ms = []
+        # Fichier de parties (game.record) auquel ajouter la partie terminée
+        self.record_path = record_path
+        self.record = None
+        # Humain contre IA : l'IA réfléchit pendant le tour de l'humain
+        self.ponder = ponder
+        # Résolution exacte des dernières cases vides : au plus ce seuil, réduit
+        # selon la profondeur de chaque IA (ai.endgame.solver_empties ; 0 = jamais)
+        self.endgame_empties = endgame_empties
 
     def run(self):
         blueAI_time = 0
         pinkAI_time = 0
         blueAI_moves = 0
         pinkAI_moves = 0
+        blueAI_nodes = 0
+        pinkAI_nodes = 0
         game_setup()
         mode = get_gamemode()  # Choix du mode de jeu par l'utilisateur
         if mode == 1:
@@ -29,7 +44,8 @@ class GameManager:
         elif mode == 2:
             self.player1 = HumanPlayer(BLUE)
             depth_choice = get_depth_choice(2)
-            self.player2 = AIPlayer(PINK, depth=depth_choice, name=f"AI-D{depth_choice}")
+            self.player2 = AIPlayer(PINK, depth=depth_choice, name=f"AI-D{depth_choice}", ponder=self.ponder,
+                                    endgame_empties=solver_empties(depth_choice, self.endgame_empties))
         elif mode == 3:
             # IA random vs humain
             self.player1 = RandomAIPlayer(BLUE)
@@ -38,7 +54,8 @@ class GameManager:
             # IA random vs IA avec profondeur
             depth_choice = get_depth_choice(2)
             self.player1 = RandomAIPlayer(BLUE, name="RandomAI")
-            self.player2 = AIPlayer(PINK, depth=depth_choice, name=f"AI-D{depth_choice}")
+            self.player2 = AIPlayer(PINK, depth=depth_choice, name=f"AI-D{depth_choice}",
+                                    endgame_empties=solver_empties(depth_choice, self.endgame_empties))
         elif mode == 5:
             # AI vs AI avec profils et profondeur
             profile1 = get_ai_profile_choice(1)
@@ -48,6 +65,8 @@ class GameManager:
                 depth=depth1,
                 name=f"{profile1['name']} (D{depth1})",
                 weights=profile1['weights'],
+                profile=profile1['id'],
+                endgame_empties=solver_empties(depth1, self.endgame_empties),
             )
 
             profile2 = get_ai_profile_choice(2)
@@ -57,13 +76,20 @@ class GameManager:
                 depth=depth2,
                 name=f"{profile2['name']} (D{depth2})",
                 weights=profile2['weights'],
+                profile=profile2['id'],
+                endgame_empties=solver_empties(depth2, self.endgame_empties),
             )
         else:
             # AI vs AI simple (profondeurs)
             depth_choice1 = get_depth_choice(1)
             depth_choice2 = get_depth_choice(2)
-            self.player1 = AIPlayer(BLUE, depth=depth_choice1, name=f"AI-D{depth_choice1}")
-            self.player2 = AIPlayer(PINK, depth=depth_choice2, name=f"AI-D{depth_choice2}")
+            self.player1 = AIPlayer(BLUE, depth=depth_choice1, name=f"AI-D{depth_choice1}",
+                                    endgame_empties=solver_empties(depth_choice1, self.endgame_empties))
+            self.player2 = AIPlayer(PINK, depth=depth_choice2, name=f"AI-D{depth_choice2}",
+                                    endgame_empties=solver_empties(depth_choice2, self.endgame_empties))
+        for player in (self.player1, self.player2):
+            if isinstance(player, AIPlayer):
+                player.collect_stats = True
         self.current_player = self.player1
         console.print(MSG_GAMESTARTED)
         while True:
@@ -75,6 +101,9 @@ class GameManager:
                 console.print(f"Current player : [bold bright_cyan]{player_name}[/bold bright_cyan]" if self.current_player.color == BLUE else f"Current player : [bold bright_magenta]{player_name}[/bold bright_magenta]")
             else:
                 console.print(MSG_BLUETURN if self.current_player.color == BLUE else MSG_PINKTURN)
+            opponent = self.player1 if self.current_player == self.player2 else self.player2
+            if isinstance(self.current_player, HumanPlayer) and getattr(opponent, 'ponderer', None) is not None:
+                opponent.ponderer.start(self.board, self.current_player.color)
             if isinstance(self.current_player, AIPlayer):
                 stop_event = threading.Event()
                 loader_thread = threading.Thread(target=ai_loader, args=(stop_event,))
@@ -82,32 +111,60 @@ class GameManager:
                 start = time.time()
                 move = self.current_player.get_move(self.board)
                 elapsed = time.time() - start
-                if self.current_player.color == BLUE:
-                    blueAI_time += elapsed
-                    blueAI_moves += 1
-                else:
-                    pinkAI_time += elapsed
-                    pinkAI_moves += 1
                 stop_event.set()
                 loader_thread.join()
-                ai_name = getattr(self.current_player, 'name', 'AI')
-                console.print(f"[dim]{ai_name} thought for {elapsed * 1000:.1f} ms[/dim]")
+                # Une passe n'est pas une recherche : ni temps, ni nœuds comptés
+                if move is not None:
+                    stats = self.current_player.last_stats
+                    nodes = stats.nodes if stats is not None else 0
+                    if self.current_player.color == BLUE:
+                        blueAI_time += elapsed
+                        blueAI_moves += 1
+                        blueAI_nodes += nodes
+                    else:
+                        pinkAI_time += elapsed
+                        pinkAI_moves += 1
+                        pinkAI_nodes += nodes
+                    ai_name = getattr(self.current_player, 'name', 'AI')
+                    nps = nodes / elapsed if elapsed > 0 else 0
+                    if stats is not None and stats.source == 'ponder':
+                        console.print(f"[dim]{ai_name} answered in {elapsed * 1000:.1f} ms (move found while pondering)[/dim]")
+                    else:
+                        console.print(f"[dim]{ai_name} thought for {elapsed * 1000:.1f} ms ({nodes} nodes, {nps:,.0f} nodes/s)[/dim]")
             else:
+                start = time.time()
                 move = self.current_player.get_move(self.board)
+                elapsed = time.time() - start
+            self.moves.append(move)
+            self.times_ms.append(elapsed * 1000)
             if move is None:
                 console.print(MSG_SKIPTURN)
             else:
                 self.board.apply_move(move[0], move[1], self.current_player.color)
             self.current_player = self.player1 if self.current_player == self.player2 else self.player2
+        for player in (self.player1, self.player2):
+            ponderer = getattr(player, 'ponderer', None)
+            if ponderer is not None:
+                ponderer.stop()
+                if ponderer.hits + ponderer.misses:
+                    console.print(f"[dim]Pondering {player.name}: {ponderer.hits}/{ponderer.hits + ponderer.misses} "
+                                  f"replies answered from the background search[/dim]")
         self.board.display()
+        self.record = make_record({BLUE: self.player1, PINK: self.player2}, self.moves, self.board,
+                                  first_player=self.player1.color, times_ms=self.times_ms)
+        if self.record_path:
+            with GameWriter(self.record_path) as writer:
+                writer.write(self.record)
         black_count, white_count = self.board.count_discs()
         if blueAI_moves > 0:
             avg_blue = (blueAI_time / blueAI_moves) * 1000
-            console.print(f"[cyan]Temps moyen IA BLUE ({getattr(self.player1,'name','BLUE')}) : {avg_blue:.3f} ms ({blueAI_moves} coups)[/cyan]")
+            nps_blue = blueAI_nodes / blueAI_time if blueAI_time > 0 else 0
+            console.print(f"[cyan]Temps moyen IA BLUE ({getattr(self.player1,'name','BLUE')}) : {avg_blue:.3f} ms ({blueAI_moves} coups, {nps_blue:,.0f} nœuds/s)[/cyan]")
 
         if pinkAI_moves > 0:
             avg_pink = (pinkAI_time / pinkAI_moves) * 1000
-            console.print(f"[magenta]Temps moyen IA PINK ({getattr(self.player2,'name','PINK')}) : {avg_pink:.3f} ms ({pinkAI_moves} coups)[/magenta]")
+            nps_pink = pinkAI_nodes / pinkAI_time if pinkAI_time > 0 else 0
+            console.print(f"[magenta]Temps moyen IA PINK ({getattr(self.player2,'name','PINK')}) : {avg_pink:.3f} ms ({pinkAI_moves} coups, {nps_pink:,.0f} nœuds/s)[/magenta]")
         
         # Display winner with AI names if applicable
         if black_count > white_count:
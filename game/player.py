@@ -1,4 +1,9 @@
-from ai.minimax import choose_move
+from ai.minimax import choose_move, SearchStats, ALPHABETA
+from ai.endgame import DEFAULT_ENDGAME_EMPTIES, EXACT
+from ai.opening_book import open_book
+from ai.ponder import Ponderer
+from ai.search_cache import open_cache
+from ai.transposition import TranspositionTable, DEFAULT_TT_MB
 from rich.console import Console
 from ui.messages import *
 from game.board import BLUE
@@ -43,16 +48,61 @@ class HumanPlayer(Player):
 
 class AIPlayer(Player):
     # Gestion de l’algorithme de recherche selon la profondeur 
-    def __init__(self, color, depth=4, name=None, weights=None):
+    def __init__(self, color, depth=4, name=None, weights=None, tt_mb=None, time_limit=None, workers=None,
+                 algorithm=ALPHABETA, endgame_empties=DEFAULT_ENDGAME_EMPTIES, endgame_mode=EXACT, book=None,
+                 cache=None, collect_stats=False, profile=None, ponder=False, smp_workers=None):
         super().__init__(color, name=name)
         self.depth = depth
         self.weights = weights
+        self.profile = profile  # identifiant du profil (AI_PROFILES), pour les enregistrements
+        self.tt_mb = tt_mb  # budget mémoire de la table de transposition (Mo)
+        # Table propre au joueur : deux IA d'un même processus ne se la partagent
+        # pas et ne la redimensionnent pas à chaque coup
+        self.tt = TranspositionTable(tt_mb if tt_mb is not None else DEFAULT_TT_MB)
+        # Temps par coup (s) : approfondissement itératif jusqu'à `depth` (None = sans limite)
+        self.time_limit = time_limit
+        self.workers = workers  # > 1 : coups racine répartis sur un pool de processus
+        # N : recherche Lazy SMP sur N processus partageant la table de transposition
+        self.smp_workers = smp_workers
+        self.algorithm = algorithm  # ALPHABETA ou PVS
+        # Résolution exacte à partir de ce nombre de cases vides (0 = désactivée)
+        self.endgame_empties = endgame_empties
+        self.endgame_mode = endgame_mode  # EXACT (différence de pions) ou WLD
+        # Bibliothèque d'ouvertures (chemin ou OpeningBook), consultée avant toute recherche
+        self.book = open_book(book)
+        # Cache persistant des recherches (chemin ou SearchCache), partagé entre parties
+        self.cache = open_cache(cache)
+        # Statistiques de recherche (SearchStats) du dernier coup dans last_stats
+        self.collect_stats = collect_stats
+        self.last_stats = None
+        # Réflexion sur le temps de l'adversaire (lancée par GameManager)
+        self.ponderer = Ponderer(self) if ponder else None
 
     def get_move(self, board):
         valid_moves = board.get_valid_moves(self.color)
         if not valid_moves:
+            # Passe : pas de recherche, donc pas de statistiques
+            self.last_stats = None
             return None
-        return choose_move(board, self.color, depth=self.depth, weights=self.weights)
+        stats = self.last_stats = SearchStats() if self.collect_stats else None
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self.book is not None:
+            move = self.book.get_move(board, self.color)
+            if move is not None:
+                if stats is not None:
+                    stats.source = 'book'
+                return move
+        if self.ponderer is not None:
+            move = self.ponderer.take(board)
+            if move is not None:
+                if stats is not None:
+                    stats.source = 'ponder'
+                return move
+        return choose_move(board, self.color, depth=self.depth, weights=self.weights, tt_mb=self.tt_mb,
+                           time_limit=self.time_limit, workers=self.workers, algorithm=self.algorithm,
+                           endgame_empties=self.endgame_empties, endgame_mode=self.endgame_mode,
+                           cache=self.cache, stats=stats, smp_workers=self.smp_workers, tt=self.tt)
     
 
 class RandomAIPlayer(Player):
@@ -0,0 +1,297 @@
+import argparse
+import os
+import struct
+import sys
+from array import array
+
+from game.board import Board, BLUE, PINK, move_to_square, square_to_move
+
+# Enregistrement compact des parties, lu et écrit en flux (mémoire constante
+# quel que soit le nombre de parties du fichier).
+#
+# Fichier : en-tête FILE_HEADER (magie, version) puis les parties à la suite.
+# Partie :
+#   - RECORD_HEADER : nombre de coups, drapeaux, profondeurs BLUE / PINK
+#     (0 = pas une IA à profondeur fixe), pions BLUE / PINK en fin de partie,
+#     graine ;
+#   - 4 chaînes UTF-8 préfixées par leur longueur (1 octet) : nom BLUE, nom PINK,
+#     profil BLUE, profil PINK ;
+#   - un octet par coup, passes comprises (case 0-63, PASS = 64) ; les couleurs
+#     alternent à partir du premier joueur ;
+#   - si FLAG_TIMES : un float32 par coup, temps de réflexion en ms.
+
+MAGIC = b"RVGR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+RECORD_HEADER = struct.Struct("<HBBBBBQ")
+
+PASS = 64
+
+FLAG_SEED = 1       # la graine est renseignée
+FLAG_TIMES = 2      # temps par coup présents
+FLAG_PINK_FIRST = 4  # PINK joue le premier coup
+
+MAX_TEXT = 255
+
+
+def encode_move(move):
+    """Coup (lettre, ligne) ou None (passe) -> octet."""
+    return PASS if move is None else move_to_square(move)
+
+
+def decode_move(code):
+    return None if code == PASS else square_to_move(code)
+
+
+class GameRecord:
+    """
+    Une partie : joueurs, coups (octets, voir encode_move), résultat et,
+    éventuellement, temps de réflexion par coup (ms).
+    """
+
+    def __init__(self, moves=b"", first_player=BLUE, names=None, profiles=None, depths=None,
+                 discs=(0, 0), seed=None, times_ms=None):
+        self.moves = bytes(moves)
+        self.first_player = first_player
+        # Par couleur : {BLUE: ..., PINK: ...}
+        self.names = names or {BLUE: "BLUE", PINK: "PINK"}
+        self.profiles = profiles or {BLUE: "", PINK: ""}
+        self.depths = depths or {BLUE: 0, PINK: 0}
+        self.blue_discs, self.pink_discs = discs
+        self.seed = seed
+        self.times_ms = list(times_ms) if times_ms is not None else None
+        if self.times_ms is not None and len(self.times_ms) != len(self.moves):
+            raise ValueError("times_ms must have one entry per move")
+
+    @property
+    def result(self):
+        """Score de BLUE : 1, 0.5 ou 0."""
+        if self.blue_discs == self.pink_discs:
+            return 0.5
+        return 1.0 if self.blue_discs > self.pink_discs else 0.0
+
+    @property
+    def winner(self):
+        if self.blue_discs == self.pink_discs:
+            return None
+        return BLUE if self.blue_discs > self.pink_discs else PINK
+
+    def move_list(self):
+        """Coups (lettre, ligne), None pour une passe."""
+        return [decode_move(code) for code in self.moves]
+
+    def replay(self):
+        """
+        Rejoue la partie : génère (plateau, joueur au trait, coup) avant chaque
+        coup. Le plateau est partagé et modifié au fil de la partie (le copier
+        pour le conserver). Lève ValueError sur un coup illégal.
+        """
+        board = Board()
+        player = self.first_player
+        for code in self.moves:
+            legal = board.valid_moves_mask(player)
+            if code == PASS:
+                if legal:
+                    raise ValueError(f"pass with legal moves available for {player}")
+            elif not legal >> code & 1:
+                raise ValueError(f"illegal move {square_to_move(code)} for {player}")
+            yield board, player, decode_move(code)
+            if code != PASS:
+                col, row = square_to_move(code)
+                board.apply_move(col, row, player)
+            player = -player
+
+    def final_board(self):
+        """Plateau après le dernier coup (replay joue chaque coup après l'avoir généré)."""
+        board = Board()  # partie sans coup
+        for board, _, _ in self.replay():
+            pass
+        return board
+
+    def encode(self):
+        flags = (FLAG_SEED if self.seed is not None else 0) \
+            | (FLAG_TIMES if self.times_ms is not None else 0) \
+            | (FLAG_PINK_FIRST if self.first_player == PINK else 0)
+        parts = [RECORD_HEADER.pack(
+            len(self.moves), flags, self.depths[BLUE], self.depths[PINK],
+            self.blue_discs, self.pink_discs, (self.seed or 0) & 0xFFFFFFFFFFFFFFFF,
+        )]
+        for text in (self.names[BLUE], self.names[PINK], self.profiles[BLUE], self.profiles[PINK]):
+            data = (text or "").encode()[:MAX_TEXT]
+            parts.append(bytes((len(data),)) + data)
+        parts.append(self.moves)
+        if self.times_ms is not None:
+            times = array("f", self.times_ms)
+            if sys.byteorder == "big":
+                times.byteswap()
+            parts.append(times.tobytes())
+        return b"".join(parts)
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise EOFError
+    return data
+
+
+def _read_record(f):
+    """Partie suivante de `f`, None en fin de fichier ; EOFError si la partie est tronquée."""
+    head = f.read(RECORD_HEADER.size)
+    if not head:
+        return None
+    if len(head) != RECORD_HEADER.size:
+        raise EOFError
+    count, flags, blue_depth, pink_depth, blue_discs, pink_discs, seed = RECORD_HEADER.unpack(head)
+    texts = []
+    for _ in range(4):
+        size = _read_exact(f, 1)[0]
+        texts.append(_read_exact(f, size).decode(errors="replace"))
+    moves = _read_exact(f, count)
+    times = None
+    if flags & FLAG_TIMES:
+        times = array("f")
+        times.frombytes(_read_exact(f, 4 * count))
+        if sys.byteorder == "big":
+            times.byteswap()
+    if seed >= 1 << 63:
+        seed -= 1 << 64
+    return GameRecord(
+        moves,
+        first_player=PINK if flags & FLAG_PINK_FIRST else BLUE,
+        names={BLUE: texts[0], PINK: texts[1]},
+        profiles={BLUE: texts[2], PINK: texts[3]},
+        depths={BLUE: blue_depth, PINK: pink_depth},
+        discs=(blue_discs, pink_discs),
+        seed=seed if flags & FLAG_SEED else None,
+        times_ms=times,
+    )
+
+
+def _check_header(f, path):
+    head = f.read(FILE_HEADER.size)
+    if len(head) != FILE_HEADER.size:
+        raise ValueError(f"{path}: not a game record file")
+    magic, version = FILE_HEADER.unpack(head)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a game record file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported record version {version}")
+
+
+def read_games(path):
+    """
+    Génère les parties de `path` une à une. Une dernière partie tronquée
+    (écriture interrompue) est ignorée.
+    """
+    with open(path, "rb") as f:
+        _check_header(f, path)
+        while True:
+            try:
+                record = _read_record(f)
+            except EOFError:
+                return
+            if record is None:
+                return
+            yield record
+
+
+class GameWriter:
+    """
+    Ajoute des parties à un fichier (créé avec son en-tête s'il n'existe pas).
+    Une partie tronquée en fin de fichier (écriture interrompue) est retirée
+    avant l'ajout. Utilisable comme gestionnaire de contexte.
+    """
+
+    def __init__(self, path, append=True):
+        self.path = path
+        self.count = 0
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            _check_header(self._file, path)
+            end = self._file.tell()
+            try:
+                while _read_record(self._file) is not None:
+                    end = self._file.tell()
+            except EOFError:
+                pass
+            self._file.seek(end)
+            self._file.truncate()
+        else:
+            self._file = open(path, "wb")
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record):
+        self._file.write(record.encode())
+        self.count += 1
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def player_info(player):
+    """(nom, profil, profondeur) d'un joueur pour l'en-tête d'une partie."""
+    depth = getattr(player, "depth", None)
+    return (
+        getattr(player, "name", "") or "",
+        getattr(player, "profile", "") or "",
+        depth if isinstance(depth, int) and 0 < depth < 256 else 0,
+    )
+
+
+def make_record(players, moves, board, first_player=BLUE, seed=None, times_ms=None, profiles=None):
+    """
+    Partie à partir des joueurs {couleur: joueur}, des coups joués ((lettre,
+    ligne) ou None pour une passe) et du plateau final. `profiles` remplace les
+    profils lus sur les joueurs.
+    """
+    info = {color: player_info(players[color]) for color in (BLUE, PINK)}
+    return GameRecord(
+        bytes(encode_move(move) for move in moves),
+        first_player=first_player,
+        names={color: info[color][0] for color in info},
+        profiles=profiles or {color: info[color][1] for color in info},
+        depths={color: info[color][2] for color in info},
+        discs=board.count_discs(),
+        seed=seed,
+        times_ms=times_ms,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résumé d'un fichier de parties")
+    parser.add_argument("path")
+    parser.add_argument("--check", action="store_true", help="rejoue chaque partie (coups légaux)")
+    args = parser.parse_args()
+    games = moves = passes = 0
+    results = {BLUE: 0, PINK: 0, None: 0}
+    for record in read_games(args.path):
+        games += 1
+        moves += len(record.moves)
+        passes += record.moves.count(PASS)
+        results[record.winner] += 1
+        if args.check:
+            board = record.final_board()
+            if board.count_discs() != (record.blue_discs, record.pink_discs):
+                raise SystemExit(f"partie {games} : score enregistré incohérent")
+    print(f"{games} parties, {moves} coups ({passes} passes), "
+          f"{moves / games if games else 0:.1f} coups par partie")
+    print(f"BLUE {results[BLUE]}, PINK {results[PINK]}, nulles {results[None]}")
+
+
+if __name__ == "__main__":
+    main()
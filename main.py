@@ -1,5 +1,16 @@
+import argparse
+
+from ai.endgame import SOLVER_EMPTIES
 from game.game_manager import GameManager
 
 if __name__ == "__main__":
-    gm = GameManager()
+    parser = argparse.ArgumentParser(description="Reversi")
+    parser.add_argument("--record", metavar="PATH", help="ajoute la partie au fichier de parties PATH")
+    parser.add_argument("--no-ponder", action="store_true",
+                        help="l'IA ne réfléchit pas pendant le tour de l'humain")
+    parser.add_argument("--endgame-empties", type=int, default=SOLVER_EMPTIES, metavar="N",
+                        help=f"résolution exacte des N dernières cases vides au plus, 2 par niveau de "
+                             f"profondeur de l'IA (défaut {SOLVER_EMPTIES}, 0 = désactivée)")
+    args = parser.parse_args()
+    gm = GameManager(record_path=args.record, ponder=not args.no_ponder, endgame_empties=args.endgame_empties)
     gm.run()
\ No newline at end of file
@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ai.ai_profiles import AI_PROFILES
+from ai.minimax import choose_move
+from game.board import Board, BLUE, PINK
+from game.record import GameRecord, GameWriter, encode_move
+
+# Serveur de parties sans interface : asyncio, une partie par connexion,
+# protocole JSON ligne par ligne sur TCP ou socket Unix.
+#
+# Les recherches de l'IA partent dans un pool de processus borné (quelques
+# moteurs pour des centaines de parties). Contre-pression : au plus
+# `max_pending` recherches en cours ou en attente de moteur ; au-delà la
+# requête attend son tour, et si `max_waiting` requêtes attendent déjà, elle
+# est refusée (erreur "busy"). Chaque connexion traite ses requêtes une à une :
+# un client qui envoie trop vite est freiné par TCP.
+#
+# Temps par coup : la recherche est itérative et s'arrête d'elle-même à
+# `move_time` ; asyncio.wait_for répond "timeout" après une marge si le moteur
+# ne rend pas la main (résolution de finale), et la place dans le pool n'est
+# libérée qu'à la fin réelle du calcul.
+#
+# Requêtes (champ "id" facultatif, recopié dans la réponse) :
+#   {"cmd": "new", "ai": "PINK", "profile": "DEFAULT", "depth": 4}
+#       ai : "BLUE", "PINK", "both" ou "none" (camp(s) joué(s) par le serveur)
+#   {"cmd": "move", "move": "D3"}   coup du joueur au trait, puis réponses de l'IA
+#       refusé ("not_your_turn") si le camp au trait est joué par le serveur
+#   {"cmd": "ai"}                    l'IA joue pour le camp au trait
+#   "time_limit" facultatif dans new, move et ai : temps par coup de l'IA (s)
+#       pour cette requête, plafonné par le maximum du serveur (--move-time)
+#   {"cmd": "state"}
+#   {"cmd": "quit"}
+# Réponses : {"ok": true, "game": n, "state": {...}, "played": [...]} ou
+#            {"ok": false, "error": code, "message": texte}.
+# Une erreur survenue après que la partie a été créée ou a avancé (IA "busy"
+# ou "timeout" au milieu des réponses...) porte aussi "game", "state" et
+# "played" : le client reprend avec {"cmd": "ai"}.
+
+DEFAULT_PORT = 8765
+DEFAULT_DEPTH = 4
+MAX_DEPTH = 8
+# Temps maximal d'une recherche (s), et marge avant la réponse "timeout"
+DEFAULT_MOVE_TIME = 5.0
+TIMEOUT_GRACE = 2.0
+# Taille maximale d'une ligne de requête (octets)
+MAX_LINE = 64 * 1024
+
+PROFILES = {profile['id']: profile for profile in AI_PROFILES}
+COLOR_NAMES = {BLUE: "BLUE", PINK: "PINK"}
+
+
+class RequestError(Exception):
+    """
+    Requête refusée : code d'erreur du protocole et message. `game` et
+    `played` sont renseignés quand la partie existait ou a été créée.
+    """
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.game = None
+        self.played = []
+
+
+# --- Moteur (processus du pool) -------------------------------------------------
+
+
+def engine_move(blue, pink, player, depth, profile_id, move_time):
+    """Coup de l'IA (lettre, ligne) ; tourne dans un processus du pool."""
+    board = Board()
+    board.set_position(blue, pink)
+    weights = PROFILES[profile_id]['weights'] if profile_id else None
+    return choose_move(board, player, depth, weights=weights, time_limit=move_time)
+
+
+class Engine:
+    """Pool de processus moteurs avec contre-pression."""
+
+    def __init__(self, workers=None, max_pending=None, max_waiting=None, move_time=DEFAULT_MOVE_TIME):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Recherches en cours ou en file dans le pool
+        self.max_pending = max_pending or 2 * self.workers
+        self._slots = asyncio.Semaphore(self.max_pending)
+        # Requêtes qui attendent une place
+        self.max_waiting = max_waiting if max_waiting is not None else 16 * self.max_pending
+        self.waiting = 0
+        self.move_time = move_time
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    async def move(self, board, player, depth, profile_id, time_limit=None):
+        """Coup de l'IA ; `time_limit` (s) raccourcit le temps du serveur, sans le dépasser."""
+        move_time = self.move_time if time_limit is None else min(time_limit, self.move_time)
+        if self._slots.locked() and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise RequestError("busy", "too many pending engine requests, retry later")
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self.pool, engine_move, board.blue, board.pink, player, depth,
+                                          profile_id, move_time)
+        except BaseException:
+            self._slots.release()
+            raise
+        # La place est rendue à la fin réelle du calcul, même après un timeout
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            move = await asyncio.wait_for(asyncio.shield(future), move_time + TIMEOUT_GRACE)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise RequestError("timeout", f"no move within {move_time + TIMEOUT_GRACE:.1f} s")
+        self.completed += 1
+        return move
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'waiting': self.waiting,
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'rejected': self.rejected,
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# --- Parties ---------------------------------------------------------------------
+
+
+def parse_move(text):
+    """'D3' -> ('D', 3)."""
+    if not isinstance(text, str) or len(text.strip()) != 2:
+        raise RequestError("bad_request", f"bad move {text!r}, expected e.g. 'D3'")
+    col, row = text.strip().upper()
+    if col not in "ABCDEFGH" or row not in "12345678":
+        raise RequestError("bad_request", f"bad move {text!r}, expected e.g. 'D3'")
+    return col, int(row)
+
+
+def parse_time_limit(value):
+    """Temps par coup demandé par le client (s), ou None."""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+        raise RequestError("bad_request", "time_limit must be a positive number of seconds")
+    return float(value)
+
+
+def format_move(move):
+    return None if move is None else f"{move[0]}{move[1]}"
+
+
+class ServerGame:
+    """État d'une partie (une par connexion)."""
+
+    def __init__(self, ai="PINK", profile="DEFAULT", depth=DEFAULT_DEPTH):
+        if ai not in ("BLUE", "PINK", "both", "none"):
+            raise RequestError("bad_request", "ai must be BLUE, PINK, both or none")
+        if profile not in PROFILES:
+            raise RequestError("bad_request", f"unknown profile {profile!r} ({', '.join(PROFILES)})")
+        if not isinstance(depth, int) or not 1 <= depth <= MAX_DEPTH:
+            raise RequestError("bad_request", f"depth must be an integer between 1 and {MAX_DEPTH}")
+        self.id = None  # numéro attribué par le serveur
+        self.board = Board()
+        self.player = BLUE
+        self.ai_colors = {"BLUE": {BLUE}, "PINK": {PINK}, "both": {BLUE, PINK}, "none": set()}[ai]
+        self.profile = profile
+        self.depth = depth
+        # Coups joués (None = passe) et temps de réflexion (ms), pour game.record
+        self.moves = []
+        self.times_ms = []
+
+    @property
+    def over(self):
+        return self.board.is_terminal()
+
+    def _skip_passes(self):
+        """Passe le tour (enregistré) tant que le joueur au trait est bloqué."""
+        while not self.over and not self.board.get_valid_moves(self.player):
+            self.moves.append(None)
+            self.times_ms.append(0.0)
+            self.player = -self.player
+
+    def play(self, move, elapsed_ms=0.0):
+        if self.over:
+            raise RequestError("game_over", "the game is over")
+        if not self.board.is_valid_move(move, self.player):
+            raise RequestError("illegal_move", f"{format_move(move)} is not legal for {COLOR_NAMES[self.player]}")
+        self.board.apply_move(move[0], move[1], self.player)
+        self.moves.append(move)
+        self.times_ms.append(elapsed_ms)
+        self.player = -self.player
+        self._skip_passes()
+
+    def record(self):
+        profiles = {color: self.profile if color in self.ai_colors else "" for color in (BLUE, PINK)}
+        return GameRecord(
+            bytes(encode_move(move) for move in self.moves),
+            names={color: "AI" if color in self.ai_colors else "client" for color in (BLUE, PINK)},
+            profiles=profiles,
+            depths={color: self.depth if color in self.ai_colors else 0 for color in (BLUE, PINK)},
+            discs=self.board.count_discs(),
+            times_ms=self.times_ms,
+        )
+
+    def state(self):
+        blue, pink = self.board.count_discs()
+        rows = []
+        for row in range(8):
+            rows.append("".join(
+                "B" if self.board.blue >> (row * 8 + col) & 1 else ("P" if self.board.pink >> (row * 8 + col) & 1
+                                                                  else ".")
+                for col in range(8)))
+        over = self.over
+        state = {
+            'board': rows,
+            'to_move': None if over else COLOR_NAMES[self.player],
+            'legal': [] if over else [format_move(m) for m in self.board.get_valid_moves(self.player)],
+            'score': {'BLUE': blue, 'PINK': pink},
+            'over': over,
+        }
+        if over:
+            state['winner'] = "BLUE" if blue > pink else ("PINK" if pink > blue else None)
+        return state
+
+
+def game_response(game, played):
+    """Partie dans une réponse : numéro, coups joués par l'IA, état."""
+    return {'game': game.id, 'played': played, 'state': game.state()}
+
+
+# --- Serveur ---------------------------------------------------------------------
+
+
+class GameServer:
+
+    def __init__(self, engine, record_path=None):
+        self.engine = engine
+        self.connections = 0
+        self.games_started = 0
+        self.writer = GameWriter(record_path) if record_path else None
+
+    async def ai_turn(self, game, time_limit=None):
+        """L'IA joue un coup pour le camp au trait."""
+        if game.over:
+            raise RequestError("game_over", "the game is over")
+        player = game.player
+        t0 = time.perf_counter()
+        move = await self.engine.move(game.board, player, game.depth, game.profile, time_limit)
+        game.play(move, (time.perf_counter() - t0) * 1000.0)
+        return {'player': COLOR_NAMES[player], 'move': format_move(move)}
+
+    async def ai_replies(self, game, played, time_limit=None):
+        """Coups de l'IA tant qu'elle a le trait, ajoutés à `played` au fur et à mesure."""
+        while not game.over and game.player in game.ai_colors:
+            played.append(await self.ai_turn(game, time_limit))
+
+    def finished(self, game):
+        if self.writer is not None and game.moves:
+            self.writer.write(game.record())
+            self.writer.flush()
+
+    async def handle(self, request, game):
+        """Traite une requête ; retourne (réponse, partie)."""
+        cmd = request.get('cmd')
+        time_limit = parse_time_limit(request.get('time_limit')) if cmd in ('new', 'move', 'ai') else None
+        if cmd == 'new':
+            game = ServerGame(request.get('ai', "PINK"), str(request.get('profile', "DEFAULT")).upper(),
+                              request.get('depth', DEFAULT_DEPTH))
+            self.games_started += 1
+            game.id = self.games_started
+            was_over = False
+        elif cmd in ('move', 'ai', 'state'):
+            if game is None:
+                raise RequestError("no_game", "start a game with {\"cmd\": \"new\"} first")
+            was_over = game.over
+        elif cmd == 'stats':
+            return {'ok': True, 'engine': self.engine.stats(), 'connections': self.connections,
+                    'games_started': self.games_started}, game
+        else:
+            raise RequestError("bad_request", f"unknown command {cmd!r}")
+        played = []
+        try:
+            if cmd == 'new':
+                await self.ai_replies(game, played, time_limit)
+            elif cmd == 'move':
+                # Camp de l'IA encore au trait (recherche refusée ou expirée) : {"cmd": "ai"}
+                if not game.over and game.player in game.ai_colors:
+                    raise RequestError("not_your_turn",
+                                       f"{COLOR_NAMES[game.player]} is played by the server, send {{\"cmd\": \"ai\"}}")
+                game.play(parse_move(request.get('move')))
+                await self.ai_replies(game, played, time_limit)
+            elif cmd == 'ai':
+                played.append(await self.ai_turn(game, time_limit))
+                await self.ai_replies(game, played, time_limit)
+        except RequestError as e:
+            # La partie a pu avancer avant l'erreur (partie créée, coup du client
+            # joué, premières réponses de l'IA) : l'erreur porte son état
+            e.game, e.played = game, played
+            raise
+        finally:
+            # Toute commande qui fait jouer peut terminer la partie
+            if game.over and not was_over:
+                self.finished(game)
+        return {'ok': True, **game_response(game, played)}, game
+
+    async def serve_client(self, reader, writer):
+        self.connections += 1
+        game = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self.send(writer, {'ok': False, 'error': "bad_request", 'message': "line too long"})
+                    break
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise RequestError("bad_request", "a request is a JSON object")
+                    if request.get('cmd') == 'quit':
+                        await self.send(writer, {'ok': True, **({'id': request['id']} if 'id' in request else {})})
+                        break
+                    response, game = await self.handle(request, game)
+                except json.JSONDecodeError as e:
+                    response = {'ok': False, 'error': "bad_request", 'message': f"invalid JSON: {e}"}
+                except RequestError as e:
+                    response = {'ok': False, 'error': e.code, 'message': str(e)}
+                    if e.game is not None:
+                        # Le client se resynchronise sur la partie (nouvelle le cas échéant)
+                        game = e.game
+                        response.update(game_response(game, e.played))
+                except (ConnectionError, asyncio.CancelledError):
+                    raise
+                except Exception as e:
+                    # Moteur hors service (processus tué...) : la connexion reste ouverte
+                    response = {'ok': False, 'error': "internal", 'message': f"{type(e).__name__}: {e}"}
+                if isinstance(request, dict) and 'id' in request:
+                    response['id'] = request['id']
+                await self.send(writer, response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def send(writer, response):
+        writer.write(json.dumps(response, separators=(',', ':')).encode() + b"\n")
+        # Contre-pression côté écriture : attend que le client lise
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.serve_client, path=unix_path, limit=MAX_LINE)
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+
+    def close(self):
+        self.engine.shutdown()
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def serve(args):
+    engine = Engine(args.workers, args.max_pending, args.max_waiting, args.move_time)
+    server = GameServer(engine, args.record)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serveur de parties sur {where} ({engine.workers} moteurs, {engine.max_pending} recherches max)",
+          flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de parties (JSON ligne par ligne)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="écoute sur une socket Unix au lieu de TCP")
+    parser.add_argument("--workers", type=int, default=None, help="processus moteurs (défaut : nombre de cœurs)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="recherches en cours ou en file au plus (défaut : 2 par moteur)")
+    parser.add_argument("--max-waiting", type=int, default=None,
+                        help="requêtes en attente d'un moteur avant refus (défaut : 16 x max-pending)")
+    parser.add_argument("--move-time", type=float, default=DEFAULT_MOVE_TIME, help="temps maximal par coup (s)")
+    parser.add_argument("--record", metavar="PATH", help="ajoute les parties terminées à ce fichier (game.record)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
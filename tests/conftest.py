@@ -0,0 +1,33 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Racine du dépôt dans sys.path (pytest lancé depuis n'importe quel dossier)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from game.board import Board, BLUE
+
+
+def random_position(rng, plies):
+    """Position atteinte en jouant `plies` demi-coups au hasard (passes comprises)."""
+    board, player = Board(), BLUE
+    for _ in range(plies):
+        if board.is_terminal():
+            break
+        moves = board.get_valid_moves(player)
+        if moves:
+            move = rng.choice(moves)
+            board.apply_move(move[0], move[1], player)
+        player = -player
+    return board, player
+
+
+@pytest.fixture
+def positions():
+    """Positions variées, de l'ouverture à la fin de partie (graine fixe)."""
+    rng = random.Random(2025)
+    return [random_position(rng, rng.randint(0, 60)) for _ in range(40)]
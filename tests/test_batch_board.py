@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ai.batch_eval import batch_features, evaluate_batch
+from ai.heuristics import (evaluate, mobility_score, corner_score, risk_score, frontier_score, pst_score,
+                           discs_score, stability_score)
+from game.batch_board import BoardBatch
+from game.board import iter_squares
+
+
+def test_round_trip(positions):
+    boards = [board for board, _ in positions]
+    batch = BoardBatch.from_boards(boards)
+    assert len(batch) == len(boards)
+    for board, copy in zip(boards, batch.to_boards()):
+        assert (copy.blue, copy.pink, copy.hash) == (board.blue, board.pink, board.hash)
+    assert batch.empties().tolist() == [board.empties for board in boards]
+
+
+def test_legal_moves_and_scores(positions):
+    boards = [board for board, _ in positions]
+    players = [player for _, player in positions]
+    batch = BoardBatch.from_boards(boards)
+    assert batch.legal_moves(players).tolist() == [b.move_masks(p)[0] for b, p in positions]
+    assert batch.legal_moves([-p for p in players]).tolist() == [b.move_masks(p)[1] for b, p in positions]
+    assert batch.scores(players).tolist() == [b.score(p) for b, p in positions]
+
+
+def test_apply_moves(positions):
+    # Chaque coup légal de chaque position, et une passe quand il n'y en a pas
+    boards, players, squares = [], [], []
+    for board, player in positions:
+        moves = board.move_masks(player)[0]
+        for sq in iter_squares(moves) if moves else [-1]:
+            boards.append(board)
+            players.append(player)
+            squares.append(sq)
+    batch = BoardBatch.from_boards(boards)
+    flipped = batch.apply_moves(squares, players)
+    for board, player, sq, flips, after in zip(boards, players, squares, flipped.tolist(), batch.to_boards()):
+        if sq < 0:
+            assert flips == 0
+            assert (after.blue, after.pink) == (board.blue, board.pink)
+            continue
+        expected = board.clone()
+        assert flips == expected.play(sq, player)
+        assert (after.blue, after.pink, after.hash) == (expected.blue, expected.pink, expected.hash)
+
+
+def test_features_match_evaluate(positions):
+    boards = [board for board, _ in positions]
+    players = [player for _, player in positions]
+    batch = BoardBatch.from_boards(boards)
+    features = batch_features(batch, players).tolist()
+    for (board, player), row in zip(positions, features):
+        assert row == [mobility_score(board, player), corner_score(board, player), risk_score(board, player),
+                       frontier_score(board, player), pst_score(board, player), discs_score(board, player),
+                       stability_score(board, player)]
+    expected = [evaluate(board, player) for board, player in positions]
+    assert evaluate_batch(batch, players).tolist() == pytest.approx(expected)
@@ -0,0 +1,75 @@
+import random
+
+from conftest import random_position
+from game.board import Board, BLUE, PINK, SQUARE_PST, iter_squares, move_to_square
+
+
+def assert_state_consistent(board):
+    """L'état incrémental (hash, compteurs, sommes PST) égale son recalcul."""
+    assert board.hash == board.compute_hash()
+    assert board.blue_count == board.blue.bit_count()
+    assert board.pink_count == board.pink.bit_count()
+    assert board.empties == 64 - (board.blue | board.pink).bit_count()
+    assert board.blue_pst == sum(SQUARE_PST[sq] for sq in iter_squares(board.blue))
+    assert board.pink_pst == sum(SQUARE_PST[sq] for sq in iter_squares(board.pink))
+
+
+def test_hash_updated_incrementally(positions):
+    for board, _ in positions:
+        assert_state_consistent(board)
+
+
+def test_play_unplay_restores_position(positions):
+    for board, player in positions:
+        before = (board.blue, board.pink, board.hash, board.blue_pst, board.pink_pst)
+        for move in board.get_valid_moves(player):
+            sq = move_to_square(move)
+            flipped = board.play(sq, player)
+            assert_state_consistent(board)
+            board.unplay(sq, flipped, player)
+            assert (board.blue, board.pink, board.hash, board.blue_pst, board.pink_pst) == before
+
+
+def test_transpositions_share_hash():
+    # Toutes les suites de 4 demi-coups : les positions atteintes par plusieurs
+    # ordres de coups ont le même hash, calculé incrémentalement
+    seen = {}
+    board = Board()
+
+    def walk(player, plies):
+        if plies == 0:
+            seen.setdefault((board.blue, board.pink), set()).add(board.hash)
+            return
+        for move in board.get_valid_moves(player):
+            flipped = board.make_move(move, player)
+            walk(-player, plies - 1)
+            board.undo_move(move, flipped, player)
+
+    walk(BLUE, 4)
+    assert len(seen) < 244  # 244 suites de 4 demi-coups : il y a des transpositions
+    for hashes in seen.values():
+        assert len(hashes) == 1
+
+
+def test_hash_depends_on_side_to_move():
+    board = Board()
+    assert board.hash_key(BLUE) != board.hash_key(PINK)
+
+
+def test_clone_is_independent():
+    board, player = random_position(random.Random(1), 20)
+    copy = board.clone()
+    assert_state_consistent(copy)
+    move = copy.get_valid_moves(player)[0]
+    copy.apply_move(move[0], move[1], player)
+    assert (copy.blue, copy.pink) != (board.blue, board.pink)
+    assert_state_consistent(board)
+    assert_state_consistent(copy)
+
+
+def test_set_position_rebuilds_state(positions):
+    for board, _ in positions:
+        other = Board()
+        other.set_position(board.blue, board.pink)
+        assert (other.hash, other.blue_pst, other.pink_pst, other.empties) == \
+            (board.hash, board.blue_pst, board.pink_pst, board.empties)
@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+import ai.minimax as mm
+import game.game_manager as game_manager
+from ai.endgame import solve, solver_empties, EXACT, WLD, SOLVER_EMPTIES, EMPTIES_PER_PLY
+from ai.minimax import choose_move, SearchStats
+from game.board import Board, BLUE
+from game.game_manager import GameManager
+
+# Au-dessus de FASTEST_FIRST_EMPTIES : les deux tris du solveur sont parcourus
+EMPTIES = 8
+
+
+def negamax(board, player):
+    """Fin de partie par force brute : différence de pions finale pour `player`."""
+    if board.is_terminal():
+        return board.score(player)
+    moves = board.get_valid_moves(player)
+    if not moves:
+        return -negamax(board, -player)
+    best = float('-inf')
+    for move in moves:
+        flipped = board.make_move(move, player)
+        best = max(best, -negamax(board, -player))
+        board.undo_move(move, flipped, player)
+    return best
+
+
+def endgame_position(rng, empties):
+    """Position non terminale à `empties` cases vides, atteinte au hasard."""
+    while True:
+        board, player = Board(), BLUE
+        while board.empties > empties and not board.is_terminal():
+            moves = board.get_valid_moves(player)
+            if moves:
+                board.make_move(rng.choice(moves), player)
+            player = -player
+        if board.empties == empties and not board.is_terminal():
+            return board, player
+
+
+@pytest.fixture(scope='module')
+def endgames():
+    rng = random.Random(8)
+    games = []
+    for _ in range(12):
+        board, player = endgame_position(rng, EMPTIES)
+        games.append((board, player, negamax(board, player)))
+    return games
+
+
+def test_exact_score(endgames):
+    for board, player, expected in endgames:
+        move, score = solve(board, player, EXACT)
+        assert score == expected
+        if move is None:
+            assert not board.get_valid_moves(player)
+        else:
+            # Le coup retourné atteint ce score
+            flipped = board.make_move(move, player)
+            assert -negamax(board, -player) == expected
+            board.undo_move(move, flipped, player)
+
+
+def test_wld_score(endgames):
+    for board, player, expected in endgames:
+        _, score = solve(board, player, WLD)
+        assert score == (expected > 0) - (expected < 0)
+
+
+def test_solve_leaves_board_unchanged(endgames):
+    for board, player, _ in endgames:
+        before = (board.blue, board.pink, board.hash, board.empties)
+        solve(board, player)
+        assert (board.blue, board.pink, board.hash, board.empties) == before
+
+
+def test_check_interrupts_solve(endgames):
+    class Interrupted(Exception):
+        pass
+
+    def check():
+        raise Interrupted
+
+    board, player, _ = endgames[0]
+    with pytest.raises(Interrupted):
+        solve(board, player, check=check)
+
+
+def test_choose_move_uses_solver(endgames):
+    for board, player, expected in endgames:
+        stats = SearchStats()
+        move = choose_move(board, player, 1, endgame_empties=EMPTIES, stats=stats)
+        if move is None:
+            continue
+        assert stats.source == 'endgame'
+        flipped = board.make_move(move, player)
+        assert -negamax(board, -player) == expected
+        board.undo_move(move, flipped, player)
+
+
+def test_solver_empties_scale_with_depth():
+    assert solver_empties(1) == EMPTIES_PER_PLY
+    assert solver_empties(3) == 3 * EMPTIES_PER_PLY
+    assert solver_empties(8) == SOLVER_EMPTIES
+    assert solver_empties(None) == SOLVER_EMPTIES
+    assert solver_empties(4, limit=0) == 0
+
+
+@pytest.mark.parametrize('endgame_empties', [SOLVER_EMPTIES, 0])
+def test_game_manager_reaches_solver(monkeypatch, capsys, endgame_empties):
+    # Partie IA contre IA (profondeur 2) : le seuil de GameManager arrive jusqu'à solve()
+    calls = []
+
+    def counting_solve(board, player, *args, **kwargs):
+        calls.append(board.empties)
+        return solve(board, player, *args, **kwargs)
+
+    monkeypatch.setattr(mm, "solve", counting_solve)
+    monkeypatch.setattr(game_manager, "game_setup", lambda: None)
+    monkeypatch.setattr(game_manager, "ai_loader", lambda stop_event: None)
+    monkeypatch.setattr(game_manager, "get_gamemode", lambda: 6)
+    monkeypatch.setattr(game_manager, "get_depth_choice", lambda player_num: 2)
+    manager = GameManager(ponder=False, endgame_empties=endgame_empties)
+    manager.run()
+    capsys.readouterr()
+    for player in (manager.player1, manager.player2):
+        assert player.endgame_empties == solver_empties(2, endgame_empties)
+    if endgame_empties:
+        assert calls and max(calls) <= solver_empties(2)
+    else:
+        assert not calls
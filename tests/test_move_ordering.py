@@ -0,0 +1,121 @@
+import pytest
+
+import ai.minimax as mm
+from ai.minimax import (order_moves, record_cutoff, age_move_ordering, clear_move_ordering, KILLERS, HISTORY,
+                        KILLER_BONUS, HISTORY_LIMIT)
+from ai.transposition import TranspositionTable
+from game.board import iter_squares
+
+CORNERS = {0, 7, 56, 63}
+
+
+@pytest.fixture(autouse=True)
+def empty_tables():
+    clear_move_ordering()
+    yield
+    clear_move_ordering()
+
+
+def static_value(board, sq):
+    """Valeur statique de la case, recalculée : coin, X/C dangereuse tant que son coin est vide, bord."""
+    row, col = divmod(sq, 8)
+    corner = (0 if row < 4 else 56) + (0 if col < 4 else 7)
+    edge = row in (0, 7) or col in (0, 7)
+    if sq in CORNERS:
+        return 1000
+    if max(abs(row - corner // 8), abs(col - corner % 8)) <= 1:
+        corner_empty = not (board.blue | board.pink) >> corner & 1
+        return -500 if corner_empty else (50 if edge else 0)
+    return 50 if edge else 0
+
+
+def reference_order(board, player, tt_sq=None):
+    """Ordre attendu : coup de la TT, puis score décroissant (statique, pions retournés, tables)."""
+    own_moves = board.valid_moves_mask(player)
+    killer1, killer2 = KILLERS[board.empties]
+    scored = []
+    for sq in iter_squares(own_moves):
+        if sq == tt_sq:
+            continue
+        flips = board.clone().play(sq, player).bit_count()
+        score = static_value(board, sq) + flips * mm.FLIP_WEIGHT + HISTORY[player > 0][sq]
+        score += KILLER_BONUS[0] if sq == killer1 else (KILLER_BONUS[1] if sq == killer2 else 0)
+        scored.append((score, sq))
+    squares = [sq for _, sq in sorted(scored, reverse=True)]
+    return ([tt_sq] if tt_sq is not None and own_moves >> tt_sq & 1 else []) + squares
+
+
+@pytest.fixture
+def movable(positions):
+    return [(board, player) for board, player in positions
+            if board.valid_moves_mask(player).bit_count() >= 3]
+
+
+def test_static_order(movable):
+    for board, player in movable:
+        assert order_moves(board, player, board.valid_moves_mask(player)) == reference_order(board, player)
+
+
+def test_tt_move_first(movable):
+    for board, player in movable:
+        own_moves = board.valid_moves_mask(player)
+        last = order_moves(board, player, own_moves)[-1]
+        assert order_moves(board, player, own_moves, last) == reference_order(board, player, last)
+        assert order_moves(board, player, own_moves, last)[0] == last
+        # Coup de la TT illégal ici (collision) : ignoré
+        illegal = next(sq for sq in range(64) if not own_moves >> sq & 1)
+        assert order_moves(board, player, own_moves, illegal) == order_moves(board, player, own_moves)
+
+
+def test_killers_promoted(movable):
+    for board, player in movable:
+        own_moves = board.valid_moves_mask(player)
+        last, before_last = order_moves(board, player, own_moves)[:-3:-1]
+        record_cutoff(board.empties, player, before_last, 1)
+        record_cutoff(board.empties, player, last, 1)
+        assert KILLERS[board.empties] == [last, before_last]
+        assert order_moves(board, player, own_moves) == reference_order(board, player)
+        clear_move_ordering()
+
+
+def test_killer_slots():
+    record_cutoff(30, 1, 10, 1)
+    record_cutoff(30, 1, 10, 1)
+    assert KILLERS[30] == [10, None]
+    record_cutoff(30, 1, 20, 1)
+    record_cutoff(30, 1, 21, 1)
+    assert KILLERS[30] == [21, 20]
+    # Par nombre de cases vides
+    assert KILLERS[29] == [None, None]
+
+
+def test_history_by_side_and_depth():
+    record_cutoff(30, 1, 19, 3)
+    record_cutoff(20, 1, 19, 2)
+    record_cutoff(30, -1, 26, 4)
+    assert HISTORY[True][19] == 9 + 4 and HISTORY[False][26] == 16
+    assert HISTORY[False][19] == 0 and HISTORY[True][26] == 0
+
+
+def test_history_capped_and_aged():
+    record_cutoff(30, 1, 19, 5)
+    record_cutoff(30, 1, 44, 2)
+    while HISTORY[True][19] <= HISTORY_LIMIT - 25:
+        record_cutoff(30, 1, 19, 5)
+    before = HISTORY[True][44]
+    record_cutoff(30, 1, 19, 5)
+    # Dépassement : toute la table est divisée par deux
+    assert HISTORY[True][19] <= HISTORY_LIMIT
+    assert HISTORY[True][44] == before >> 1
+    value = HISTORY[True][19]
+    age_move_ordering()
+    assert HISTORY[True][19] == value >> 1
+    # Les killers survivent d'une recherche à l'autre
+    assert KILLERS[30][0] == 19
+
+
+def test_search_fills_tables(movable):
+    board, player = movable[0]
+    mm.search(board, player, 4, tt=TranspositionTable(1))
+    assert any(killer is not None for killers in KILLERS for killer in killers)
+    assert sum(HISTORY[True]) + sum(HISTORY[False]) > 0
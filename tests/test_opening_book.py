@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from ai.opening_book import (OpeningBook, build_book, open_book, tree_positions, write_book, HEADER, RECORD,
+                             MAGIC, VERSION)
+from conftest import random_position
+from game.board import Board, BLUE, move_to_square, transform, transform_move, SYMMETRY_SQUARES
+from game.player import AIPlayer
+
+PLIES = 3
+DEPTH = 2
+
+
+@pytest.fixture(scope='module')
+def book_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("book") / "book.bin"
+    build_book(path, tree_positions(PLIES), depth=DEPTH)
+    return path
+
+
+def opening_positions():
+    """Positions (plateau, joueur au trait) des PLIES - 1 premiers demi-coups, images symétriques comprises."""
+    positions, level = [], [(Board(), BLUE)]
+    for _ in range(PLIES):
+        positions.extend(level)
+        following = []
+        for board, player in level:
+            for move in board.get_valid_moves(player):
+                child = board.clone()
+                child.apply_move(move[0], move[1], player)
+                following.append((child, -player))
+        level = following
+    return positions
+
+
+def test_lookup_every_opening(book_path):
+    with OpeningBook(book_path) as book:
+        assert book.depth == DEPTH and len(book) == len(tree_positions(PLIES))
+        for board, player in opening_positions():
+            sq, depth, _ = book.lookup(board, player)
+            assert depth == DEPTH
+            assert board.valid_moves_mask(player) >> sq & 1
+            assert book.get_move(board, player) is not None
+
+
+def test_symmetric_images_share_entry(book_path):
+    with OpeningBook(book_path) as book:
+        for board, player in opening_positions():
+            move = book.get_move(board, player)
+            score = book.lookup(board, player)[2]
+            for sym in range(8):
+                image = Board()
+                image.set_position(transform(board.blue, sym), transform(board.pink, sym))
+                # Même entrée, coup ramené dans le repère de l'image (à une
+                # symétrie près pour une position symétrique)
+                assert book.lookup(image, player)[2] == score
+                expected = move_to_square(transform_move(move, sym))
+                assert move_to_square(book.get_move(image, player)) in {
+                    SYMMETRY_SQUARES[s][expected] for s in [0] + image.symmetries()}
+
+
+def test_missing_position(book_path):
+    # Au-delà des demi-coups couverts
+    board, player = random_position(random.Random(1), 10)
+    with OpeningBook(book_path) as book:
+        assert book.lookup(board, player) is None
+        assert book.get_move(board, player) is None
+
+
+def test_illegal_entry_ignored(tmp_path):
+    # Entrée corrompue : le coup n'est pas légal dans la position
+    board = Board()
+    own, opp, _ = board.canonical(BLUE)
+    path = tmp_path / "book.bin"
+    write_book(path, {(own, opp): (move_to_square(('A', 1)), 1, 0.0)}, 1)
+    with OpeningBook(path) as book:
+        assert book.lookup(board, BLUE)[0] == move_to_square(('A', 1))
+        assert book.get_move(board, BLUE) is None
+
+
+@pytest.mark.parametrize('content', [
+    b"",
+    HEADER.pack(MAGIC, VERSION, 1, 0)[:-1],
+    HEADER.pack(b"XXXX", VERSION, 1, 0),
+    HEADER.pack(MAGIC, VERSION + 1, 1, 0),
+    HEADER.pack(MAGIC, VERSION, 1, 2) + bytes(RECORD.size),
+])
+def test_invalid_files(tmp_path, content):
+    path = tmp_path / "book.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+
+
+def test_player_plays_book_move(book_path):
+    book = open_book(str(book_path))
+    assert open_book(str(book_path)) is book and open_book(book) is book
+    player = AIPlayer(BLUE, depth=DEPTH, book=str(book_path), collect_stats=True)
+    board = Board()
+    assert player.get_move(board) == book.get_move(board, BLUE)
+    assert player.last_stats.source == 'book'
@@ -0,0 +1,139 @@
+import random
+
+from ai.heuristics import corner_score, risk_score
+from ai.patterns import corner_risk, stability_score, EDGE_STABILITY, B3_8
+from conftest import random_position
+from game.board import Board, BLUE, PINK, transform
+
+CORNERS = [(0, 0), (0, 7), (7, 0), (7, 7)]
+
+
+def colour_at(own, opp, row, col):
+    sq = row * 8 + col
+    return 1 if own >> sq & 1 else (-1 if opp >> sq & 1 else 0)
+
+
+def edge_lines():
+    """Les 4 bords, chacun d'un coin à l'autre."""
+    return ([(0, c) for c in range(8)], [(7, c) for c in range(8)],
+            [(r, 0) for r in range(8)], [(r, 7) for r in range(8)])
+
+
+def edge_recount(own, opp):
+    """Pions stables des bords, coins exclus, recomptés case par case."""
+    score = 0
+    for line in edge_lines():
+        colours = [colour_at(own, opp, r, c) for r, c in line]
+        stable = set()
+        for i in range(1, 7):
+            if 0 not in colours:
+                stable.add(i)
+            # Relié au coin gauche ou droit par des pions de sa couleur
+            elif colours[i] and (all(x == colours[i] for x in colours[:i + 1])
+                                 or all(x == colours[i] for x in colours[i:])):
+                stable.add(i)
+        score += sum(colours[i] for i in stable)
+    return score
+
+
+def block_squares(corner, horizontal):
+    """Cases d'un bloc 2x5 : rangée du bord et deuxième rangée, depuis le coin."""
+    row, col = corner
+    dr, dc = (1 if row == 0 else -1), (1 if col == 0 else -1)
+    if horizontal:
+        return [(row + r * dr, col + c * dc) for r in range(2) for c in range(5)]
+    return [(row + c * dr, col + r * dc) for r in range(2) for c in range(5)]
+
+
+def block_recount(own, opp, corner, horizontal):
+    """Pions stables de la deuxième rangée du bloc, par propagation sur le plateau."""
+    squares = block_squares(corner, horizontal)
+    edge, inner = squares[:5], squares[5:]
+    colour = {sq: colour_at(own, opp, *sq) for sq in squares}
+    stable = set()
+    # Rangée du bord et case voisine du coin sur l'autre bord : reliées au coin
+    for run in (edge, [squares[0], squares[5]]):
+        for sq in run:
+            if not colour[run[0]] or colour[sq] != colour[run[0]]:
+                break
+            stable.add(sq)
+    changed = True
+    while changed:
+        changed = False
+        for r, c in inner[1:]:
+            if not colour[(r, c)] or (r, c) in stable:
+                continue
+            # Sur chaque ligne, un voisin stable de même couleur (dans le bloc)
+            if all(any((r + s * dr, c + s * dc) in stable and colour[(r + s * dr, c + s * dc)] == colour[(r, c)]
+                       for s in (1, -1))
+                   for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1))):
+                stable.add((r, c))
+                changed = True
+    # Case X exclue (voisins d'anti-diagonale dans deux blocs) : x_recount
+    return sum(colour[sq] for sq in inner[2:] if sq in stable)
+
+
+def x_recount(own, opp):
+    """Cases X stables : coin et voisins de bord de leur couleur, plus l'un des deux suivants."""
+    score = 0
+    for row, col in CORNERS:
+        dr, dc = (1 if row == 0 else -1), (1 if col == 0 else -1)
+        x = colour_at(own, opp, row + dr, col + dc)
+        group = [(row, col), (row + dr, col), (row, col + dc)]
+        following = [(row + 2 * dr, col), (row, col + 2 * dc)]
+        if x and all(colour_at(own, opp, *sq) == x for sq in group) \
+                and any(colour_at(own, opp, *sq) == x for sq in following):
+            score += x
+    return score
+
+
+def stability_recount(own, opp):
+    return edge_recount(own, opp) + x_recount(own, opp) + sum(
+        block_recount(own, opp, corner, horizontal) for corner in CORNERS for horizontal in (True, False))
+
+
+def late_positions(count, seed):
+    rng = random.Random(seed)
+    return [random_position(rng, rng.randint(20, 58)) for _ in range(count)]
+
+
+def test_corner_risk_matches_features(positions):
+    for board, player in positions + late_positions(100, 1):
+        assert corner_risk(*board.bitboards(player)) == (corner_score(board, player), risk_score(board, player))
+
+
+def test_stability_matches_recount(positions):
+    for board, player in positions + late_positions(300, 2):
+        own, opp = board.bitboards(player)
+        assert stability_score(own, opp) == stability_recount(own, opp)
+
+
+def test_stability_symmetric_and_antisymmetric():
+    for board, player in late_positions(100, 3):
+        own, opp = board.bitboards(player)
+        value = stability_score(own, opp)
+        assert stability_score(opp, own) == -value
+        for sym in range(8):
+            assert stability_score(transform(own, sym), transform(opp, sym)) == value
+
+
+def test_edge_table():
+    def index(own, opp):
+        return B3_8[own] + 2 * B3_8[opp]
+    # Bord plein : tout est stable, même entre deux pions adverses
+    assert EDGE_STABILITY[index(0b01111110, 0b10000001)] == 6
+    # Pions reliés au coin, puis pions sans appui
+    assert EDGE_STABILITY[index(0b00000111, 0b00110000)] == 2
+    assert EDGE_STABILITY[index(0b00000110, 0)] == 0
+
+
+def test_stable_wedge():
+    # Coin A1 et pions bleus en triangle : la deuxième rangée tient
+    board = Board()
+    blue = sum(1 << (r * 8 + c) for r in range(3) for c in range(4 - r))
+    board.set_position(blue, 0)
+    own, opp = board.bitboards(BLUE)
+    # Bords : B1, C1, D1 et A2, A3 ; case X : B2 ; bloc horizontal : C2. B3
+    # n'est pas prouvé : son voisin C2 sur l'anti-diagonale est hors du bloc vertical
+    assert stability_score(own, opp) == 5 + 1 + 1
+    assert stability_score(*board.bitboards(PINK)) == -7
@@ -0,0 +1,39 @@
+import importlib.util
+
+import pytest
+
+from benchmarks.perft import BACKENDS, REFERENCE, divide, load_position
+
+# Valeurs publiées pour la position de départ (une passe compte pour un demi-coup)
+START = [4, 12, 56, 244, 1396, 8200]
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+# Profondeur maximale par backend (le naïf et l'API publique sont lents)
+BACKEND_DEPTHS = {'board': 6, 'bitboard': 6, 'batch': 6, 'naive': 5}
+
+NEEDS_NUMPY = pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+BACKEND_PARAMS = [pytest.param(name, marks=[NEEDS_NUMPY] if name == 'batch' else []) for name in BACKENDS]
+
+
+@pytest.mark.parametrize('backend', BACKEND_PARAMS)
+def test_start_position(backend):
+    board, player = load_position('start')
+    before = (board.blue, board.pink, board.hash)
+    for depth, expected in enumerate(START[:BACKEND_DEPTHS[backend]], 1):
+        assert BACKENDS[backend](board, player, depth) == expected
+    assert (board.blue, board.pink, board.hash) == before
+
+
+@pytest.mark.parametrize('backend', BACKEND_PARAMS)
+@pytest.mark.parametrize('position', ['midgame', 'pass', 'endgame'])
+def test_reference_positions(backend, position):
+    board, player = load_position(position)
+    for depth, expected in enumerate(REFERENCE[position][:3], 1):
+        assert BACKENDS[backend](board, player, depth) == expected
+
+
+@pytest.mark.parametrize('position', ['start', 'pass', 'endgame'])
+def test_divide_sums_to_perft(position):
+    board, player = load_position(position)
+    counts = divide(BACKENDS['bitboard'], board, player, 4)
+    assert sum(counts.values()) == REFERENCE[position][3]
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+import game.game_manager as game_manager
+from game.board import Board, BLUE, PINK
+from game.game_manager import GameManager
+from game.player import AIPlayer
+
+
+def pass_position():
+    """Position (graine fixe) où BLUE doit passer et PINK peut jouer."""
+    rng = random.Random(17)
+    while True:
+        board, player = Board(), BLUE
+        while not board.is_terminal():
+            if not board.get_valid_moves(BLUE) and board.get_valid_moves(PINK):
+                return board
+            moves = board.get_valid_moves(player)
+            if moves:
+                move = rng.choice(moves)
+                board.apply_move(move[0], move[1], player)
+            player = -player
+
+
+def test_stats_reset_on_pass():
+    player = AIPlayer(BLUE, depth=2, collect_stats=True)
+    assert player.get_move(Board()) is not None
+    assert player.last_stats is not None and player.last_stats.nodes > 0
+    assert player.get_move(pass_position()) is None
+    assert player.last_stats is None
+
+
+def test_game_manager_skips_stats_of_passes(monkeypatch, capsys):
+    # Partie IA contre IA (profondeur 1) à partir d'une position où BLUE passe
+    monkeypatch.setattr(game_manager, "game_setup", lambda: None)
+    monkeypatch.setattr(game_manager, "ai_loader", lambda stop_event: None)
+    monkeypatch.setattr(game_manager, "get_gamemode", lambda: 6)
+    monkeypatch.setattr(game_manager, "get_depth_choice", lambda player_num: 1)
+    manager = GameManager(ponder=False)
+    manager.board = pass_position()
+    manager.run()
+    out = capsys.readouterr().out
+
+    assert manager.moves[0] is None
+    played = [move for move in manager.moves if move is not None]
+    assert out.count("thought for") == len(played)
+    # Moyennes par IA : les passes ne comptent pas comme des coups
+    for color, moves in (("BLUE", manager.moves[0::2]), ("PINK", manager.moves[1::2])):
+        count = sum(1 for move in moves if move is not None)
+        if count:
+            assert f"IA {color} (AI-D1) : " in out and f"({count} coups" in out
+        else:
+            assert f"IA {color}" not in out
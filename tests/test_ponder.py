@@ -0,0 +1,99 @@
+import random
+import time
+
+import pytest
+
+import ai.minimax as mm
+from ai.minimax import tt_key, tt_save
+from conftest import random_position
+from game.board import Board, BLUE, PINK, move_to_square
+from game.player import AIPlayer
+
+
+def wait_done(ponderer, timeout=30.0):
+    """Attend la fin de la session de réflexion (toutes les répliques traitées)."""
+    deadline = time.perf_counter() + timeout
+    while ponderer.active:
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def ai():
+    player = AIPlayer(PINK, depth=2, ponder=True, collect_stats=True)
+    yield player
+    player.ponderer.stop()
+    mm.reset_stop()
+
+
+def test_ponder_hit(ai):
+    board = Board()
+    ai.ponderer.start(board, BLUE)
+    wait_done(ai.ponderer)
+    assert len(ai.ponderer.results) == len(board.get_valid_moves(BLUE))
+    for reply in board.get_valid_moves(BLUE):
+        child = board.clone()
+        child.apply_move(reply[0], reply[1], BLUE)
+        expected = ai.ponderer.results[(child.blue, child.pink)]
+        assert child.is_valid_move(expected, PINK)
+        hits = ai.ponderer.hits
+        assert ai.get_move(child) == expected
+        assert ai.last_stats.source == 'ponder' and ai.ponderer.hits == hits + 1
+
+
+def test_ponder_miss(ai):
+    board = Board()
+    ai.ponderer.start(board, BLUE)
+    wait_done(ai.ponderer)
+    # Réplique que la réflexion n'a pas couverte : position jamais vue
+    other, _ = random_position(random.Random(23), 11)
+    move = ai.get_move(other)
+    assert other.is_valid_move(move, PINK)
+    assert ai.last_stats.source == 'search'
+    assert (ai.ponderer.hits, ai.ponderer.misses) == (0, 1)
+
+
+def test_take_without_pondering(ai):
+    assert ai.ponderer.take(Board()) is None
+    assert (ai.ponderer.hits, ai.ponderer.misses) == (0, 0)
+
+
+def test_predicted_reply_from_player_table(ai):
+    board, _ = random_position(random.Random(24), 16)
+    replies = board.get_valid_moves(BLUE)
+    assert len(replies) > 1
+    # Meilleur coup de BLUE enregistré dans la table du joueur : essayé en premier
+    predicted = min(replies, key=lambda move: mm.quick_eval(move, board, BLUE))
+    key, sym = tt_key(board, BLUE, ai.weights)
+    tt_save(key, sym, 2, 0.0, move_to_square(predicted), float('-inf'), float('inf'), ai.tt)
+    assert ai.ponderer.replies(board, BLUE)[0] == predicted
+    assert sorted(ai.ponderer.replies(board, BLUE)) == sorted(replies)
+
+
+def test_pass_reply():
+    # L'adversaire doit passer : une seule « réplique », la passe
+    rng = random.Random(17)
+    while True:
+        board, _ = random_position(rng, rng.randint(30, 58))
+        if not board.get_valid_moves(BLUE) and board.get_valid_moves(PINK):
+            break
+    ai = AIPlayer(PINK, depth=1, ponder=True)
+    assert ai.ponderer.replies(board, BLUE) == [None]
+    ai.ponderer.start(board, BLUE)
+    wait_done(ai.ponderer)
+    assert ai.ponderer.take(board) in board.get_valid_moves(PINK)
+
+
+def test_stop_is_prompt():
+    # Recherche longue (sans limite de temps) interrompue dès que l'humain joue
+    ai = AIPlayer(PINK, depth=9, ponder=True)
+    board, _ = random_position(random.Random(25), 20)
+    ai.ponderer.start(board, BLUE)
+    time.sleep(0.3)
+    start = time.perf_counter()
+    ai.ponderer.stop()
+    assert time.perf_counter() - start < 1.0
+    assert not ai.ponderer.active
+    assert mm._deadline is None and not mm._stop_requested
+    # Les recherches suivantes ne sont pas interrompues
+    assert mm.choose_move(board, BLUE, 2) in board.get_valid_moves(BLUE)
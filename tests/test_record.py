@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from game.board import Board, BLUE, PINK
+from game.record import GameRecord, GameWriter, make_record, read_games, encode_move
+
+
+class Named:
+    def __init__(self, name, profile="", depth=None):
+        self.name, self.profile, self.depth = name, profile, depth
+
+
+def random_game(rng):
+    """Partie complète au hasard : (coups, passes comprises, plateau final)."""
+    board, player, moves = Board(), BLUE, []
+    while not board.is_terminal():
+        valid = board.get_valid_moves(player)
+        move = rng.choice(valid) if valid else None
+        if move is not None:
+            board.apply_move(move[0], move[1], player)
+        moves.append(move)
+        player = -player
+    return moves, board
+
+
+@pytest.fixture
+def games():
+    rng = random.Random(20)
+    players = {BLUE: Named("Alice", "aggressive", 3), PINK: Named("Bob")}
+    records = []
+    for index in range(10):
+        moves, board = random_game(rng)
+        times = [rng.uniform(0, 500) for _ in moves] if index % 2 else None
+        records.append((make_record(players, moves, board, seed=index - 5, times_ms=times), moves, board))
+    return records
+
+
+def assert_same_record(read, record):
+    assert read.moves == record.moves
+    assert read.first_player == record.first_player
+    assert read.names == record.names
+    assert read.profiles == record.profiles
+    assert read.depths == record.depths
+    assert (read.blue_discs, read.pink_discs) == (record.blue_discs, record.pink_discs)
+    assert read.seed == record.seed
+    if record.times_ms is None:
+        assert read.times_ms is None
+    else:
+        # float32 sur disque
+        assert read.times_ms == pytest.approx(record.times_ms, rel=1e-6)
+
+
+def test_round_trip(tmp_path, games):
+    path = tmp_path / "games.rvgr"
+    with GameWriter(path) as writer:
+        writer.write_all(record for record, _, _ in games)
+    read = list(read_games(path))
+    assert len(read) == len(games)
+    for record, (original, moves, board) in zip(read, games):
+        assert_same_record(record, original)
+        assert record.move_list() == moves
+        assert record.depths == {BLUE: 3, PINK: 0}
+        final = record.final_board()
+        assert (final.blue, final.pink) == (board.blue, board.pink)
+        assert (record.blue_discs, record.pink_discs) == board.count_discs()
+
+
+def test_final_board_without_moves():
+    board = GameRecord().final_board()
+    assert (board.blue, board.pink) == (Board().blue, Board().pink)
+
+
+def test_torn_tail_ignored_and_replaced(tmp_path, games):
+    path = tmp_path / "games.rvgr"
+    with GameWriter(path) as writer:
+        writer.write_all(record for record, _, _ in games[:3])
+    # Écriture interrompue au milieu de la quatrième partie
+    with open(path, "ab") as f:
+        f.write(games[3][0].encode()[:-5])
+    assert len(list(read_games(path))) == 3
+    with GameWriter(path) as writer:
+        writer.write(games[4][0])
+    read = list(read_games(path))
+    assert len(read) == 4
+    assert_same_record(read[-1], games[4][0])
+
+
+def test_replay_rejects_illegal_move():
+    record = GameRecord(bytes([encode_move(("A", 1))]))
+    with pytest.raises(ValueError):
+        record.final_board()
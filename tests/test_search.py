@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+
+import pytest
+
+import ai.minimax as mm
+from ai.heuristics import evaluate
+from ai.minimax import (choose_move, search, pvs_search, score_root_moves, iterative_deepening, stop_search,
+                        reset_stop, SearchStats, ALPHABETA, PVS)
+from conftest import random_position
+
+DEPTH = 3
+
+
+def negamax(board, player, depth):
+    """Négamax de référence, sans élagage, table ni tri : une passe ne coûte pas de profondeur."""
+    if board.is_terminal():
+        return board.score(player)
+    if depth == 0:
+        return evaluate(board, player)
+    moves = board.get_valid_moves(player)
+    if not moves:
+        return -negamax(board, -player, depth)
+    best = float('-inf')
+    for move in moves:
+        flipped = board.make_move(move, player)
+        best = max(best, -negamax(board, -player, depth - 1))
+        board.undo_move(move, flipped, player)
+    return best
+
+
+def reference_scores(board, player, depth):
+    scores = {}
+    for move in board.get_valid_moves(player):
+        flipped = board.make_move(move, player)
+        scores[move] = -negamax(board, -player, depth - 1)
+        board.undo_move(move, flipped, player)
+    return scores
+
+
+@pytest.fixture
+def searchable(positions):
+    # Tables vides : une entrée plus profonde changerait le score d'une recherche à profondeur fixe
+    mm.TT.clear()
+    mm.clear_move_ordering()
+    yield [(board, player) for board, player in positions if board.get_valid_moves(player)]
+    mm.TT.clear()
+    mm.clear_move_ordering()
+
+
+def test_search_matches_negamax(searchable):
+    for board, player in searchable:
+        expected = negamax(board, player, DEPTH)
+        mm.TT.clear()
+        assert search(board, player, DEPTH) == pytest.approx(expected)
+        mm.TT.clear()
+        assert pvs_search(board, player, DEPTH) == pytest.approx(expected)
+
+
+def test_search_leaves_board_unchanged(searchable):
+    for board, player in searchable:
+        before = (board.blue, board.pink, board.hash)
+        mm.TT.clear()
+        search(board, player, DEPTH)
+        pvs_search(board, player, DEPTH)
+        assert (board.blue, board.pink, board.hash) == before
+
+
+def test_root_scores_match_negamax(searchable):
+    for board, player in searchable:
+        expected = reference_scores(board, player, DEPTH)
+        mm.TT.clear()
+        move_scores = score_root_moves(board, player, DEPTH, board.get_valid_moves(player))
+        assert [move for move, _ in move_scores] == list(expected)
+        for move, score in move_scores:
+            assert score == pytest.approx(expected[move])
+
+
+def test_chosen_move_is_best(searchable):
+    for board, player in searchable:
+        expected = reference_scores(board, player, DEPTH)
+        best = max(expected.values())
+        for algorithm in (ALPHABETA, PVS):
+            mm.TT.clear()
+            move = choose_move(board, player, DEPTH, algorithm=algorithm, endgame_empties=0)
+            assert expected[move] == pytest.approx(best)
+
+
+@pytest.fixture
+def midgame():
+    """Milieu de partie où une recherche complète est hors de portée."""
+    mm.TT.clear()
+    yield random_position(random.Random(5), 24)
+    mm.TT.clear()
+    reset_stop()
+
+
+def test_needs_depth_or_time_limit(midgame):
+    board, player = midgame
+    with pytest.raises(ValueError):
+        choose_move(board, player, None)
+
+
+@pytest.mark.parametrize('algorithm', [ALPHABETA, PVS])
+def test_timed_search_meets_deadline(midgame, algorithm):
+    board, player = midgame
+    stats = SearchStats()
+    start = time.perf_counter()
+    move = choose_move(board, player, None, time_limit=0.3, algorithm=algorithm, stats=stats)
+    elapsed = time.perf_counter() - start
+    assert move in board.get_valid_moves(player)
+    # Une itération interrompue rend la main au nœud suivant
+    assert elapsed < 0.3 + 0.5
+    depths = [depth for depth, _ in stats.iterations]
+    assert depths == list(range(1, len(depths) + 1)) and depths[-1] < board.empties
+
+
+def test_first_iteration_always_completes(midgame):
+    board, player = midgame
+    stats = SearchStats()
+    move = choose_move(board, player, None, time_limit=0.0, stats=stats)
+    assert move in board.get_valid_moves(player)
+    assert stats.depth == 1
+
+
+def test_timed_search_stops_at_max_depth(midgame):
+    board, player = midgame
+    stats = SearchStats()
+    choose_move(board, player, 2, time_limit=60.0, stats=stats)
+    assert [depth for depth, _ in stats.iterations] == [1, 2]
+
+
+def test_stop_search_interrupts(midgame):
+    board, player = midgame
+    before = (board.blue, board.pink, board.hash)
+    result = {}
+
+    def run():
+        result['move'] = iterative_deepening(board, player, None)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.3)
+    start = time.perf_counter()
+    stop_search()
+    thread.join(5.0)
+    assert not thread.is_alive() and time.perf_counter() - start < 1.0
+    reset_stop()
+    # Meilleur coup de la dernière itération complète, plateau intact
+    assert result['move'] in board.get_valid_moves(player)
+    assert (board.blue, board.pink, board.hash) == before
+    assert mm._deadline is None and not mm._stop_requested
+
+
+@pytest.fixture
+def root_pool():
+    yield 2
+    mm.shutdown_pool()
+
+
+def test_parallel_root_matches_serial(searchable, root_pool):
+    for board, player in searchable[:12]:
+        moves = board.get_valid_moves(player)
+        mm.TT.clear()
+        serial = dict(score_root_moves(board, player, DEPTH, moves))
+        parallel = dict(score_root_moves(board, player, DEPTH, moves, workers=root_pool))
+        assert set(parallel) == set(moves)
+        # Meilleur score exact ; les autres ne sont que des bornes supérieures
+        assert max(parallel.values()) == pytest.approx(max(serial.values()))
+        for move, score in parallel.items():
+            assert score >= serial[move] - 1e-6
+
+
+def test_parallel_choose_move_is_best(searchable, root_pool):
+    for board, player in searchable[:12]:
+        expected = reference_scores(board, player, DEPTH)
+        stats = SearchStats()
+        move = choose_move(board, player, DEPTH, workers=root_pool, stats=stats)
+        assert expected[move] == pytest.approx(max(expected.values()))
+        # Compteurs des processus du pool remontés
+        assert stats.nodes > 0
@@ -0,0 +1,113 @@
+import copy
+import multiprocessing
+import random
+
+import pytest
+
+from ai.ai_profiles import STRATEGY_DEFAULT, STRATEGY_DEFENSE
+from ai.minimax import choose_move, SearchStats
+from ai.search_cache import SearchCache, open_cache, weights_fingerprint
+from conftest import random_position
+from game.board import Board, BLUE, PINK, transform, transform_move
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+def test_round_trip(cache):
+    board, player = random_position(random.Random(3), 12)
+    move = board.get_valid_moves(player)[0]
+    assert cache.get(board, player, 4) is None
+    cache.put(board, player, 4, move, 1.5)
+    assert cache.get(board, player, 4) == (move, 1.5)
+    assert cache.get_move(board, player, 4) == move
+    # Autre profondeur, autre joueur au trait : autre entrée
+    assert cache.get(board, player, 3) is None
+    assert cache.get(board, -player, 4) is None
+    assert (cache.hits, cache.misses) == (2, 3)
+    cache.put(board, player, 4, move)
+    assert cache.get(board, player, 4) == (move, None) and len(cache) == 1
+
+
+def test_persists_across_connections(cache):
+    board = Board()
+    cache.put(board, BLUE, 2, ('D', 3), 0.5, weights=STRATEGY_DEFENSE)
+    cache.close()
+    reopened = SearchCache(cache.path)
+    assert reopened.get(board, BLUE, 2, weights=STRATEGY_DEFENSE) == (('D', 3), 0.5)
+    reopened.close()
+
+
+def test_weights_key_invalidates(cache):
+    board, player = random_position(random.Random(4), 12)
+    move = board.get_valid_moves(player)[0]
+    cache.put(board, player, 3, move, 2.0, weights=STRATEGY_DEFENSE)
+    assert cache.get(board, player, 3) is None
+    assert cache.get(board, player, 3, weights=STRATEGY_DEFAULT) is None
+    # L'empreinte dépend du contenu des poids, pas de l'objet
+    assert cache.get(board, player, 3, weights=copy.deepcopy(STRATEGY_DEFENSE)) == (move, 2.0)
+    changed = copy.deepcopy(STRATEGY_DEFENSE)
+    changed["midgame"]["risk"] += 0.25
+    assert weights_fingerprint(changed) != weights_fingerprint(STRATEGY_DEFENSE)
+    assert cache.get(board, player, 3, weights=changed) is None
+
+
+def test_symmetric_positions_share_entry(cache):
+    board, player = random_position(random.Random(5), 10)
+    move = board.get_valid_moves(player)[0]
+    cache.put(board, player, 3, move, 1.0)
+    for sym in range(8):
+        image = Board()
+        image.set_position(transform(board.blue, sym), transform(board.pink, sym))
+        found, score = cache.get(image, player, 3)
+        assert score == 1.0
+        assert image.is_valid_move(found, player)
+        if not board.symmetries():
+            assert found == transform_move(move, sym)
+
+
+def test_illegal_cached_move_ignored(cache):
+    board = Board()
+    cache.put(board, BLUE, 2, ('A', 1), 0.0)
+    assert cache.get(board, BLUE, 2) == (('A', 1), 0.0)
+    assert cache.get_move(board, BLUE, 2) is None
+
+
+def test_choose_move_uses_cache(cache):
+    board, player = random_position(random.Random(6), 20)
+    first = SearchStats()
+    move = choose_move(board, player, 2, cache=cache, stats=first)
+    assert first.source == 'search' and cache.get_move(board, player, 2) == move
+    second = SearchStats()
+    assert choose_move(board, player, 2, cache=cache, stats=second) == move
+    assert second.source == 'cache' and second.nodes == 0
+    # Recherche chronométrée : profondeur inconnue, jamais en cache
+    choose_move(board, player, 3, time_limit=0.05, cache=cache)
+    assert cache.get(board, player, 3) is None
+
+
+def put_from_child(path):
+    cache = SearchCache(path)
+    cache.put(Board(), PINK, 5, ('C', 4), 3.0)
+    cache.close()
+
+
+def test_shared_between_processes(cache):
+    cache.put(Board(), BLUE, 5, ('D', 3), 1.0)
+    process = multiprocessing.get_context().Process(target=put_from_child, args=(cache.path,))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert cache.get(Board(), PINK, 5) == (('C', 4), 3.0)
+    assert len(cache) == 2
+
+
+def test_open_cache_once(tmp_path):
+    path = str(tmp_path / "shared.db")
+    cache = open_cache(path)
+    assert open_cache(path) is cache and open_cache(cache) is cache and open_cache(None) is None
+    cache.close()
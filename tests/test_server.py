@@ -0,0 +1,192 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import server.game_server as game_server
+from game.board import Board, BLUE
+from game.record import read_games
+from server.game_server import Engine, GameServer, RequestError, DEFAULT_MOVE_TIME
+
+
+class FirstMoveEngine:
+    """Moteur instantané : premier coup légal ; "busy" après `budget` coups."""
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.calls = 0
+        self.time_limits = []
+
+    async def move(self, board, player, depth, profile_id, time_limit=None):
+        if self.budget is not None and self.calls >= self.budget:
+            raise RequestError("busy", "too many pending engine requests, retry later")
+        self.calls += 1
+        self.time_limits.append(time_limit)
+        return board.get_valid_moves(player)[0]
+
+    def stats(self):
+        return {'completed': self.calls}
+
+    def shutdown(self):
+        pass
+
+
+def handle(server, request, game=None):
+    return asyncio.run(server.handle(request, game))
+
+
+def test_new_game_and_moves():
+    server = GameServer(FirstMoveEngine())
+    response, game = handle(server, {'cmd': "new", 'ai': "PINK"})
+    assert response['ok'] and response['game'] == 1 and response['played'] == []
+    assert response['state']['to_move'] == "BLUE"
+    response, game = handle(server, {'cmd': "move", 'move': response['state']['legal'][0]}, game)
+    assert [p['player'] for p in response['played']] == ["PINK"]
+    assert response['state']['to_move'] == "BLUE"
+    assert len(game.moves) == 2
+
+
+@pytest.mark.parametrize('request_, code', [
+    ({'cmd': "move", 'move': "D3"}, "no_game"),
+    ({'cmd': "bogus"}, "bad_request"),
+    ({'cmd': "new", 'ai': "nobody"}, "bad_request"),
+    ({'cmd': "new", 'depth': 0}, "bad_request"),
+    ({'cmd': "new", 'time_limit': 0}, "bad_request"),
+    ({'cmd': "new", 'time_limit': True}, "bad_request"),
+])
+def test_rejected_requests(request_, code):
+    with pytest.raises(RequestError) as e:
+        handle(GameServer(FirstMoveEngine()), request_)
+    assert e.value.code == code
+    assert e.value.game is None
+
+
+def test_illegal_move_keeps_state():
+    server = GameServer(FirstMoveEngine())
+    _, game = handle(server, {'cmd': "new", 'ai': "none"})
+    with pytest.raises(RequestError) as e:
+        handle(server, {'cmd': "move", 'move': "A1"}, game)
+    assert e.value.code == "illegal_move"
+    assert e.value.game is game and game.moves == []
+
+
+def test_not_your_turn():
+    # Le serveur joue BLUE ; sa réponse au coup du client est refusée ("busy")
+    server = GameServer(FirstMoveEngine())
+    response, game = handle(server, {'cmd': "new", 'ai': "BLUE"})
+    assert [p['player'] for p in response['played']] == ["BLUE"]
+    server.engine.budget = server.engine.calls
+    with pytest.raises(RequestError):
+        handle(server, {'cmd': "move", 'move': game.state()['legal'][0]}, game)
+    with pytest.raises(RequestError) as e:
+        handle(server, {'cmd': "move", 'move': game.state()['legal'][0]}, game)
+    assert e.value.code == "not_your_turn"
+
+
+def test_busy_on_new_returns_game():
+    server = GameServer(FirstMoveEngine(budget=3))
+    with pytest.raises(RequestError) as e:
+        handle(server, {'cmd': "new", 'ai': "both"})
+    assert e.value.code == "busy"
+    game = e.value.game
+    assert game.id == 1 and len(e.value.played) == 3 and len(game.moves) == 3
+    # La partie reprend avec {"cmd": "ai"}
+    server.engine.budget = None
+    response, _ = handle(server, {'cmd': "ai"}, game)
+    assert response['state']['over']
+
+
+def test_busy_after_move_returns_state():
+    server = GameServer(FirstMoveEngine(budget=0))
+    response, game = handle(server, {'cmd': "new", 'ai': "PINK"})
+    with pytest.raises(RequestError) as e:
+        handle(server, {'cmd': "move", 'move': response['state']['legal'][0]}, game)
+    assert e.value.code == "busy"
+    # Le coup du client est joué, PINK (serveur) au trait
+    assert e.value.game is game and len(game.moves) == 1
+    assert game.state()['to_move'] == "PINK"
+
+
+def test_finished_games_recorded(tmp_path):
+    path = tmp_path / "games.rvgr"
+    server = GameServer(FirstMoveEngine(), record_path=path)
+    # Partie entièrement jouée par le serveur dès "new"
+    response, game = handle(server, {'cmd': "new", 'ai': "both"})
+    assert response['state']['over']
+    _, game = handle(server, {'cmd': "new", 'ai': "none"})
+    _, game = handle(server, {'cmd': "ai"}, game)
+    server.close()
+    games = list(read_games(path))
+    assert len(games) == 1
+    assert (games[0].blue_discs, games[0].pink_discs) == (response['state']['score']['BLUE'],
+                                                          response['state']['score']['PINK'])
+
+
+def test_time_limit_forwarded():
+    server = GameServer(FirstMoveEngine())
+    response, game = handle(server, {'cmd': "new", 'ai': "PINK", 'time_limit': 0.5})
+    handle(server, {'cmd': "move", 'move': response['state']['legal'][0], 'time_limit': 2}, game)
+    _, game = handle(server, {'cmd': "new", 'ai': "none"})
+    handle(server, {'cmd': "ai"}, game)
+    assert server.engine.time_limits == [2.0, None]
+
+
+def test_engine_caps_time_limit(monkeypatch):
+    # Le temps demandé ne dépasse jamais le maximum du serveur (pool de threads : engine_move remplacé)
+    seen = []
+    monkeypatch.setattr(game_server, "engine_move",
+                        lambda blue, pink, player, depth, profile_id, move_time: seen.append(move_time))
+    engine = Engine(workers=1)
+    engine.pool.shutdown()
+    engine.pool = ThreadPoolExecutor(max_workers=1)
+
+    async def run():
+        for time_limit in (None, 1.0, 60.0):
+            await engine.move(Board(), BLUE, 2, None, time_limit)
+
+    asyncio.run(run())
+    engine.shutdown()
+    assert seen == [DEFAULT_MOVE_TIME, 1.0, DEFAULT_MOVE_TIME]
+
+
+def test_protocol_over_socket():
+    # Bout en bout : JSON ligne par ligne, "id" recopié, erreurs sans fermer la connexion
+    server = GameServer(FirstMoveEngine(budget=1))
+
+    async def run():
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def send(line):
+            writer.write(line + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        responses = [
+            await send(b'{"cmd": "state", "id": 1}'),
+            await send(b'{not json'),
+            await send(b'{"cmd": "new", "ai": "PINK", "id": "a"}'),
+            await send(b'{"cmd": "move", "move": "D3"}'),
+        ]
+        move = responses[-1]['state']['legal'][0]
+        responses.append(await send(json.dumps({'cmd': "move", 'move': move}).encode()))
+        responses.append(await send(b'{"cmd": "stats"}'))
+        responses.append(await send(b'{"cmd": "quit", "id": 2}'))
+        assert await reader.readline() == b""
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return responses
+
+    state, bad, new, move, busy, stats, quit_ = asyncio.run(run())
+    assert (state['ok'], state['error'], state['id']) == (False, "no_game", 1)
+    assert (bad['ok'], bad['error']) == (False, "bad_request")
+    assert new['ok'] and new['id'] == "a" and new['game'] == 1
+    assert move['ok'] and move['played'][0]['player'] == "PINK"
+    # Erreur du moteur après le coup du client : la réponse porte l'état
+    assert (busy['ok'], busy['error'], busy['game']) == (False, "busy", 1)
+    assert busy['played'] == [] and busy['state']['to_move'] == "PINK"
+    assert stats['games_started'] == 1 and stats['engine'] == {'completed': 1}
+    assert quit_ == {'ok': True, 'id': 2}
@@ -0,0 +1,141 @@
+import random
+
+from ai.minimax import score_root_moves, tt_key, tt_lookup, tt_save, SYMMETRY_TT_EMPTIES
+from ai.transposition import TranspositionTable
+from conftest import random_position
+from game.board import (Board, BLUE, PINK, SYMMETRY_SQUARES, INVERSE_SYMMETRY, move_to_square, transform,
+                        transform_move, zobrist_hash, ZOBRIST_SIDE)
+
+
+def image_of(board, sym):
+    image = Board()
+    image.set_position(transform(board.blue, sym), transform(board.pink, sym))
+    return image
+
+
+def square_image(sq, sym):
+    """Image d'une case, calculée sur (ligne, colonne) : transposition, miroir, retournement."""
+    row, col = divmod(sq, 8)
+    if sym & 4:
+        row, col = col, row
+    if sym & 1:
+        col = 7 - col
+    if sym & 2:
+        row = 7 - row
+    return row * 8 + col
+
+
+def test_symmetry_tables():
+    for sym in range(8):
+        assert SYMMETRY_SQUARES[sym] == [square_image(sq, sym) for sq in range(64)]
+        assert sorted(SYMMETRY_SQUARES[sym]) == list(range(64))
+        inverse = INVERSE_SYMMETRY[sym]
+        assert all(SYMMETRY_SQUARES[inverse][SYMMETRY_SQUARES[sym][sq]] == sq for sq in range(64))
+
+
+def test_transform_round_trip(positions):
+    for board, _ in positions:
+        for sym in range(8):
+            assert transform(transform(board.blue, sym), INVERSE_SYMMETRY[sym]) == board.blue
+
+
+def test_moves_commute_with_symmetry(positions):
+    for board, player in positions:
+        for sym in range(8):
+            image = image_of(board, sym)
+            assert image.valid_moves_mask(player) == transform(board.valid_moves_mask(player), sym)
+
+
+def test_canonical_key_shared_by_images(positions):
+    for board, player in positions:
+        key, sym = board.canonical_key(player)
+        # sym envoie le plateau sur la forme canonique, dont key est le hash
+        h = zobrist_hash(transform(board.blue, sym), transform(board.pink, sym))
+        assert key == (h ^ ZOBRIST_SIDE if player == PINK else h)
+        for image_sym in range(8):
+            assert image_of(board, image_sym).canonical_key(player)[0] == key
+        assert board.canonical_key(-player)[0] != key
+
+
+def test_canonical_key_separates_positions(positions):
+    keys = {}
+    for board, player in positions:
+        canonical = board.canonical(player)[:2]
+        keys.setdefault(board.canonical_key(player)[0], set()).add((canonical, player))
+    assert all(len(classes) == 1 for classes in keys.values())
+
+
+def brute_force_equivalent(board, moves):
+    """Coup -> premier coup précédent dont la position fille est l'image par une symétrie."""
+    children = []
+    equivalent = {}
+    for move in moves:
+        child = board.clone()
+        child.apply_move(move[0], move[1], BLUE)
+        images = {(transform(child.blue, sym), transform(child.pink, sym)) for sym in range(8)}
+        for previous, previous_child in children:
+            if (previous_child.blue, previous_child.pink) in images:
+                equivalent[move] = previous
+                break
+        else:
+            children.append((move, child))
+    return equivalent
+
+
+def test_equivalent_moves_start():
+    board = Board()
+    moves = board.get_valid_moves(BLUE)
+    equivalent = board.equivalent_moves(moves)
+    assert equivalent == {move: moves[0] for move in moves[1:]}
+
+
+def test_equivalent_moves_match_brute_force():
+    rng = random.Random(15)
+    symmetric = 0
+    for _ in range(300):
+        board, _ = random_position(rng, rng.randint(0, 6))
+        moves = board.get_valid_moves(BLUE)
+        equivalent = board.equivalent_moves(moves)
+        # Symétries de la position seulement : des positions filles identiques
+        # par hasard ne sont pas fusionnées
+        if not board.symmetries():
+            assert equivalent == {}
+            continue
+        symmetric += 1
+        assert equivalent.items() <= brute_force_equivalent(board, moves).items()
+        for move, representative in equivalent.items():
+            assert any(transform_move(representative, sym) == move for sym in board.symmetries())
+    assert symmetric > 10
+
+
+def test_equivalent_root_moves_share_score():
+    board = Board()
+    move_scores = score_root_moves(board, BLUE, 3, board.get_valid_moves(BLUE))
+    assert len(move_scores) == 4 and len({score for _, score in move_scores}) == 1
+
+
+def test_tt_entry_shared_by_images_in_opening():
+    # Un coup stocké pour une position revient, transformé, pour chacune de ses images
+    rng = random.Random(16)
+    for _ in range(20):
+        board, player = random_position(rng, rng.randint(0, 60 - SYMMETRY_TT_EMPTIES))
+        assert board.empties >= SYMMETRY_TT_EMPTIES
+        moves = board.get_valid_moves(player)
+        if not moves:
+            continue
+        tt = TranspositionTable(1)
+        sq = move_to_square(moves[-1])
+        key, sym = tt_key(board, player, None)
+        tt_save(key, sym, 3, 1.0, sq, float('-inf'), float('inf'), tt)
+        for image_sym in range(8):
+            image = image_of(board, image_sym)
+            image_key, _, score, _, _, tt_sq = tt_lookup(image, player, 3, float('-inf'), float('inf'), None, tt)
+            assert image_key == key and score == 1.0
+            expected = SYMMETRY_SQUARES[image_sym][sq]
+            assert tt_sq in {SYMMETRY_SQUARES[s][expected] for s in [0] + image.symmetries()}
+
+
+def test_tt_key_plain_hash_after_opening():
+    board, player = random_position(random.Random(17), 60 - SYMMETRY_TT_EMPTIES + 1)
+    assert board.empties < SYMMETRY_TT_EMPTIES
+    assert tt_key(board, player, None) == (board.hash_key(player), 0)
@@ -0,0 +1,203 @@
+import multiprocessing
+
+import pytest
+
+import ai.minimax as mm
+from ai.minimax import tt_key, tt_lookup, tt_save, search
+from ai.transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER, NO_MOVE
+from game.board import Board, BLUE
+
+INF = float('inf')
+
+
+@pytest.fixture
+def midgame(positions):
+    """Position de milieu de partie (clé sans symétrie) où le joueur au trait a des coups."""
+    for board, player in positions:
+        if 20 <= board.empties < 40 and board.get_valid_moves(player):
+            return board, player
+
+
+@pytest.mark.parametrize('score, flag', [(-5.0, UPPER), (0.0, UPPER), (3.0, EXACT), (10.0, LOWER), (12.0, LOWER)])
+def test_save_flag_from_window(midgame, score, flag):
+    board, player = midgame
+    tt = TranspositionTable(1)
+    key, sym = tt_key(board, player, None)
+    tt_save(key, sym, 4, score, 19, 0.0, 10.0, tt)
+    assert tt.probe(key) == (4, flag, score, 19)
+
+
+def test_lookup_exact_entry(midgame):
+    board, player = midgame
+    tt = TranspositionTable(1)
+    key, sym = tt_key(board, player, None)
+    tt_save(key, sym, 4, 3.0, 19, -INF, INF, tt)
+    # Profondeur suffisante : le score règle le nœud quelle que soit la fenêtre
+    for depth in (1, 4):
+        assert tt_lookup(board, player, depth, -INF, INF, None, tt) == (key, sym, 3.0, -INF, INF, 19)
+    # Trop peu profonde : seul le coup sert (tri)
+    assert tt_lookup(board, player, 5, -INF, INF, None, tt) == (key, sym, None, -INF, INF, 19)
+
+
+def test_lookup_bounds_narrow_window(midgame):
+    board, player = midgame
+    tt = TranspositionTable(1)
+    key, sym = tt_key(board, player, None)
+    # Borne inférieure (fail-high) : relève alpha, coupe si elle atteint beta
+    tt_save(key, sym, 4, 5.0, 19, -INF, 2.0, tt)
+    assert tt_lookup(board, player, 4, 0.0, 10.0, None, tt)[2:5] == (None, 5.0, 10.0)
+    assert tt_lookup(board, player, 4, 0.0, 4.0, None, tt)[2] == 5.0
+    # Borne supérieure (fail-low) : abaisse beta, coupe si elle atteint alpha
+    tt_save(key, sym, 4, -1.0, 19, 0.0, INF, tt)
+    assert tt_lookup(board, player, 4, -10.0, 10.0, None, tt)[2:5] == (None, -10.0, -1.0)
+    assert tt_lookup(board, player, 4, 0.0, 10.0, None, tt)[2] == -1.0
+    # Borne trop peu profonde : fenêtre inchangée
+    assert tt_lookup(board, player, 5, -10.0, 10.0, None, tt)[2:5] == (None, -10.0, 10.0)
+
+
+def test_lookup_empty_table(midgame):
+    board, player = midgame
+    key, sym = tt_key(board, player, None)
+    assert tt_lookup(board, player, 1, -INF, INF, None, TranspositionTable(1)) == (key, sym, None, -INF, INF, None)
+
+
+def test_no_move_entry():
+    tt = TranspositionTable(1)
+    tt.store(42, 2, UPPER, -1.0)
+    assert tt.probe(42) == (2, UPPER, -1.0, NO_MOVE)
+
+
+def test_search_fills_given_table():
+    # La recherche écrit dans la table passée, pas dans la table du processus
+    board = Board()
+    tt = TranspositionTable(1)
+    search(board, BLUE, 3, tt=tt)
+    key, sym = tt_key(board, BLUE, None)
+    depth, flag, _, sq = tt.probe(key)
+    assert (depth, flag) == (3, EXACT) and sq != NO_MOVE
+
+
+def bucket_keys(count, bucket=3):
+    """`count` clés distinctes qui tombent dans le même bucket (tables de 1 Mo)."""
+    return [bucket + (i << 20) for i in range(1, count + 1)]
+
+
+def test_bucket_keeps_deepest_entry():
+    tt = TranspositionTable(1)
+    deep, shallow, other = bucket_keys(3)
+    tt.store(deep, 8, EXACT, 1.0, 10)
+    # Moins profondes : remplacent la seconde entrée, la plus profonde reste
+    tt.store(shallow, 2, EXACT, 2.0, 11)
+    tt.store(other, 3, EXACT, 3.0, 12)
+    assert tt.probe(deep) == (8, EXACT, 1.0, 10)
+    assert tt.probe(shallow) is None
+    assert tt.probe(other) == (3, EXACT, 3.0, 12)
+    # Au moins aussi profonde : prend la première entrée
+    tt.store(shallow, 8, LOWER, 4.0, 13)
+    assert tt.probe(shallow) == (8, LOWER, 4.0, 13)
+    assert tt.probe(deep) is None
+
+
+def test_same_key_replaced_without_duplicate():
+    tt = TranspositionTable(1)
+    deep, key = bucket_keys(2)
+    tt.store(deep, 8, EXACT, 1.0)
+    tt.store(key, 2, UPPER, 2.0)
+    # Même position, plus profonde : monte dans la première entrée, l'ancienne est effacée
+    tt.store(key, 9, EXACT, 5.0)
+    assert tt.probe(key) == (9, EXACT, 5.0, NO_MOVE)
+    assert tt.occupancy() * tt.entries == 1
+    # Même position, moins profonde : remplace quand même l'entrée existante
+    tt.store(key, 1, LOWER, 6.0)
+    assert tt.probe(key) == (1, LOWER, 6.0, NO_MOVE)
+
+
+@pytest.mark.parametrize('size_mb', [0.01, 1, 3, 16])
+def test_memory_budget(size_mb):
+    tt = TranspositionTable(size_mb)
+    assert tt.nbytes <= max(size_mb * 1024 * 1024, 2 * 19)
+    # Nombre de buckets : puissance de 2, plus de la moitié du budget utilisée
+    buckets = tt.entries // 2
+    assert buckets & (buckets - 1) == 0
+    assert tt.nbytes * 2 > size_mb * 1024 * 1024
+
+
+def test_resize_and_clear():
+    tt = TranspositionTable(1)
+    tt.store(7, 3, EXACT, 1.0)
+    tt.probe(7)
+    tt.clear()
+    assert tt.probe(7) is None and tt.occupancy() == 0
+    assert (tt.probes, tt.hits, tt.stores) == (1, 0, 0)
+    tt.resize(4)
+    assert tt.size_mb == 4 and tt.entries == 4 * TranspositionTable(1).entries
+
+
+def store_in_shared(name, keys):
+    """Processus fils : ouvre la table partagée par son nom et y écrit."""
+    tt = SharedTranspositionTable(name=name)
+    for i, key in enumerate(keys):
+        tt.store(key, i + 1, LOWER, -0.5 * i, i)
+    found = [tt.probe(key) for key in (101, 102)]
+    tt.close()
+    return found
+
+
+@pytest.fixture
+def shared_tt():
+    tt = SharedTranspositionTable(1)
+    yield tt
+    tt.unlink()
+
+
+def test_shared_table_across_processes(shared_tt):
+    shared_tt.store(101, 5, EXACT, 2.5, 19)
+    shared_tt.store(102, 3, UPPER, -1.0)
+    keys = [1000 + i for i in range(50)]
+    with multiprocessing.get_context().Pool(1) as pool:
+        found = pool.apply(store_in_shared, (shared_tt.name, keys))
+    # Le fils voit les entrées du créateur, et inversement
+    assert found == [(5, EXACT, 2.5, 19), (3, UPPER, -1.0, NO_MOVE)]
+    for i, key in enumerate(keys):
+        assert shared_tt.probe(key) == (i + 1, LOWER, -0.5 * i, i)
+    # Compteurs propres au processus
+    assert shared_tt.stores == 2 and shared_tt.probes == len(keys)
+
+
+def test_shared_table_matches_local_table(shared_tt):
+    # Même politique de remplacement que TranspositionTable
+    local = TranspositionTable(1)
+    operations = [(key, depth) for key, depth in zip(bucket_keys(4) * 3, [8, 2, 3, 1, 9, 4, 2, 7, 1, 1, 5, 8])]
+    for i, (key, depth) in enumerate(operations):
+        for tt in (local, shared_tt):
+            tt.store(key, depth, i % 3, float(i), i)
+    for key in bucket_keys(4):
+        assert shared_tt.probe(key) == local.probe(key)
+    shared_tt.clear()
+    assert shared_tt.probe(bucket_keys(1)[0]) is None and shared_tt.occupancy() == 0
+
+
+def test_shared_table_torn_entry_is_a_miss(shared_tt):
+    # Mots d'une entrée mélangés par deux écritures concurrentes : l'entrée est absente
+    shared_tt.store(7, 4, EXACT, 1.0, 3)
+    base = (7 & shared_tt.mask) * 2 * 3
+    shared_tt.words[base + 1] ^= 1
+    assert shared_tt.probe(7) is None
+
+
+def test_only_owner_resizes(shared_tt):
+    other = SharedTranspositionTable(name=shared_tt.name)
+    with pytest.raises(ValueError):
+        other.resize(2)
+    other.close()
+
+
+def test_lazy_smp_uses_shared_table():
+    # Deux processus sur la table partagée : coup légal, table remplie
+    board = Board()
+    try:
+        move = mm.lazy_smp_search(board, BLUE, 3, None, None, mm.ALPHABETA, 2, tt_mb=1)
+        assert move in board.get_valid_moves(BLUE)
+        assert mm._smp_tt.occupancy() > 0
+    finally:
+        mm.shutdown_smp()